@@ -0,0 +1,440 @@
+"""
+Shared gateway for every Groq chat-completion call in the backend.
+
+One pooled client per process, per-model token buckets, adaptive
+concurrency driven by Groq's x-ratelimit-* response headers, retries with
+jittered backoff, and per-caller, per-model metrics.
+
+Callers pass a priority. Interactive (portal) calls may use the whole
+budget; background calls (the crawler, batch generation) leave a reserve
+of concurrency slots and tokens untouched and yield to waiting interactive
+calls. Because the remaining-quota headers are account-wide, a crawler in
+another process backs off as soon as the portal starts spending quota too.
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+
+REQUEST_TIMEOUT = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 20.0
+
+INITIAL_CONCURRENCY = 4
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+
+# Share of tokens and concurrency slots background calls must leave free.
+BACKGROUND_RESERVE = 0.25
+
+# Completion size assumed before the response tells us the real usage.
+DEFAULT_COMPLETION_TOKENS = 512
+
+# Per-minute limits used until response headers report the real ones.
+MODEL_LIMITS = {
+    "llama-3.3-70b-versatile": {"requests": 30, "tokens": 12000},
+    "llama-3.1-8b-instant": {"requests": 30, "tokens": 6000},
+}
+DEFAULT_LIMITS = {"requests": 30, "tokens": 6000}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when no API key is configured."""
+
+
+def _parse_duration(value) -> float | None:
+    """Parses Groq reset values such as "7.66s", "2m59.56s" or "120ms"."""
+
+    if value is None:
+        return None
+
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(text)
+    if not parts:
+        return None
+
+    return sum(float(number) * _DURATION_SECONDS[unit] for number, unit in parts)
+
+
+def _header_int(headers, name: str) -> int | None:
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    chars = sum(len(str(message.get("content") or "")) for message in messages)
+    return chars // 4 + 1
+
+
+class TokenBucket:
+    """
+    Refills `capacity` units per `period` seconds. `acquire` blocks until
+    `amount` units are available on top of `reserve` (background callers
+    pass a reserve so interactive calls never find the bucket empty).
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.period = period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.capacity / self.period,
+        )
+        self.updated = now
+
+    def _take(self, amount: float, reserve: float) -> float:
+        """Takes `amount` if possible (returns 0), else returns the seconds to wait."""
+
+        # Oversized requests wait for a full bucket instead of forever.
+        amount = max(0.0, min(float(amount), self.capacity - reserve))
+        self._refill()
+        if self.tokens - reserve >= amount:
+            self.tokens -= amount
+            return 0.0
+        missing = amount + reserve - self.tokens
+        return max(0.05, missing * self.period / self.capacity)
+
+    def acquire(self, amount: float, reserve: float = 0.0):
+        with self.cond:
+            while (wait := self._take(amount, reserve)) > 0:
+                self.cond.wait(timeout=wait)
+
+    def adjust(self, delta: float):
+        """Corrects an estimate once the real cost is known (refunds if negative)."""
+
+        with self.cond:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+            self.cond.notify_all()
+
+    def sync(self, limit: int | None, remaining: int | None, reset_seconds: float | None):
+        """Aligns the local view with what the server reports."""
+
+        with self.cond:
+            self._refill()
+            if limit:
+                self.capacity = float(limit)
+            if remaining is not None:
+                self.tokens = min(self.tokens, float(remaining))
+                if remaining <= 0 and reset_seconds:
+                    # Empty until the server-side window resets.
+                    self.tokens = -reset_seconds * self.capacity / self.period
+            self.cond.notify_all()
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that grows by one while the quota has headroom and
+    halves on 429 (AIMD). Interactive callers jump the queue; background
+    callers keep a reserve of slots free.
+    """
+
+    def __init__(self, initial: int = INITIAL_CONCURRENCY, maximum: int = MAX_CONCURRENCY):
+        self.limit = max(1, initial)
+        self.maximum = max(self.limit, maximum)
+        self.in_flight = 0
+        self.interactive_waiting = 0
+        self.cond = threading.Condition()
+
+    def _background_limit(self) -> int:
+        return max(1, self.limit - max(1, int(self.limit * BACKGROUND_RESERVE)))
+
+    def _can_enter(self, priority: str) -> bool:
+        # Anything that is not explicitly background counts as interactive.
+        if priority != PRIORITY_BACKGROUND:
+            return self.in_flight < self.limit
+        return not self.interactive_waiting and self.in_flight < self._background_limit()
+
+    def acquire(self, priority: str):
+        with self.cond:
+            interactive = priority != PRIORITY_BACKGROUND
+            self.interactive_waiting += interactive
+            try:
+                while not self._can_enter(priority):
+                    self.cond.wait()
+            finally:
+                self.interactive_waiting -= interactive
+            self.in_flight += 1
+
+    def release(self):
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def on_success(self, remaining_ratio: float | None):
+        with self.cond:
+            if remaining_ratio is None or remaining_ratio > 0.5:
+                self.limit = min(self.maximum, self.limit + 1)
+            elif remaining_ratio < 0.1:
+                self.limit = max(1, self.limit - 1)
+            self.cond.notify_all()
+
+    def on_rate_limited(self):
+        with self.cond:
+            self.limit = max(1, self.limit // 2)
+
+
+class _ModelState:
+    def __init__(self, model: str):
+        limits = MODEL_LIMITS.get(model, DEFAULT_LIMITS)
+        self.requests = TokenBucket(limits["requests"])
+        self.tokens = TokenBucket(limits["tokens"])
+        self.limiter = AdaptiveLimiter()
+
+    def sync_headers(self, headers):
+        if headers is None:
+            return None
+
+        token_limit = _header_int(headers, "x-ratelimit-limit-tokens")
+        token_remaining = _header_int(headers, "x-ratelimit-remaining-tokens")
+        self.tokens.sync(
+            token_limit,
+            token_remaining,
+            _parse_duration(headers.get("x-ratelimit-reset-tokens")),
+        )
+
+        # The request headers describe a per-day window; only the remaining
+        # count matters here, to stop before the server starts refusing.
+        request_remaining = _header_int(headers, "x-ratelimit-remaining-requests")
+        if request_remaining is not None and request_remaining <= 0:
+            self.requests.sync(
+                None,
+                0,
+                _parse_duration(headers.get("x-ratelimit-reset-requests")),
+            )
+
+        if token_limit and token_remaining is not None:
+            return token_remaining / token_limit
+        return None
+
+
+_lock = threading.Lock()
+_client = None
+_models: dict[str, _ModelState] = {}
+_metrics = defaultdict(
+    lambda: {
+        "calls": 0,
+        "errors": 0,
+        "retries": 0,
+        "rate_limited": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "latency_seconds": 0.0,
+        "max_latency_seconds": 0.0,
+    }
+)
+
+
+def _build_client():
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise LLMUnavailableError("GROQ_API_KEY is not set.")
+
+    from openai import OpenAI
+
+    # Retries are handled here, with quota awareness.
+    return OpenAI(
+        api_key=api_key,
+        base_url=GROQ_BASE_URL,
+        timeout=REQUEST_TIMEOUT,
+        max_retries=0,
+    )
+
+
+def get_client():
+    """The process-wide client; its HTTP connection pool is reused by every call."""
+
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def _model_state(model: str) -> _ModelState:
+    with _lock:
+        state = _models.get(model)
+        if state is None:
+            state = _models[model] = _ModelState(model)
+        return state
+
+
+def _backoff(attempt: int, retry_after: float | None) -> float:
+    # Full jitter keeps crawler workers from retrying in lockstep.
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    if retry_after:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _is_retryable(error) -> bool:
+    from openai import APIConnectionError, APIStatusError, APITimeoutError
+
+    if isinstance(error, (APITimeoutError, APIConnectionError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _record(caller: str, model: str, **values):
+    with _lock:
+        entry = _metrics[(caller, model)]
+        for key, value in values.items():
+            if key == "max_latency_seconds":
+                entry[key] = max(entry[key], value)
+            else:
+                entry[key] += value
+
+
+class _Call:
+    """State of one logical completion across its attempts."""
+
+    def __init__(self, messages, model, caller, temperature, priority, max_tokens):
+        self.state = _model_state(model)
+        self.caller = caller
+        self.model = model
+        self.priority = priority
+        self.estimate = estimate_tokens(messages) + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+        self.attempt = 0
+
+        background = priority == PRIORITY_BACKGROUND
+        self.request_reserve = self.state.requests.capacity * BACKGROUND_RESERVE if background else 0
+        self.token_reserve = self.state.tokens.capacity * BACKGROUND_RESERVE if background else 0
+
+        self.kwargs = {"model": model, "messages": messages, "temperature": temperature}
+        if max_tokens:
+            self.kwargs["max_tokens"] = max_tokens
+
+    def failed(self, error, elapsed: float) -> float:
+        """Books a failed attempt; returns the backoff delay or re-raises `error`."""
+
+        state = self.state
+        state.limiter.release()
+
+        status = getattr(error, "status_code", None)
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        state.sync_headers(headers)
+
+        if status == 429:
+            state.limiter.on_rate_limited()
+            _record(self.caller, self.model, rate_limited=1)
+        else:
+            # Nothing was generated; give the estimate back.
+            state.tokens.adjust(-self.estimate)
+
+        if self.attempt >= MAX_RETRIES or not _is_retryable(error):
+            _record(self.caller, self.model, errors=1, latency_seconds=elapsed)
+            raise error
+
+        retry_after = _parse_duration(headers.get("retry-after")) if headers else None
+        self.attempt += 1
+        _record(self.caller, self.model, retries=1)
+        return _backoff(self.attempt, retry_after)
+
+    def succeeded(self, raw, elapsed: float):
+        state = self.state
+        state.limiter.release()
+
+        response = raw.parse()
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        if usage is not None:
+            state.tokens.adjust(prompt_tokens + completion_tokens - self.estimate)
+
+        state.limiter.on_success(state.sync_headers(raw.headers))
+
+        _record(
+            self.caller,
+            self.model,
+            calls=1,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_seconds=elapsed,
+            max_latency_seconds=elapsed,
+        )
+        return response
+
+
+def chat_completion(
+    messages: list[dict],
+    *,
+    model: str,
+    caller: str,
+    temperature: float = 0,
+    priority: str = PRIORITY_INTERACTIVE,
+    max_tokens: int | None = None,
+):
+    """
+    Sends one chat completion through the shared limits and returns the
+    OpenAI-compatible response (`.choices[0].message.content`, `.usage`).
+    Raises the last client error once retries are exhausted.
+    """
+
+    client = get_client()
+    call = _Call(messages, model, caller, temperature, priority, max_tokens)
+    state = call.state
+
+    while True:
+        state.requests.acquire(1, reserve=call.request_reserve)
+        state.tokens.acquire(call.estimate, reserve=call.token_reserve)
+        state.limiter.acquire(priority)
+
+        start = time.perf_counter()
+        try:
+            raw = client.chat.completions.with_raw_response.create(**call.kwargs)
+        except Exception as error:
+            time.sleep(call.failed(error, time.perf_counter() - start))
+            continue
+
+        return call.succeeded(raw, time.perf_counter() - start)
+
+
+def metrics_snapshot() -> list[dict]:
+    """Counters per caller and model: calls, errors, retries, rate_limited, tokens, latency."""
+
+    with _lock:
+        return [
+            {"caller": caller, "model": model, **values}
+            for (caller, model), values in _metrics.items()
+        ]
+
+
+def concurrency_snapshot() -> dict:
+    with _lock:
+        return {
+            model: {
+                "limit": state.limiter.limit,
+                "in_flight": state.limiter.in_flight,
+                "tokens_available": round(state.tokens.tokens),
+                "token_capacity": round(state.tokens.capacity),
+            }
+            for model, state in _models.items()
+        }
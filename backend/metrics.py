@@ -0,0 +1,386 @@
+"""
+In-process metrics registry, rendered in the Prometheus text format.
+
+Counters and histograms are updated where things happen; collectors are
+called at scrape time to turn existing counters (llm_gateway, YouTube
+quota, caches) into samples. The portal serves render() on /metrics.
+
+Other processes (the crawler) either push their render() to the portal's
+/metrics/push/{job} or write it to a textfile-collector file with
+write_textfile(); the portal also serves *.prom files found in
+METRICS_TEXTFILE_DIR. Samples from either source get a job label.
+"""
+
+import math
+import os
+import re
+import threading
+from bisect import bisect_left
+from pathlib import Path
+
+# Request and call latencies, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PUSH_TIMEOUT_SECONDS = 5
+# Distinct jobs whose pushed metrics are kept; pushes from further jobs are refused.
+MAX_PUSHED_JOBS = 16
+TEXTFILE_DIR = os.getenv("METRICS_TEXTFILE_DIR", "")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_NAME = r"[a-zA-Z_:][a-zA-Z0-9_:]*"
+_SAMPLE_LINE = re.compile(rf"^({_NAME})(?:\{{(.*)\}})?\s+(\S+)(?:\s+-?\d+)?$")
+_COMMENT_LINE = re.compile(rf"^# (HELP|TYPE) ({_NAME})(?: (.*))?$")
+
+
+def _escape_help(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape(value) -> str:
+    return _escape_help(value).replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (the last one is +Inf), then the sum.
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        samples = []
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                labels = self._labels(key)
+                cumulative = 0
+                for bound, count in zip(self.buckets + (math.inf,), counts):
+                    cumulative += count
+                    samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+                samples.append((f"{self.name}_sum", labels, total))
+                samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+_registry_lock = threading.Lock()
+_metrics: list[_Metric] = []
+# Callables returning [(name, kind, help, samples)], evaluated on every render().
+_collectors: list = []
+_pushed: dict[str, str] = {}
+
+
+def counter(name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    metric = Counter(name, help_text, labelnames)
+    with _registry_lock:
+        _metrics.append(metric)
+    return metric
+
+
+def histogram(name: str, help_text: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+    metric = Histogram(name, help_text, labelnames, buckets)
+    with _registry_lock:
+        _metrics.append(metric)
+    return metric
+
+
+def register_collector(collector) -> None:
+    with _registry_lock:
+        _collectors.append(collector)
+
+
+CACHE_LOOKUPS = counter(
+    "roadmap_cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _cache_hit_ratios():
+    lookups: dict[str, dict[str, float]] = {}
+    for _, labels, value in CACHE_LOOKUPS.samples():
+        lookups.setdefault(labels["cache"], {})[labels["result"]] = value
+    samples = [
+        ({"cache": cache}, counts.get("hit", 0.0) / total)
+        for cache, counts in sorted(lookups.items())
+        if (total := sum(counts.values()))
+    ]
+    return [
+        (
+            "roadmap_cache_hit_ratio",
+            "gauge",
+            "Share of lookups served from the cache since the process started.",
+            [("roadmap_cache_hit_ratio", labels, ratio) for labels, ratio in samples],
+        )
+    ]
+
+
+def _llm_usage():
+    from backend import llm_gateway
+
+    snapshot = llm_gateway.metrics_snapshot()
+    for row in snapshot:
+        # Both successful and failed calls contribute to latency_seconds.
+        row["finished"] = row["calls"] + row["errors"]
+
+    def samples(name, field, extra=None):
+        return [
+            (name, {"caller": row["caller"], "model": row["model"], **(extra or {})}, row[field])
+            for row in snapshot
+        ]
+
+    return [
+        ("llm_calls_total", "counter", "Completed LLM calls.", samples("llm_calls_total", "calls")),
+        ("llm_errors_total", "counter", "LLM calls that failed after retries.", samples("llm_errors_total", "errors")),
+        ("llm_retries_total", "counter", "LLM call attempts that were retried.", samples("llm_retries_total", "retries")),
+        (
+            "llm_rate_limited_total",
+            "counter",
+            "LLM call attempts answered with 429.",
+            samples("llm_rate_limited_total", "rate_limited"),
+        ),
+        (
+            "llm_tokens_total",
+            "counter",
+            "Tokens used, by kind (prompt or completion).",
+            samples("llm_tokens_total", "prompt_tokens", {"kind": "prompt"})
+            + samples("llm_tokens_total", "completion_tokens", {"kind": "completion"}),
+        ),
+        (
+            "llm_call_duration_seconds",
+            "summary",
+            "Time spent in the final attempt of each LLM call (successful or failed).",
+            samples("llm_call_duration_seconds_sum", "latency_seconds")
+            + samples("llm_call_duration_seconds_count", "finished"),
+        ),
+        (
+            "llm_call_duration_max_seconds",
+            "gauge",
+            "Slowest successful LLM call.",
+            samples("llm_call_duration_max_seconds", "max_latency_seconds"),
+        ),
+    ]
+
+
+def _youtube_usage():
+    from backend.youtube_module import quota
+
+    snapshot = quota.snapshot()
+    return [
+        (
+            "youtube_api_calls_total",
+            "counter",
+            "YouTube Data API requests, by endpoint.",
+            [("youtube_api_calls_total", {"endpoint": endpoint}, row["calls"]) for endpoint, row in snapshot.items()],
+        ),
+        (
+            "youtube_api_errors_total",
+            "counter",
+            "YouTube Data API requests that failed.",
+            [("youtube_api_errors_total", {"endpoint": endpoint}, row["errors"]) for endpoint, row in snapshot.items()],
+        ),
+        (
+            "youtube_api_quota_units_total",
+            "counter",
+            "YouTube Data API quota units spent, by endpoint.",
+            [
+                ("youtube_api_quota_units_total", {"endpoint": endpoint}, row["quota_units"])
+                for endpoint, row in snapshot.items()
+            ],
+        ),
+    ]
+
+
+register_collector(_cache_hit_ratios)
+register_collector(_llm_usage)
+register_collector(_youtube_usage)
+
+
+def _add_family(families: dict, name: str, kind: str, help_text: str, lines: list[str]) -> None:
+    family = families.setdefault(name, {"kind": kind, "help": help_text, "lines": []})
+    family["lines"].extend(lines)
+
+
+def _sample_line(name: str, labels: dict, value: float) -> str:
+    return f"{name}{_format_labels(labels)} {_format_value(value)}"
+
+
+def _merge_text(families: dict, text: str, job: str) -> None:
+    """Adds exposition text from another process, with a job label on every sample."""
+
+    family_name = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        comment = _COMMENT_LINE.match(line)
+        if comment:
+            keyword, family_name, rest = comment.groups()
+            family = families.setdefault(family_name, {"kind": "untyped", "help": "", "lines": []})
+            if keyword == "TYPE" and family["kind"] == "untyped":
+                family["kind"] = rest or "untyped"
+            elif keyword == "HELP" and not family["help"]:
+                family["help"] = rest or ""
+            continue
+        if line.startswith("#"):
+            continue
+        sample = _SAMPLE_LINE.match(line)
+        if sample is None:
+            continue
+        name, labels, value = sample.groups()
+        labelled = f'job="{_escape(job)}"' + (f",{labels}" if labels else "")
+        # _bucket/_sum/_count samples follow their family's TYPE line.
+        if family_name is None or not (name == family_name or name.startswith(f"{family_name}_")):
+            family_name = name
+        families.setdefault(family_name, {"kind": "untyped", "help": "", "lines": []})["lines"].append(
+            f"{name}{{{labelled}}} {value}"
+        )
+
+
+def validate_text(text: str) -> None:
+    """Raises ValueError unless every line is a comment or a sample."""
+
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if line and not line.startswith("#") and not _SAMPLE_LINE.match(line):
+            raise ValueError(f"Line {number} is not a metric sample: {line[:200]}")
+
+
+def store_pushed(job: str, text: str) -> None:
+    """Keeps the latest metrics pushed by `job`; they are served until replaced."""
+
+    validate_text(text)
+    with _registry_lock:
+        if job not in _pushed and len(_pushed) >= MAX_PUSHED_JOBS:
+            raise ValueError(f"Already keeping metrics of {MAX_PUSHED_JOBS} jobs.")
+        _pushed[job] = text
+
+
+def render() -> str:
+    families: dict[str, dict] = {}
+    with _registry_lock:
+        metrics = list(_metrics)
+        collectors = list(_collectors)
+        pushed = dict(_pushed)
+
+    for metric in metrics:
+        lines = [_sample_line(*sample) for sample in metric.samples()]
+        _add_family(families, metric.name, metric.kind, metric.help, lines)
+
+    for collector in collectors:
+        try:
+            collected = collector()
+        except Exception as error:
+            print(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {error}")
+            continue
+        for name, kind, help_text, samples in collected:
+            _add_family(families, name, kind, help_text, [_sample_line(*sample) for sample in samples])
+
+    for job, text in sorted(pushed.items()):
+        _merge_text(families, text, job)
+
+    if TEXTFILE_DIR:
+        for path in sorted(Path(TEXTFILE_DIR).glob("*.prom")):
+            try:
+                _merge_text(families, path.read_text(encoding="utf-8"), path.stem)
+            except OSError as error:
+                print(f"Could not read metrics file {path}: {error}")
+
+    output = []
+    for name, family in families.items():
+        if not family["lines"]:
+            continue
+        if family["help"]:
+            output.append(f"# HELP {name} {_escape_help(family['help'])}")
+        output.append(f"# TYPE {name} {family['kind']}")
+        output.extend(family["lines"])
+    return "\n".join(output) + "\n"
+
+
+def write_textfile(path: str | Path) -> None:
+    """Writes render() for a textfile collector; replaced atomically so a scrape never reads half a file."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(render(), encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def push(url: str, token: str = "") -> None:
+    """POSTs render() to a push endpoint such as the portal's /metrics/push/{job}, with a bearer token if given."""
+
+    # Only the crawler pushes; keep urllib.request (~35 ms) out of portal startup.
+    import urllib.request
+
+    headers = {"Content-Type": CONTENT_TYPE}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    request = urllib.request.Request(url, data=render().encode("utf-8"), method="POST", headers=headers)
+    with urllib.request.urlopen(request, timeout=PUSH_TIMEOUT_SECONDS) as response:
+        response.read()
@@ -0,0 +1,308 @@
+"""
+Microbenchmarks for the service hot paths, on fixed datasets.
+
+The database benchmarks run against an empty throwaway database seeded by
+seed_data with a fixed seed, so every machine benchmarks the same rows; the
+location search uses a generated catalog, so nothing is downloaded.
+
+    python -m backend.roadmap_engine.bench_hot_paths                  # run and print
+    python -m backend.roadmap_engine.bench_hot_paths --compare        # fail on regressions vs. the baseline
+    python -m backend.roadmap_engine.bench_hot_paths --save-baseline  # record a new baseline
+
+Timings depend on the machine: record the baseline on the machine that runs
+--compare (e.g. the deploy box), and re-record it after intended changes.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from backend.roadmap_engine.storage import database
+
+BASELINE_PATH = Path(__file__).resolve().parent / "bench_baseline.json"
+DEFAULT_ROUNDS = 7
+# A benchmark regresses when its median is this much slower than the baseline.
+DEFAULT_THRESHOLD = 0.25
+DATASET_SEED = 1234
+FIXED_TODAY = date(2026, 1, 15)
+
+RAW_SKILLS = [
+    "Python",
+    " python3 ",
+    "C++",
+    "c plus plus",
+    "JavaScript (ES6)",
+    "Node.JS",
+    "ReactJS",
+    "Machine-Learning",
+    "ML",
+    "Data Structures & Algorithms",
+    "DSA",
+    "SQL / Databases",
+    "Git/GitHub",
+    "OOPS",
+    "Deep Learning",
+    "System Design",
+    "REST APIs",
+    "Docker",
+    "AWS",
+    "Linux",
+]
+RAW_SKILL_FIELDS = [
+    "['Python', 'SQL', 'DSA']",
+    "['Java', 'Spring Boot', 'Microservices', 'Kafka', 'AWS']",
+    "[]",
+    "Python, Django, REST APIs",
+    "C++; Data Structures; Algorithms\nSystem Design",
+    "JavaScript,React,Node.js,MongoDB,Express,TypeScript",
+    "",
+    "Machine Learning",
+]
+
+
+def _seeded_database(work_dir: Path) -> dict:
+    from backend.roadmap_engine import seed_data
+    from backend.web_data_engine.pipeline.storage import sqlite_db
+
+    # An empty database: the crawler's opportunities table, then the portal
+    # schema from the migrations (seed applies them), so the dataset does not
+    # depend on what the local opportunities.db holds.
+    db_path = work_dir / "bench.db"
+    sqlite_db.DB_PATH = db_path
+    database.DB_PATH = db_path
+    with contextlib.redirect_stdout(io.StringIO()):
+        sqlite_db.init_db()
+        return seed_data.seed(
+            students=80,
+            companies=4,
+            jobs_per_company=3,
+            opportunities=400,
+            test_ready_ratio=0.5,
+            seed=DATASET_SEED,
+        )
+
+
+def _location_catalog() -> dict:
+    from backend.roadmap_engine.services import location_catalog_service
+
+    rng = random.Random(DATASET_SEED)
+    syllables = ["an", "bel", "cor", "dra", "el", "fin", "gar", "hal", "in", "jor", "kal", "lun", "mar", "nor", "pur"]
+
+    def name() -> str:
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).title()
+
+    rows = [
+        {
+            "name": "India" if country == 0 else f"{name()} Republic {country}",
+            "states": [
+                {
+                    "name": "Maharashtra" if country == 0 and state == 0 else f"{name()} {state}",
+                    "cities": [{"name": name()} for _ in range(150)],
+                }
+                for state in range(20)
+            ],
+        }
+        for country in range(60)
+    ]
+    return location_catalog_service._build_catalog(rows)
+
+
+def _replan_fixture() -> tuple[dict, list[dict]]:
+    plan = {
+        "plan_id": 1,
+        "goal_id": 1,
+        "student_id": 1,
+        "target_end_date": (FIXED_TODAY + timedelta(days=120)).isoformat(),
+        "overdue_count": 9,
+    }
+    segments = []
+    start = FIXED_TODAY - timedelta(days=20)
+    for index in range(12):
+        day_count = 14 + index
+        segments.append(
+            {
+                "id": index + 1,
+                "plan_id": 1,
+                "goal_skill_id": index // 2 + 1,
+                "kind": "learn" if index % 3 else "revision",
+                "start_date": start.isoformat(),
+                "day_count": day_count,
+                "minutes_per_day": 75,
+                "last_day_minutes": 40,
+                "completed_days": 5 if index == 0 else 0,
+                "title": f"Segment {index}",
+                "description": "",
+            }
+        )
+        start += timedelta(days=day_count)
+    return plan, segments
+
+
+def build_benchmarks(work_dir: Path) -> dict:
+    """name -> (callable, calls per round). Each callable does one unit of work per call."""
+
+    from backend.roadmap_engine.services import (
+        company_service,
+        dashboard_service,
+        location_catalog_service,
+        matching_service,
+        onboarding_service,
+        roadmap_adjustment_service,
+    )
+    from backend.roadmap_engine.services.skill_normalizer import normalize_skill
+    from backend.roadmap_engine.storage import company_repo, goals_repo
+    from backend.roadmap_engine.utils import parse_skills_field
+
+    seeded = _seeded_database(work_dir)
+    student_ids = [row["student_id"] for row in seeded["students"]]
+    goal_ids = [goals_repo.get_active_goal(student_id)["id"] for student_id in student_ids]
+    jobs = [company_repo.get_job_post(job_id) for row in seeded["companies"] for job_id in row["job_ids"]]
+    location_catalog_service._CATALOG = _location_catalog()
+    replan_plan, replan_segments = _replan_fixture()
+    onboarding_skills = [
+        {"id": index + 1, "skill_name": skill, "normalized_skill": normalize_skill(skill), "estimated_hours": 20 + index * 5}
+        for index, skill in enumerate(["Python", "SQL", "DSA", "System Design", "Docker", "React"])
+    ]
+
+    def cycle(values):
+        state = {"index": 0}
+
+        def next_value():
+            value = values[state["index"] % len(values)]
+            state["index"] += 1
+            return value
+
+        return next_value
+
+    next_student, next_goal, next_job = cycle(student_ids), cycle(goal_ids), cycle(jobs)
+
+    return {
+        "normalize_skill": (lambda: [normalize_skill(skill) for skill in RAW_SKILLS], 500),
+        "parse_skills_field": (lambda: [parse_skills_field(field) for field in RAW_SKILL_FIELDS], 500),
+        "onboarding._build_segments": (
+            lambda: onboarding_service._build_segments(
+                skills_to_learn=onboarding_skills,
+                start_date=FIXED_TODAY,
+                end_date=FIXED_TODAY + timedelta(days=365),
+                weekly_study_hours=10,
+            ),
+            500,
+        ),
+        "roadmap_adjustment._plan_replan": (
+            lambda: roadmap_adjustment_service._plan_replan(replan_plan, replan_segments, FIXED_TODAY),
+            500,
+        ),
+        "location.search_cities": (
+            lambda: location_catalog_service.search_cities(country="India", state="Maharashtra", q="ma", limit=20),
+            500,
+        ),
+        "matching.refresh_opportunity_matches": (lambda: matching_service.refresh_opportunity_matches(next_student()), 10),
+        "company._rank_candidates_for_job": (lambda: company_service._rank_candidates_for_job(next_job()), 5),
+        "dashboard._test_history": (lambda: dashboard_service._test_history(next_goal()), 100),
+    }
+
+
+def run_benchmark(function, number: int, rounds: int) -> dict:
+    function()  # warm-up: caches, lazy imports, first-touch of DB pages
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        per_call.append((time.perf_counter() - start) / number)
+    return {
+        "median_s": statistics.median(per_call),
+        "min_s": min(per_call),
+        "stdev_s": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "number": number,
+        "rounds": rounds,
+    }
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:9.2f} ms"
+    return f"{seconds * 1e6:9.1f} us"
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Prints each benchmark against the baseline; returns the names that regressed."""
+
+    regressions = []
+    print(f"\n{'benchmark':<40}{'baseline':>14}{'current':>14}{'change':>9}")
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            print(f"{name:<40}{'-':>14}{_format_seconds(result['median_s']):>14}{'new':>9}")
+            continue
+        ratio = result["median_s"] / reference["median_s"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(
+            f"{name:<40}{_format_seconds(reference['median_s']):>14}"
+            f"{_format_seconds(result['median_s']):>14}{(ratio - 1) * 100:>+8.0f}%{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--only", nargs="*", help="benchmark names (substring match)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="exit 1 if any benchmark regressed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmarks = build_benchmarks(Path(tmp))
+        if args.only:
+            benchmarks = {
+                name: spec for name, spec in benchmarks.items() if any(part in name for part in args.only)
+            }
+
+        results = {}
+        print(f"{'benchmark':<40}{'median':>14}{'min':>14}{'stdev':>14}")
+        for name, (function, number) in benchmarks.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = run_benchmark(function, number, args.rounds)
+            results[name] = result
+            print(
+                f"{name:<40}{_format_seconds(result['median_s']):>14}"
+                f"{_format_seconds(result['min_s']):>14}{_format_seconds(result['stdev_s']):>14}"
+            )
+
+    if args.save_baseline:
+        payload = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            sys.exit(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
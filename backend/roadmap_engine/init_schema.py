@@ -1,9 +1,10 @@
-from backend.roadmap_engine.storage.schema import init_roadmap_schema
+from backend.roadmap_engine.storage.migrations import LATEST_VERSION, apply_pending_migrations
 
 
 def main() -> None:
-    init_roadmap_schema()
-    print("Roadmap schema initialized.")
+    applied = apply_pending_migrations()
+    if not applied:
+        print(f"Roadmap schema is current (version {LATEST_VERSION}).")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+from backend.roadmap_engine.services.roadmap_adjustment_service import replan_behind_schedule_plans
+from backend.roadmap_engine.storage.migrations import apply_pending_migrations
+
+
+def main() -> None:
+    apply_pending_migrations()
+    summary = replan_behind_schedule_plans()
+    print(
+        f"Replanned {summary['replanned_plans']} of {summary['behind_plans']} behind-schedule plan(s), "
+        f"{summary['updated_task_count']} task(s) rescheduled."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Fills a portal database with synthetic students, goals, plans, playlists,
+assessments, chat, companies, job posts and opportunities, for load and
+performance testing. Everything is derived from --seed, so two runs with the
+same arguments produce the same data.
+
+    python -m backend.roadmap_engine.seed_data --db /tmp/load.db --students 500
+
+--db is required and is created when missing. A database that already
+holds students, companies or opportunities is refused unless --force is
+given, so the synthetic rows do not end up in a real opportunities.db by
+accident.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import random
+import sqlite3
+from datetime import timedelta
+from pathlib import Path
+
+from backend.roadmap_engine.constants import (
+    BRANCH_OPTIONS,
+    PREDEFINED_SKILLS,
+    TIMELINE_MONTH_OPTIONS,
+    YEAR_OPTIONS,
+)
+from backend.roadmap_engine.services import assessment_service, company_service, onboarding_service
+from backend.roadmap_engine.storage import (
+    chat_repo,
+    company_repo,
+    database,
+    goals_repo,
+    playlist_repo,
+    roadmap_repo,
+)
+from backend.roadmap_engine.storage.migrations import apply_pending_migrations
+from backend.roadmap_engine.utils import utc_now_iso, utc_today
+
+SEED_PASSWORD = "loadtest-password"
+
+# Goal skills are drawn from a wider pool than the onboarding checkboxes, so
+# most students have something left to learn.
+GOAL_SKILL_POOL = PREDEFINED_SKILLS + [
+    "React",
+    "Node.js",
+    "Docker",
+    "Kubernetes",
+    "System Design",
+    "REST APIs",
+    "MongoDB",
+    "AWS",
+    "TypeScript",
+    "Data Analysis",
+]
+COMPANY_NAMES = [
+    "Google",
+    "Microsoft",
+    "Amazon",
+    "Flipkart",
+    "Zomato",
+    "Swiggy",
+    "Atlassian",
+    "Adobe",
+    "Razorpay",
+    "Infosys",
+]
+ROLE_TITLES = [
+    "Software Engineer",
+    "Backend Developer",
+    "Frontend Developer",
+    "Data Analyst",
+    "ML Engineer",
+    "SDE Intern",
+]
+OPPORTUNITY_TYPES = ["job", "internship", "hackathon"]
+CHAT_QUESTIONS = [
+    "Can you explain this topic again with an example?",
+    "Which videos should I rewatch before the test?",
+    "How is this used in interviews?",
+    "What should I practice after today's videos?",
+]
+
+
+def _seed_opportunities(rng: random.Random, count: int, seed: int) -> int:
+    today = utc_today()
+    now = utc_now_iso()
+    rows = []
+    for index in range(count):
+        company = rng.choice(COMPANY_NAMES)
+        title = f"{rng.choice(ROLE_TITLES)} {index}"
+        url = f"https://example.com/seed/{seed}/opportunities/{index}"
+        rows.append(
+            (
+                title,
+                company,
+                rng.choice(OPPORTUNITY_TYPES),
+                (today + timedelta(days=rng.randint(3, 120))).isoformat(),
+                # Same format the crawler stores (see parse_skills_field).
+                str(rng.sample(GOAL_SKILL_POOL, rng.randint(2, 5))),
+                url,
+                "seed",
+                hashlib.sha256(f"{url} {title}".encode("utf-8")).hexdigest(),
+                now,
+            )
+        )
+
+    with database.transaction() as connection:
+        before = connection.total_changes
+        connection.executemany(
+            """
+            INSERT OR IGNORE INTO opportunities
+            (title, company, type, deadline, skills, url, source, content_hash, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        return connection.total_changes - before
+
+
+def _seed_companies(rng: random.Random, count: int, jobs_per_company: int, seed: int) -> list[dict]:
+    deadline = (utc_today() + timedelta(days=30)).isoformat()
+    companies = []
+    for index in range(count):
+        username = f"loadco-{seed}-{index}"
+        try:
+            company = company_service.signup_company(
+                username=username,
+                password=SEED_PASSWORD,
+                confirm_password=SEED_PASSWORD,
+            )
+        except ValueError:
+            # Already seeded by an earlier run with the same --seed.
+            company = company_repo.get_company_by_username(username)
+
+        job_ids = []
+        for _ in range(jobs_per_company):
+            skills = rng.sample(GOAL_SKILL_POOL, rng.randint(2, 4))
+            job_ids.append(
+                company_repo.create_job_post(
+                    company_id=company["id"],
+                    title=f"{rng.choice(ROLE_TITLES)} ({', '.join(skills)})",
+                    job_description=f"Looking for students comfortable with {', '.join(skills)}.",
+                    required_skills=skills,
+                    allow_active_backlog=rng.random() < 0.3,
+                    min_cgpa=rng.choice([0.0, 6.0, 7.0, 7.5, 8.0]),
+                    shortlist_count=rng.randint(3, 15),
+                    application_deadline=deadline,
+                )
+            )
+        companies.append({"company_id": company["id"], "job_ids": job_ids})
+    return companies
+
+
+def _stub_playlists(skill_name: str, key: str) -> list[dict]:
+    return [
+        {
+            "playlist_id": f"seed-{key}-{rank}",
+            "title": f"{skill_name} Course Part {rank}",
+            "channel_title": f"Seed Channel {rank}",
+            "playlist_url": f"https://www.youtube.com/playlist?list=seed-{key}-{rank}",
+            "rank_score": 0.05 - rank * 0.01,
+            "summary": {
+                "topic_overview": f"A structured walkthrough of {skill_name}.",
+                "learning_experience": "Short lectures followed by practice problems.",
+                "topics_covered_summary": f"Fundamentals and common interview topics in {skill_name}.",
+                "video_count": 24,
+                "top_video_titles": [f"{skill_name} lesson {number}" for number in range(1, 6)],
+            },
+        }
+        for rank in range(1, 4)
+    ]
+
+
+def _complete_skill(plan_id: int, goal_skill_id: int) -> None:
+    for segment in roadmap_repo.list_segments(plan_id, goal_skill_id):
+        if segment["completed_days"] < segment["day_count"]:
+            roadmap_repo.set_segment_completed_days(segment["id"], segment["day_count"])
+
+
+def _seed_student(rng: random.Random, index: int, chat_messages: int, test_ready_ratio: float) -> dict:
+    known = rng.sample(PREDEFINED_SKILLS, rng.randint(1, 4))
+    required = rng.sample(GOAL_SKILL_POOL, rng.randint(4, 7))
+    company = rng.choice(COMPANY_NAMES)
+    result = onboarding_service.create_student_goal_plan(
+        name=f"Load Student {index}",
+        branch=rng.choice(BRANCH_OPTIONS),
+        current_year=rng.choice(YEAR_OPTIONS),
+        weekly_study_hours=rng.randint(4, 20),
+        cgpa=round(rng.uniform(6.0, 9.8), 2),
+        active_backlog=rng.random() < 0.1,
+        selected_skills=known,
+        custom_skills_text="",
+        goal_text=f"Become a {rng.choice(ROLE_TITLES)} at {company}",
+        target_duration_months=rng.choice(TIMELINE_MONTH_OPTIONS),
+        # Precomputed, so seeding never waits on the LLM or scans opportunities.
+        goal_parse={"target_company": company, "target_role_family": "Software Engineering", "confidence": 0.8},
+        requirements={"required_skills": required, "source": "seed", "source_opportunity_count": 0},
+    )
+    student_id = result["student"]["id"]
+    goal_id = result["goal"]["id"]
+    plan_id = result["plan_id"]
+    seeded = {"student_id": student_id, "task_segments": [], "pending_assessment": None}
+
+    goal_skills = goals_repo.list_goal_skills(goal_id)
+    if not goal_skills:
+        return seeded
+
+    # Some students are still choosing a playlist for their first skill.
+    active_skill = goal_skills[0]
+    playlist_repo.replace_skill_recommendations(
+        goal_id,
+        active_skill["id"],
+        _stub_playlists(active_skill["skill_name"], f"{student_id}-{active_skill['id']}"),
+    )
+    if rng.random() < 0.15:
+        return seeded
+
+    recommendations = playlist_repo.list_skill_recommendations(goal_id, active_skill["id"])
+    selected = rng.choice(recommendations)
+    playlist_repo.select_recommendation(goal_id, active_skill["id"], selected["id"])
+
+    if chat_messages:
+        session_id = chat_repo.get_or_create_session_id(
+            student_id=student_id,
+            goal_id=goal_id,
+            goal_skill_id=active_skill["id"],
+            playlist_recommendation_id=selected["id"],
+        )
+        for number in range(chat_messages):
+            if number % 2 == 0:
+                chat_repo.add_message(session_id, "user", rng.choice(CHAT_QUESTIONS))
+            else:
+                chat_repo.add_message(session_id, "assistant", "Here is a short explanation with an example.")
+
+    if rng.random() < test_ready_ratio:
+        _complete_skill(plan_id, active_skill["id"])
+        if rng.random() < 0.5:
+            # A failed first attempt: gives the tests section history and
+            # adds revision days, which are completed again before the retest.
+            attempt = assessment_service.generate_assessment(student_id, active_skill["id"])
+            wrong = [(answer + 1) % 4 for answer in attempt["answer_key"]]
+            assessment_service.submit_assessment(student_id, attempt["id"], wrong)
+            _complete_skill(plan_id, active_skill["id"])
+        pending = assessment_service.generate_assessment(student_id, active_skill["id"])
+        seeded["pending_assessment"] = {
+            "assessment_id": pending["id"],
+            "question_count": len(pending["answer_key"]),
+        }
+        return seeded
+
+    for segment in roadmap_repo.list_segments(plan_id, active_skill["id"]):
+        if segment["kind"] != "learn":
+            continue
+        completed_days = rng.randint(0, max(segment["day_count"] - 1, 0))
+        if completed_days:
+            roadmap_repo.set_segment_completed_days(segment["id"], completed_days)
+        seeded["task_segments"].append({"segment_id": segment["id"], "day_count": segment["day_count"]})
+    return seeded
+
+
+def seed(
+    *,
+    students: int = 200,
+    companies: int = 10,
+    jobs_per_company: int = 3,
+    opportunities: int = 500,
+    chat_messages: int = 6,
+    test_ready_ratio: float = 0.2,
+    seed: int = 42,
+) -> dict:
+    """
+    Seeds the current database (storage.database.DB_PATH). Returns the ids a
+    load test needs: students, toggleable task segments, pending assessments
+    and company jobs.
+    """
+
+    apply_pending_migrations()
+    rng = random.Random(seed)
+
+    # Deterministic fallbacks only: seeding must not call the LLM.
+    previous_key = os.environ.pop("GROQ_API_KEY", None)
+    try:
+        opportunity_count = _seed_opportunities(rng, opportunities, seed)
+        company_rows = _seed_companies(rng, companies, jobs_per_company, seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            student_rows = [
+                _seed_student(rng, index, chat_messages, test_ready_ratio) for index in range(students)
+            ]
+    finally:
+        if previous_key is not None:
+            os.environ["GROQ_API_KEY"] = previous_key
+
+    return {
+        "opportunities": opportunity_count,
+        "companies": company_rows,
+        "students": student_rows,
+    }
+
+
+# A database with rows in any of these is not a fresh seeding target.
+DATA_TABLES = ("students", "company_accounts", "opportunities")
+
+
+def _has_data(db_path: Path) -> bool:
+    if not db_path.exists() or db_path.stat().st_size == 0:
+        return False
+    connection = sqlite3.connect(db_path)
+    try:
+        tables = {
+            row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        return any(
+            connection.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is not None
+            for table in DATA_TABLES
+            if table in tables
+        )
+    finally:
+        connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, required=True, help="database to seed; created when missing")
+    parser.add_argument("--force", action="store_true", help="seed even if the database already holds data")
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--jobs-per-company", type=int, default=3)
+    parser.add_argument("--opportunities", type=int, default=500)
+    parser.add_argument("--chat-messages", type=int, default=6, help="per student with a selected playlist")
+    parser.add_argument("--test-ready", type=float, default=0.2, help="share of students with an open skill test")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not args.force and _has_data(args.db):
+        parser.error(f"{args.db} already holds data; pass --force to add synthetic rows to it.")
+
+    # A new file also needs the crawler's opportunities table.
+    from backend.web_data_engine.pipeline.storage import sqlite_db
+
+    sqlite_db.DB_PATH = args.db
+    with contextlib.redirect_stdout(io.StringIO()):
+        sqlite_db.init_db()
+
+    database.DB_PATH = args.db
+    summary = seed(
+        students=args.students,
+        companies=args.companies,
+        jobs_per_company=args.jobs_per_company,
+        opportunities=args.opportunities,
+        chat_messages=args.chat_messages,
+        test_ready_ratio=args.test_ready,
+        seed=args.seed,
+    )
+    pending = sum(1 for row in summary["students"] if row["pending_assessment"])
+    job_count = sum(len(row["job_ids"]) for row in summary["companies"])
+    print(
+        f"Seeded {len(summary['students'])} student(s) ({pending} with an open test), "
+        f"{len(summary['companies'])} company(ies) with {job_count} job(s), "
+        f"{summary['opportunities']} opportunity(ies) into {args.db}."
+    )
+
+
+if __name__ == "__main__":
+    main()
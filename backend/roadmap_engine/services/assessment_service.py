@@ -1,9 +1,12 @@
 import json
 import os
+import random
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from threading import Lock, Thread
 
 from backend.roadmap_engine.constants import PASS_PERCENT_FOR_SKILL_TEST
+from backend.roadmap_engine.services import roadmap_plan_service
 from backend.roadmap_engine.services.skill_normalizer import normalize_skill
 from backend.roadmap_engine.storage import (
     assessment_repo,
@@ -19,6 +22,15 @@ GROQ_MODEL = "llama-3.1-8b-instant"
 TEST_QUESTION_COUNT = 10
 TEST_DURATION_MINUTES = 30
 
+# Unused bank questions kept ready per selected playlist, and at most this
+# many medium questions per attempt (the prompt asks for 1-2 per batch).
+QUESTION_BANK_TARGET = TEST_QUESTION_COUNT * 3
+MAX_MEDIUM_PER_TEST = 2
+MAX_BANK_BATCHES_PER_FILL = 4
+
+_bank_lock = Lock()
+_bank_fills_in_flight: set[tuple[int, str]] = set()
+
 
 def _extract_json(raw_text: str) -> dict | None:
     start = raw_text.find("{")
@@ -325,15 +337,18 @@ def _context_aware_fallback_questions(skill_name: str, selected_playlist: dict)
     return questions, answer_key
 
 
-def _llm_questions(skill_name: str, selected_playlist: dict) -> tuple[list[dict], list[int]] | None:
+def _llm_questions(
+    skill_name: str,
+    selected_playlist: dict,
+    avoid_questions: list[str] | None = None,
+) -> tuple[list[dict], list[int]] | None:
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         return None
 
     try:
-        from groq import Groq
+        from backend.llm_gateway import chat_completion
 
-        client = Groq(api_key=api_key)
         summary = selected_playlist.get("summary", {}) or {}
         channel_url = summary.get("channel_url", "")
         prompt = (
@@ -357,16 +372,21 @@ def _llm_questions(skill_name: str, selected_playlist: dict) -> tuple[list[dict]
             f"Learning experience: {summary.get('learning_experience', '')}\n"
             f"Topics covered summary: {summary.get('topics_covered_summary', '')}\n"
         )
-        response = client.chat.completions.create(
-            model=GROQ_MODEL,
-            temperature=0.3,
-            messages=[
+        if avoid_questions:
+            prompt += "\nDo not repeat or rephrase these existing questions:\n" + "\n".join(
+                f"- {text}" for text in avoid_questions[-40:]
+            )
+        response = chat_completion(
+            [
                 {
                     "role": "system",
                     "content": "You generate practical MCQ tests in strict JSON.",
                 },
                 {"role": "user", "content": prompt},
             ],
+            model=GROQ_MODEL,
+            temperature=0.3,
+            caller="assessment.questions",
         )
         parsed = _extract_json(response.choices[0].message.content or "")
         if not parsed:
@@ -418,16 +438,107 @@ def _llm_questions(skill_name: str, selected_playlist: dict) -> tuple[list[dict]
         return None
 
 
+def fill_question_bank(selected_playlist: dict, skill_name: str) -> int:
+    """
+    Generates LLM question batches for the selected playlist until
+    QUESTION_BANK_TARGET questions are still unused by its skill's attempts.
+    Returns the number of questions added.
+    """
+
+    recommendation_id = int(selected_playlist["id"])
+    normalized = normalize_skill(skill_name)
+    added = 0
+
+    for _ in range(MAX_BANK_BATCHES_PER_FILL):
+        bank = assessment_repo.list_bank_questions(
+            recommendation_id,
+            normalized,
+            selected_playlist.get("goal_skill_id"),
+        )
+        unused = sum(1 for item in bank if item["times_drawn"] == 0)
+        if unused >= QUESTION_BANK_TARGET:
+            break
+
+        generated = _llm_questions(
+            skill_name,
+            selected_playlist,
+            avoid_questions=[item["question"].get("question", "") for item in bank],
+        )
+        if not generated:
+            break
+
+        questions, answer_key = generated
+        inserted = assessment_repo.add_bank_questions(
+            playlist_recommendation_id=recommendation_id,
+            normalized_skill=normalized,
+            questions=questions,
+            answer_key=answer_key,
+        )
+        if inserted == 0:
+            # The model is only repeating itself.
+            break
+        added += inserted
+
+    return added
+
+
+def schedule_question_bank_fill(selected_playlist: dict, skill_name: str) -> bool:
+    """Runs fill_question_bank in a background thread; one fill per playlist at a time."""
+
+    if not os.getenv("GROQ_API_KEY") or not selected_playlist.get("id"):
+        return False
+
+    key = (int(selected_playlist["id"]), normalize_skill(skill_name))
+    with _bank_lock:
+        if key in _bank_fills_in_flight:
+            return False
+        _bank_fills_in_flight.add(key)
+
+    def _run() -> None:
+        try:
+            fill_question_bank(selected_playlist, skill_name)
+        except Exception as error:
+            print(f"Question bank fill failed for playlist {key[0]} ({key[1]}): {str(error) or type(error).__name__}")
+        finally:
+            with _bank_lock:
+                _bank_fills_in_flight.discard(key)
+
+    Thread(target=_run, name=f"question-bank-{key[0]}", daemon=True).start()
+    return True
+
+
+def _sample_from_bank(bank: list[dict]) -> tuple[list[dict], list[int], list[int]] | None:
+    """
+    Picks TEST_QUESTION_COUNT questions, least-drawn first (random among
+    equals), with up to MAX_MEDIUM_PER_TEST medium questions; whichever
+    difficulty runs short is made up from the others. None only when the
+    bank holds fewer questions than a test needs.
+    """
+
+    if len(bank) < TEST_QUESTION_COUNT:
+        return None
+
+    ranked = sorted(bank, key=lambda item: (item["times_drawn"], random.random()))
+    medium = [item for item in ranked if item["difficulty"] == "medium"]
+    basic = [item for item in ranked if item["difficulty"] != "medium"]
+
+    chosen_medium = medium[:MAX_MEDIUM_PER_TEST]
+    chosen_basic = basic[: TEST_QUESTION_COUNT - len(chosen_medium)]
+    # Too few basic questions in the bank: make up the count with medium ones.
+    extra = medium[len(chosen_medium) :][: TEST_QUESTION_COUNT - len(chosen_medium) - len(chosen_basic)]
+    picked = chosen_basic + chosen_medium + extra
+
+    questions = [item["question"] for item in picked]
+    answer_key = [int(item["answer_index"]) for item in picked]
+    return questions, answer_key, [int(item["id"]) for item in picked]
+
+
 def _skill_is_ready_for_test(goal_id: int, goal_skill_id: int) -> bool:
     plan = roadmap_repo.get_active_plan(goal_id)
     if not plan:
         return False
 
-    tasks = roadmap_repo.list_tasks_for_skill(plan["id"], goal_skill_id)
-    if not tasks:
-        return False
-
-    return all(task["is_completed"] == 1 for task in tasks)
+    return roadmap_plan_service.skill_is_complete(roadmap_repo.list_segments(plan["id"], goal_skill_id))
 
 
 def _topic_breakdown(questions: list[dict], answer_key: list[int], answers: list[int]) -> dict[str, dict]:
@@ -477,34 +588,36 @@ def _insert_revision_tasks(goal_id: int, goal_skill: dict, weak_topics: list[str
         return 0
 
     today = utc_today()
-    existing = roadmap_repo.list_tasks(plan["id"], today.isoformat(), None)
     existing_titles = {
-        task["title"]
-        for task in existing
-        if task.get("goal_skill_id") == goal_skill["id"] and task["is_completed"] == 0
+        segment["title"]
+        for segment in roadmap_repo.list_segments(plan["id"], goal_skill["id"])
+        if segment["kind"] == "revision"
+        and not roadmap_plan_service.segment_is_complete(segment)
+        and roadmap_plan_service.segment_end(segment) >= today
     }
 
-    tasks_to_add = []
+    segments_to_add = []
     for idx, topic in enumerate(weak_topics[:3]):
         title = f"Revision: {goal_skill['skill_name']} - {topic}"
         if title in existing_titles:
             continue
-        task_date = (today + timedelta(days=idx + 1)).isoformat()
-        tasks_to_add.append(
+        segments_to_add.append(
             {
                 "goal_skill_id": goal_skill["id"],
-                "task_date": task_date,
+                "kind": "revision",
+                "start_date": (today + timedelta(days=idx + 1)).isoformat(),
+                "day_count": 1,
+                "minutes_per_day": 45,
                 "title": title,
                 "description": (
                     f"Revise topic '{topic}' for {goal_skill['skill_name']}, "
                     "practice questions, then retake the skill test."
                 ),
-                "target_minutes": 45,
             }
         )
 
-    roadmap_repo.append_tasks(plan["id"], tasks_to_add)
-    return len(tasks_to_add)
+    roadmap_repo.append_segments(plan["id"], segments_to_add)
+    return len(segments_to_add)
 
 
 def generate_assessment(student_id: int, goal_skill_id: int) -> dict:
@@ -552,20 +665,34 @@ def generate_assessment(student_id: int, goal_skill_id: int) -> dict:
         if latest.get("passed") == 1:
             return latest
 
-    generated = _llm_questions(goal_skill["skill_name"], selected_playlist)
-    if generated:
-        questions, answer_key = generated
+    # Questions come from the pre-generated bank: opening a test never waits on the LLM.
+    bank = assessment_repo.list_bank_questions(
+        selected_playlist["id"],
+        normalize_skill(goal_skill["skill_name"]),
+        goal_skill_id,
+    )
+    sampled = _sample_from_bank(bank)
+    if sampled:
+        questions, answer_key, bank_question_ids = sampled
     else:
         questions, answer_key = _context_aware_fallback_questions(
             goal_skill["skill_name"],
             selected_playlist,
         )
+        bank_question_ids = []
     assessment_id = assessment_repo.create_assessment(
         goal_id=goal["id"],
         goal_skill_id=goal_skill_id,
         questions=questions,
         answer_key=answer_key,
+        bank_question_ids=bank_question_ids,
     )
+
+    drawn = set(bank_question_ids)
+    unused_left = sum(1 for item in bank if item["times_drawn"] == 0 and item["id"] not in drawn)
+    if unused_left < TEST_QUESTION_COUNT:
+        schedule_question_bank_fill(selected_playlist, goal_skill["skill_name"])
+
     assessment = assessment_repo.get_assessment(assessment_id)
     if assessment is None:
         raise ValueError("Failed to create assessment.")
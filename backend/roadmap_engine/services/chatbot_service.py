@@ -1,6 +1,7 @@
 import re
 
 from backend.roadmap_engine.storage import chat_repo, goals_repo, playlist_repo, students_repo
+from backend.youtube_module.llm_explainer import qna
 
 
 def _active_skill(goal_id: int) -> dict | None:
@@ -155,7 +156,9 @@ def get_chat_panel(student_id: int, limit: int = 20) -> dict:
     }
 
 
-def ask_question(student_id: int, question: str) -> dict:
+def _begin_question(student_id: int, question: str) -> dict:
+    """Validates the question, stores it and returns what the LLM call needs."""
+
     clean_question = str(question or "").strip()
     if not clean_question:
         raise ValueError("Please enter a question for the chatbot.")
@@ -185,30 +188,46 @@ def ask_question(student_id: int, question: str) -> dict:
     ]
 
     chat_repo.add_message(session_id, "user", clean_question)
-    answer = ""
-    try:
-        from backend.youtube_module.llm_explainer.qna import answer_playlist_question_with_history
+    return {
+        "session_id": session_id,
+        "question": clean_question,
+        "history": history,
+        "active_skill": active_skill,
+        "selected_playlist": selected_playlist,
+    }
 
-        playlist_payload, summary_payload = _playlist_prompt_payload(selected_playlist)
-        answer = answer_playlist_question_with_history(
-            playlist=playlist_payload,
-            playlist_summary=summary_payload,
-            student_question=clean_question,
-            conversation_history=history,
-        )
-    except Exception:
-        answer = _fallback_answer(selected_playlist, clean_question)
 
+def _finish_question(pending: dict, answer: str) -> dict:
+    selected_playlist = pending["selected_playlist"]
     if not answer:
-        answer = _fallback_answer(selected_playlist, clean_question)
+        answer = _fallback_answer(selected_playlist, pending["question"])
 
     answer = _structure_assistant_answer(answer)
 
-    chat_repo.add_message(session_id, "assistant", answer)
-    updated_messages = chat_repo.list_messages(session_id, limit=20)
+    chat_repo.add_message(pending["session_id"], "assistant", answer)
+    updated_messages = chat_repo.list_messages(pending["session_id"], limit=20)
     return {
-        "active_skill": active_skill,
+        "active_skill": pending["active_skill"],
         "selected_playlist": selected_playlist,
         "messages": updated_messages,
         "answer": answer,
     }
+
+
+def ask_question(student_id: int, question: str) -> dict:
+    pending = _begin_question(student_id, question)
+    selected_playlist = pending["selected_playlist"]
+
+    answer = ""
+    try:
+        playlist_payload, summary_payload = _playlist_prompt_payload(selected_playlist)
+        answer = qna.answer_playlist_question_with_history(
+            playlist=playlist_payload,
+            playlist_summary=summary_payload,
+            student_question=pending["question"],
+            conversation_history=pending["history"],
+        )
+    except Exception:
+        answer = _fallback_answer(selected_playlist, pending["question"])
+
+    return _finish_question(pending, answer)
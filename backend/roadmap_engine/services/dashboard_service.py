@@ -1,8 +1,15 @@
 import ast
+import contextvars
+import copy
 import json
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
-from backend.roadmap_engine.storage import assessment_repo, goals_repo, roadmap_repo, students_repo
+from backend.roadmap_engine.services import roadmap_plan_service
+from backend.roadmap_engine.storage import assessment_repo, goals_repo, roadmap_repo, students_repo, versions_repo
 from backend.roadmap_engine.utils import parse_iso_deadline, utc_today
 
 
@@ -24,25 +31,6 @@ def _active_goal_and_plan(student_id: int) -> tuple[dict, dict]:
     return goal, plan
 
 
-def _task_progress(tasks: list[dict]) -> dict:
-    if not tasks:
-        return {
-            "completed_tasks": 0,
-            "total_tasks": 0,
-            "completion_percent": 0.0,
-        }
-
-    total_tasks = len(tasks)
-    completed_tasks = sum(1 for task in tasks if task["is_completed"] == 1)
-    completion_percent = (completed_tasks / total_tasks) * 100
-
-    return {
-        "completed_tasks": completed_tasks,
-        "total_tasks": total_tasks,
-        "completion_percent": completion_percent,
-    }
-
-
 def _active_skill(goal_skills: list[dict]) -> dict | None:
     pending = [item for item in goal_skills if item["status"] != "completed"]
     return pending[0] if pending else None
@@ -430,83 +418,37 @@ def _test_history(goal_id: int) -> list[dict]:
     return history
 
 
-def get_dashboard(student_id: int) -> dict:
+def _load_core(student_id: int) -> dict:
+    """What every section and the page chrome build on."""
+
     student = _assert_student(student_id)
     goal, plan = _active_goal_and_plan(student_id)
-    profile_skills = students_repo.list_student_skills(student_id)
 
-    from backend.roadmap_engine.services import roadmap_adjustment_service
+    from backend.roadmap_engine.services import roadmap_adjustment_service, youtube_learning_service
 
-    replan_info = roadmap_adjustment_service.auto_replan_if_behind(student_id)
-    if replan_info.get("applied"):
-        plan = roadmap_repo.get_active_plan(goal["id"]) or plan
+    # Missed tasks are rescheduled by the daily replan job; this only reads its result.
+    replan_info = roadmap_adjustment_service.replan_info(plan)
 
-    today = utc_today()
-    months_remaining = _goal_months_remaining(goal.get("target_end_date"), today)
-    goal_target_date_display = _format_goal_target_date(goal.get("target_end_date"))
-    all_tasks = roadmap_repo.list_tasks(plan["id"])
-    all_window_tasks = roadmap_repo.list_tasks(plan["id"], today.isoformat(), None)
     goal_skills = goals_repo.list_goal_skills(goal["id"])
     active_skill = _active_skill(goal_skills)
 
-    # lazy imports to avoid circular references
-    from backend.roadmap_engine.services import (
-        chatbot_service,
-        company_service,
-        matching_service,
-        youtube_learning_service,
-    )
-
-    matches = _attach_company_logos_by_bucket(
-        matching_service.refresh_opportunity_matches(student_id)
-    )
-    forecast_7_days = _attach_company_logos(
-        matching_service.forecast_eligible_in_days(student_id, days=7)
-    )
-    notifications = _humanize_notifications(matching_service.list_notifications(student_id))
-
     selected_playlist = None
-    recommendations = []
-    playlist_recommendation_error = ""
     ready_for_test_ids: set[int] = set()
-
     if active_skill:
-        recommendations, playlist_recommendation_error = youtube_learning_service.get_or_create_recommendations(
-            goal_id=goal["id"],
-            goal_skill_id=active_skill["id"],
-            skill_name=active_skill["skill_name"],
-        )
-        recommendations = _clean_recommendation_summaries(recommendations)
         selected_playlist = youtube_learning_service.get_selected_playlist(
             goal_id=goal["id"],
             goal_skill_id=active_skill["id"],
         )
-        active_tasks = roadmap_repo.list_tasks_for_skill(plan["id"], active_skill["id"])
-        if selected_playlist and active_tasks and all(task["is_completed"] == 1 for task in active_tasks):
+        active_segments = roadmap_repo.list_segments(plan["id"], active_skill["id"])
+        if selected_playlist and roadmap_plan_service.skill_is_complete(active_segments):
             ready_for_test_ids.add(active_skill["id"])
 
-    chatbot_panel = chatbot_service.get_chat_panel(student_id)
-    company_job_invites = company_service.list_student_pending_company_jobs(student_id)
-    test_history = _test_history(goal["id"])
-
-    today_tasks = [
-        task for task in all_window_tasks
-        if task["task_date"] == today.isoformat() and (active_skill is None or task["goal_skill_id"] == active_skill["id"])
-    ]
-    upcoming_tasks = [
-        task for task in all_window_tasks
-        if active_skill is None or task["goal_skill_id"] == active_skill["id"]
-    ]
-
     return {
         "student": student,
         "goal": goal,
-        "goal_months_remaining": months_remaining,
-        "goal_target_date_display": goal_target_date_display,
         "plan": plan,
-        "today": today.isoformat(),
-        "known_skills": [item["skill_name"] for item in profile_skills],
-        "required_skills": goal.get("requirements", {}).get("required_skills", []),
+        "today": utc_today().isoformat(),
+        "replan_info": replan_info,
         "goal_skills": [
             {
                 **skill,
@@ -516,24 +458,297 @@ def get_dashboard(student_id: int) -> dict:
             }
             for skill in goal_skills
         ],
-        "replan_info": replan_info,
-        "progress": _task_progress(all_tasks),
-        "today_tasks": today_tasks,
-        "upcoming_tasks": upcoming_tasks,
-        "opportunities": matches,
-        "opportunity_forecast_7_days": forecast_7_days,
-        "notifications": notifications,
         "active_skill": active_skill,
-        "active_skill_recommendations": recommendations,
-        "playlist_recommendation_error": playlist_recommendation_error,
         "selected_playlist": selected_playlist,
-        "chatbot": chatbot_panel,
-        "company_job_invites": company_job_invites,
-        "test_history": test_history,
     }
 
 
-def set_task_completion(student_id: int, task_id: int, completed: bool) -> None:
+def _load_roadmap_section(dashboard: dict) -> dict:
+    goal = dashboard["goal"]
+    today = utc_today()
+    profile_skills = students_repo.list_student_skills(dashboard["student"]["id"])
+    return {
+        "goal_months_remaining": _goal_months_remaining(goal.get("target_end_date"), today),
+        "goal_target_date_display": _format_goal_target_date(goal.get("target_end_date")),
+        "known_skills": [item["skill_name"] for item in profile_skills],
+        "required_skills": goal.get("requirements", {}).get("required_skills", []),
+        "progress": roadmap_plan_service.progress(roadmap_repo.list_segments(dashboard["plan"]["id"])),
+    }
+
+
+def _load_tasks_section(dashboard: dict) -> dict:
+    today = dashboard["today"]
+    active_skill = dashboard["active_skill"]
+    # Only the active skill's days from today on are expanded.
+    upcoming_tasks = roadmap_plan_service.list_tasks(
+        dashboard["goal"]["id"],
+        dashboard["plan"]["id"],
+        goal_skill_id=active_skill["id"] if active_skill else None,
+        date_from=today,
+    )
+    return {
+        "today_tasks": [task for task in upcoming_tasks if task["task_date"] == today],
+        "upcoming_tasks": upcoming_tasks,
+    }
+
+
+def _load_tests_section(dashboard: dict) -> dict:
+    return {"test_history": _test_history(dashboard["goal"]["id"])}
+
+
+def _load_chat_panel(dashboard: dict) -> dict:
+    from backend.roadmap_engine.services import chatbot_service
+
+    return {"chatbot": chatbot_service.get_chat_panel(dashboard["student"]["id"])}
+
+
+def _load_opportunity_matches(dashboard: dict) -> dict:
+    from backend.roadmap_engine.services import matching_service
+
+    student_id = dashboard["student"]["id"]
+    # The forecast reads the match cache the refresh just rewrote.
+    matches = matching_service.refresh_opportunity_matches(student_id)
+    return {
+        "opportunities": _attach_company_logos_by_bucket(matches),
+        "opportunity_forecast_7_days": _attach_company_logos(
+            matching_service.forecast_eligible_in_days(student_id, days=7)
+        ),
+    }
+
+
+def _load_company_invites(dashboard: dict) -> dict:
+    from backend.roadmap_engine.services import company_service
+
+    return {"company_job_invites": company_service.list_student_pending_company_jobs(dashboard["student"]["id"])}
+
+
+def _load_playlist_recommendations(dashboard: dict) -> dict:
+    goal = dashboard["goal"]
+    active_skill = dashboard["active_skill"]
+    if not active_skill:
+        return {
+            "active_skill_recommendations": [],
+            "playlist_recommendation_status": "ready",
+            "playlist_recommendation_error": "",
+        }
+
+    from backend.roadmap_engine.services import youtube_learning_service
+
+    # Never generated inline: a cache miss queues a background job.
+    recommendations, status, error = youtube_learning_service.get_or_request_recommendations(
+        goal_id=goal["id"],
+        goal_skill_id=active_skill["id"],
+        skill_name=active_skill["skill_name"],
+    )
+    return {
+        "active_skill_recommendations": _clean_recommendation_summaries(recommendations),
+        "playlist_recommendation_status": status,
+        "playlist_recommendation_error": error or "",
+    }
+
+
+# Independent parts of the page. Each loader returns the context keys it owns;
+# if it fails or runs past its timeout those keys get the fallback instead.
+DASHBOARD_PARTS = {
+    "roadmap": (
+        _load_roadmap_section,
+        {
+            "goal_months_remaining": None,
+            "goal_target_date_display": "Not set",
+            "known_skills": [],
+            "required_skills": [],
+            "progress": roadmap_plan_service.progress([]),
+        },
+    ),
+    "tasks": (_load_tasks_section, {"today_tasks": [], "upcoming_tasks": []}),
+    "tests": (_load_tests_section, {"test_history": []}),
+    "chatbot": (
+        _load_chat_panel,
+        {
+            "chatbot": {
+                "enabled": False,
+                "reason": "The chatbot is taking too long to load. Refresh to try again.",
+                "active_skill": None,
+                "selected_playlist": None,
+                "messages": [],
+            }
+        },
+    ),
+    "opportunities": (
+        _load_opportunity_matches,
+        {
+            "opportunities": {"eligible_now": [], "almost_eligible": [], "coming_soon": []},
+            "opportunity_forecast_7_days": [],
+        },
+    ),
+    "company_invites": (_load_company_invites, {"company_job_invites": []}),
+    "playlist_recommendations": (
+        _load_playlist_recommendations,
+        {
+            "active_skill_recommendations": [],
+            "playlist_recommendation_status": "failed",
+            "playlist_recommendation_error": "Playlist suggestions are taking too long to load. Refresh to try again.",
+        },
+    ),
+}
+
+SECTION_PARTS = {
+    "roadmap": ("roadmap",),
+    "tasks": ("tasks",),
+    "tests": ("tests",),
+    "doubtbot": ("chatbot",),
+    "opportunities": ("opportunities", "company_invites"),
+}
+
+# The navbar playlist dropdown and the chat widget from base.html.
+CHROME_PARTS = ("playlist_recommendations", "chatbot")
+
+DEFAULT_PART_TIMEOUT_SECONDS = 4.0
+PART_TIMEOUT_SECONDS = {"opportunities": 8.0}
+MAX_PART_WORKERS = 8
+
+_part_pool = ThreadPoolExecutor(max_workers=MAX_PART_WORKERS, thread_name_prefix="dashboard-part")
+# One slot per pool worker, held from submit until the loader returns. Parts
+# are only submitted into a free slot, so they never wait in the pool queue
+# and the timeout measures the loader alone; when every worker is busy (e.g.
+# with loaders that timed out earlier) the part runs inline instead.
+_part_slots = threading.BoundedSemaphore(MAX_PART_WORKERS)
+
+
+def _timed(loader, dashboard: dict) -> tuple[dict | None, float, Exception | None]:
+    start = time.perf_counter()
+    try:
+        return loader(dashboard), time.perf_counter() - start, None
+    except Exception as error:
+        return None, time.perf_counter() - start, error
+
+
+def _run_in_slot(context: contextvars.Context, loader, dashboard: dict):
+    try:
+        return context.run(_timed, loader, dashboard)
+    finally:
+        _part_slots.release()
+
+
+def _run_parts(dashboard: dict, part_names) -> None:
+    """
+    Runs the parts in parallel and merges their keys into `dashboard`. Timings
+    go to dashboard["section_timings_ms"]; parts that timed out or failed are
+    listed in dashboard["degraded_sections"]. A timed-out loader keeps running
+    in its worker, but the page no longer waits for it.
+    """
+
+    submitted = {}
+    inline = []
+    for name in dict.fromkeys(part_names):
+        loader, _ = DASHBOARD_PARTS[name]
+        if not _part_slots.acquire(blocking=False):
+            inline.append(name)
+            continue
+        timeout = PART_TIMEOUT_SECONDS.get(name, DEFAULT_PART_TIMEOUT_SECONDS)
+        # Each part runs in a copy of the caller's context (per-request query stats).
+        context = contextvars.copy_context()
+        submitted[name] = (_part_pool.submit(_run_in_slot, context, loader, dashboard), time.perf_counter(), timeout)
+
+    results = {name: _timed(DASHBOARD_PARTS[name][0], dashboard) for name in inline}
+    for name, (future, started, timeout) in submitted.items():
+        try:
+            results[name] = future.result(timeout=max(started + timeout - time.perf_counter(), 0))
+        except FutureTimeoutError:
+            print(f"Dashboard part '{name}' timed out after {timeout:.1f}s")
+            results[name] = (None, timeout, None)
+
+    timings = dashboard.setdefault("section_timings_ms", {})
+    degraded = dashboard.setdefault("degraded_sections", [])
+    for name in dict.fromkeys(part_names):
+        values, elapsed, error = results[name]
+        if error is not None:
+            print(f"Dashboard part '{name}' failed: {error}")
+        if values is None:
+            values = copy.deepcopy(DASHBOARD_PARTS[name][1])
+            degraded.append(name)
+        dashboard.update(values)
+        timings[name] = round(elapsed * 1000, 1)
+
+
+def _section_parts(sections) -> list[str]:
+    parts: list[str] = []
+    for section in sections:
+        if section not in SECTION_PARTS:
+            raise ValueError(f"Unknown dashboard section: {section}.")
+        parts.extend(SECTION_PARTS[section])
+    return parts
+
+
+def _load_core_timed(student_id: int) -> dict:
+    start = time.perf_counter()
+    dashboard = _load_core(student_id)
+    dashboard["section_timings_ms"] = {"core": round((time.perf_counter() - start) * 1000, 1)}
+    dashboard["degraded_sections"] = []
+    return dashboard
+
+
+def get_dashboard(student_id: int, sections: list[str] | tuple[str, ...] | None = None) -> dict:
+    """
+    Full-page dashboard context. Only the listed sections are computed (all of
+    them by default); the page chrome from base.html is always included.
+    """
+
+    parts = _section_parts(sections or SECTION_PARTS)
+    dashboard = _load_core_timed(student_id)
+    _run_parts(dashboard, parts + list(CHROME_PARTS))
+
+    # After the parts, so notifications created by the match refresh show up.
+    from backend.roadmap_engine.services import matching_service
+
+    start = time.perf_counter()
+    dashboard["notifications"] = _humanize_notifications(
+        matching_service.list_notifications(student_id)
+    )
+    dashboard["section_timings_ms"]["notifications"] = round((time.perf_counter() - start) * 1000, 1)
+    return dashboard
+
+
+def get_dashboard_section(student_id: int, section: str) -> dict:
+    """Context for one section fragment, without the page chrome."""
+
+    parts = _section_parts([section])
+    dashboard = _load_core_timed(student_id)
+    _run_parts(dashboard, parts)
+    return dashboard
+
+
+def get_data_version(student_id: int) -> int:
+    """Changes whenever anything the dashboard shows for the student changes."""
+
+    return versions_repo.get_student_version(student_id)
+
+
+def get_playlist_status(student_id: int) -> dict:
+    """
+    What the dashboard polls while playlist suggestions are being prepared.
+    Read-only: jobs are queued by the dashboard load, not by polling.
+    """
+
+    _assert_student(student_id)
+    goal = goals_repo.get_active_goal(student_id)
+    active_skill = _active_skill(goals_repo.list_goal_skills(goal["id"])) if goal else None
+    if active_skill is None:
+        return {"status": "ready", "error": ""}
+
+    from backend.roadmap_engine.services import youtube_learning_service
+
+    _, status, error = youtube_learning_service.get_recommendation_status(goal["id"], active_skill["id"])
+    return {"status": status, "error": error or ""}
+
+
+def set_task_completion(student_id: int, task_id: str, completed: bool) -> None:
+    """
+    Marks one expanded day done or not done. Days are completed through a
+    per-segment cursor: marking a day done also completes the earlier days
+    of its segment, and clearing it reopens the days after it.
+    """
+
     _assert_student(student_id)
     goal, plan = _active_goal_and_plan(student_id)
 
@@ -550,20 +765,22 @@ def set_task_completion(student_id: int, task_id: int, completed: bool) -> None:
             f"Select one of the top 3 playlists for {active_skill['skill_name']} before marking tasks."
         )
 
-    task = roadmap_repo.get_task(task_id)
-    if task is None or task["plan_id"] != plan["id"]:
+    segment_id, day_index = roadmap_plan_service.parse_task_id(task_id)
+    segment = roadmap_repo.get_segment(segment_id)
+    if segment is None or segment["plan_id"] != plan["id"]:
         raise ValueError("Task not found for this student.")
-    if task.get("goal_skill_id") != active_skill["id"]:
+    if segment.get("goal_skill_id") != active_skill["id"]:
         raise ValueError(
             f"Only {active_skill['skill_name']} tasks are unlocked right now. Complete this skill first."
         )
 
-    roadmap_repo.set_task_completed(task_id, completed)
+    completed_days = roadmap_plan_service.completed_days_after(segment, day_index, completed)
+    roadmap_repo.set_segment_completed_days(segment_id, completed_days)
 
-    if task["goal_skill_id"]:
-        skill_tasks = roadmap_repo.list_tasks_for_skill(plan["id"], task["goal_skill_id"])
-        if skill_tasks and all(item["is_completed"] == 1 for item in skill_tasks):
-            goals_repo.set_goal_skill_status(task["goal_skill_id"], "in_progress", None)
+    if segment["goal_skill_id"]:
+        skill_segments = roadmap_repo.list_segments(plan["id"], segment["goal_skill_id"])
+        if roadmap_plan_service.skill_is_complete(skill_segments):
+            goals_repo.set_goal_skill_status(segment["goal_skill_id"], "in_progress", None)
 
     from backend.roadmap_engine.services import matching_service
 
@@ -36,67 +36,79 @@ def _heuristic_company(goal_text: str, company_candidates: list[str]) -> str | N
     return None
 
 
-def parse_goal_text(goal_text: str) -> dict:
-    company_candidates = opportunities_repo.list_company_names()
-    fallback_company = _heuristic_company(goal_text, company_candidates)
-    fallback = {
-        "target_company": fallback_company,
+def _goal_parse_messages(goal_text: str) -> list[dict]:
+    prompt = (
+        "Extract structured goal details from the text. "
+        "Return JSON only with keys: target_company, target_role_family, confidence. "
+        "confidence must be between 0 and 1.\n\n"
+        f"Goal text: {goal_text}\n"
+    )
+    return [
+        {
+            "role": "system",
+            "content": "You extract structured career-goal information in strict JSON.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _goal_parse_result(content: str, fallback: dict, company_candidates: list[str]) -> dict:
+    parsed = _extract_json_object(content or "")
+    if not parsed:
+        return fallback
+
+    fallback_company = fallback["target_company"]
+    target_company = parsed.get("target_company") or fallback_company
+    target_role_family = parsed.get("target_role_family") or "Software Engineering"
+    confidence = parsed.get("confidence")
+    try:
+        confidence = float(confidence)
+    except (TypeError, ValueError):
+        confidence = fallback["confidence"]
+
+    normalized_company = None
+    if target_company:
+        company_lower = target_company.strip().lower()
+        for company in company_candidates:
+            if company.lower() == company_lower:
+                normalized_company = company
+                break
+        if normalized_company is None:
+            normalized_company = target_company.strip()
+
+    return {
+        "target_company": normalized_company,
+        "target_role_family": target_role_family.strip(),
+        "confidence": max(0.0, min(1.0, confidence)),
+    }
+
+
+def _goal_parse_fallback(goal_text: str, company_candidates: list[str]) -> dict:
+    return {
+        "target_company": _heuristic_company(goal_text, company_candidates),
         "target_role_family": "Software Engineering",
         "confidence": 0.45,
     }
 
+
+def parse_goal_text(goal_text: str) -> dict:
+    company_candidates = opportunities_repo.list_company_names()
+    fallback = _goal_parse_fallback(goal_text, company_candidates)
+
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         return fallback
 
     try:
-        from groq import Groq
-
-        client = Groq(api_key=api_key)
-        prompt = (
-            "Extract structured goal details from the text. "
-            "Return JSON only with keys: target_company, target_role_family, confidence. "
-            "confidence must be between 0 and 1.\n\n"
-            f"Goal text: {goal_text}\n"
-        )
-        response = client.chat.completions.create(
+        from backend.llm_gateway import chat_completion
+
+        response = chat_completion(
+            _goal_parse_messages(goal_text),
             model=GROQ_MODEL,
             temperature=0,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You extract structured career-goal information in strict JSON.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+            caller="goal_intelligence.parse_goal",
         )
-        parsed = _extract_json_object(response.choices[0].message.content or "")
-        if not parsed:
-            return fallback
-
-        target_company = parsed.get("target_company") or fallback_company
-        target_role_family = parsed.get("target_role_family") or "Software Engineering"
-        confidence = parsed.get("confidence")
-        try:
-            confidence = float(confidence)
-        except (TypeError, ValueError):
-            confidence = fallback["confidence"]
-
-        normalized_company = None
-        if target_company:
-            company_lower = target_company.strip().lower()
-            for company in company_candidates:
-                if company.lower() == company_lower:
-                    normalized_company = company
-                    break
-            if normalized_company is None:
-                normalized_company = target_company.strip()
-
-        return {
-            "target_company": normalized_company,
-            "target_role_family": target_role_family.strip(),
-            "confidence": max(0.0, min(1.0, confidence)),
-        }
+        return _goal_parse_result(response.choices[0].message.content, fallback, company_candidates)
     except Exception:
         return fallback
 
@@ -133,7 +145,7 @@ def _fallback_required_skills(goal_text: str, target_company: str | None) -> lis
     return baseline
 
 
-def synthesize_required_skills(goal_text: str, target_company: str | None) -> dict:
+def _required_skills_inputs(goal_text: str, target_company: str | None) -> tuple[list[dict], list[str], list[dict]]:
     opportunities = opportunities_repo.list_by_company(target_company, limit=120) if target_company else []
     fallback_skills = _fallback_required_skills(goal_text, target_company)
 
@@ -146,70 +158,83 @@ def synthesize_required_skills(goal_text: str, target_company: str | None) -> di
                 "skills": item.get("skills_list", []),
             }
         )
+    return opportunities, fallback_skills, sample_postings
+
+
+def _required_skills_messages(goal_text: str, target_company: str | None, sample_postings: list[dict]) -> list[dict]:
+    prompt = (
+        "Given career goal text and opportunity samples, produce a practical skill list.\n"
+        "Return JSON only with keys required_skills (array of strings) and rationale (short string).\n"
+        "Keep required_skills to 6-15 items ordered by priority.\n\n"
+        f"Goal text: {goal_text}\n"
+        f"Target company: {target_company}\n"
+        f"Opportunity samples: {json.dumps(sample_postings, ensure_ascii=False)}\n"
+    )
+    return [
+        {
+            "role": "system",
+            "content": "You infer required skills from job/hackathon opportunity data in strict JSON.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _required_skills_fallback(fallback_skills: list[str], opportunities: list[dict]) -> dict:
+    return {
+        "required_skills": fallback_skills,
+        "source": "opportunity_frequency_fallback",
+        "source_opportunity_count": len(opportunities),
+    }
+
+
+def _required_skills_result(content: str, opportunities: list[dict]) -> dict:
+    parsed = _extract_json_object(content or "")
+    if not parsed:
+        raise ValueError("Invalid JSON from LLM")
+
+    skills = parsed.get("required_skills")
+    if not isinstance(skills, list) or len(skills) == 0:
+        raise ValueError("Missing required_skills")
+
+    cleaned = []
+    seen = set()
+    for skill in skills:
+        text = str(skill).strip()
+        if not text:
+            continue
+        key = normalize_skill(text)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        cleaned.append(text)
+
+    if not cleaned:
+        raise ValueError("No valid skills after cleanup")
+
+    return {
+        "required_skills": cleaned,
+        "source": "llm_from_company_opportunities",
+        "source_opportunity_count": len(opportunities),
+        "rationale": parsed.get("rationale", ""),
+    }
+
+
+def synthesize_required_skills(goal_text: str, target_company: str | None) -> dict:
+    opportunities, fallback_skills, sample_postings = _required_skills_inputs(goal_text, target_company)
 
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key or not sample_postings:
-        return {
-            "required_skills": fallback_skills,
-            "source": "opportunity_frequency_fallback",
-            "source_opportunity_count": len(opportunities),
-        }
+        return _required_skills_fallback(fallback_skills, opportunities)
 
     try:
-        from groq import Groq
-
-        client = Groq(api_key=api_key)
-        prompt = (
-            "Given career goal text and opportunity samples, produce a practical skill list.\n"
-            "Return JSON only with keys required_skills (array of strings) and rationale (short string).\n"
-            "Keep required_skills to 6-15 items ordered by priority.\n\n"
-            f"Goal text: {goal_text}\n"
-            f"Target company: {target_company}\n"
-            f"Opportunity samples: {json.dumps(sample_postings, ensure_ascii=False)}\n"
-        )
-        response = client.chat.completions.create(
+        from backend.llm_gateway import chat_completion
+
+        response = chat_completion(
+            _required_skills_messages(goal_text, target_company, sample_postings),
             model=GROQ_MODEL,
             temperature=0.2,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You infer required skills from job/hackathon opportunity data in strict JSON.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+            caller="goal_intelligence.required_skills",
         )
-        parsed = _extract_json_object(response.choices[0].message.content or "")
-        if not parsed:
-            raise ValueError("Invalid JSON from LLM")
-
-        skills = parsed.get("required_skills")
-        if not isinstance(skills, list) or len(skills) == 0:
-            raise ValueError("Missing required_skills")
-
-        cleaned = []
-        seen = set()
-        for skill in skills:
-            text = str(skill).strip()
-            if not text:
-                continue
-            key = normalize_skill(text)
-            if not key or key in seen:
-                continue
-            seen.add(key)
-            cleaned.append(text)
-
-        if not cleaned:
-            raise ValueError("No valid skills after cleanup")
-
-        return {
-            "required_skills": cleaned,
-            "source": "llm_from_company_opportunities",
-            "source_opportunity_count": len(opportunities),
-            "rationale": parsed.get("rationale", ""),
-        }
+        return _required_skills_result(response.choices[0].message.content, opportunities)
     except Exception:
-        return {
-            "required_skills": fallback_skills,
-            "source": "opportunity_frequency_fallback",
-            "source_opportunity_count": len(opportunities),
-        }
+        return _required_skills_fallback(fallback_skills, opportunities)
@@ -0,0 +1,152 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from backend.roadmap_engine.storage import jobs_repo
+from backend.roadmap_engine.utils import utc_today
+
+PLAYLIST_RECOMMENDATIONS_JOB = "playlist_recommendations"
+DAILY_REPLAN_JOB = "daily_replan"
+
+# Jobs queued once per UTC day; the dated job key keeps it to one run per day
+# even across restarts and several worker processes.
+DAILY_JOBS = (DAILY_REPLAN_JOB,)
+
+# Idle workers still look for jobs queued by other processes this often.
+POLL_SECONDS = 5.0
+SCHEDULE_CHECK_SECONDS = 300.0
+FINISHED_JOB_RETENTION_DAYS = 7
+# A running job is leased to the worker that claimed it and renewed while the
+# handler runs; a job whose lease expires (its process died) is requeued.
+JOB_LEASE_SECONDS = 120.0
+LEASE_RENEW_SECONDS = 30.0
+
+# Unique per process, so workers of several uvicorn processes can tell their jobs apart.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_wake = threading.Event()
+_stop = threading.Event()
+_worker_lock = threading.Lock()
+_worker: threading.Thread | None = None
+
+
+def _handlers() -> dict:
+    # lazy imports: the services import this module to enqueue work
+    from backend.roadmap_engine.services import roadmap_adjustment_service, youtube_learning_service
+
+    return {
+        PLAYLIST_RECOMMENDATIONS_JOB: youtube_learning_service.generate_recommendations_job,
+        DAILY_REPLAN_JOB: roadmap_adjustment_service.replan_behind_schedule_plans,
+    }
+
+
+def enqueue(job_type: str, job_key: str, payload: dict) -> dict:
+    job = jobs_repo.enqueue_job(job_type, job_key, payload)
+    _wake.set()
+    return job
+
+
+def enqueue_due_daily_jobs() -> None:
+    today = utc_today().isoformat()
+    for job_type in DAILY_JOBS:
+        job_key = f"{job_type}:{today}"
+        if jobs_repo.get_latest_job(job_key) is None:
+            enqueue(job_type, job_key, {"today": today})
+
+
+@contextmanager
+def _lease_renewed(job_id: int):
+    """Keeps renewing the job's lease in a helper thread while the block runs."""
+
+    done = threading.Event()
+
+    def renew() -> None:
+        while not done.wait(LEASE_RENEW_SECONDS):
+            try:
+                if not jobs_repo.renew_lease(job_id, WORKER_ID, JOB_LEASE_SECONDS):
+                    return
+            except Exception as error:
+                print(f"Could not renew the lease of background job {job_id}: {error}")
+
+    renewer = threading.Thread(target=renew, name=f"job-lease-{job_id}", daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        done.set()
+        renewer.join()
+
+
+def run_next_job() -> bool:
+    """
+    Claims and runs one queued job. Handlers raise to mark the job failed.
+    Returns False when the queue is empty.
+    """
+
+    job = jobs_repo.claim_next_job(WORKER_ID, JOB_LEASE_SECONDS)
+    if job is None:
+        return False
+
+    handler = _handlers().get(job["job_type"])
+    if handler is None:
+        jobs_repo.finish_job(job["id"], WORKER_ID, f"No handler for job type '{job['job_type']}'.")
+        return True
+
+    try:
+        with _lease_renewed(job["id"]):
+            handler(**job["payload"])
+    except Exception as error:
+        jobs_repo.finish_job(job["id"], WORKER_ID, str(error) or type(error).__name__)
+    else:
+        jobs_repo.finish_job(job["id"], WORKER_ID)
+    return True
+
+
+def _worker_loop() -> None:
+    next_schedule_check = 0.0
+    while not _stop.is_set():
+        try:
+            if time.monotonic() >= next_schedule_check:
+                jobs_repo.requeue_expired_jobs()
+                enqueue_due_daily_jobs()
+                next_schedule_check = time.monotonic() + SCHEDULE_CHECK_SECONDS
+            ran = run_next_job()
+        except Exception as error:
+            print(f"Background job worker error: {error}")
+            ran = False
+        if not ran:
+            _wake.wait(POLL_SECONDS)
+            _wake.clear()
+
+
+def start_worker() -> None:
+    global _worker
+
+    with _worker_lock:
+        if _worker is not None and _worker.is_alive():
+            return
+
+        # Only jobs of stopped workers; live ones in other processes keep theirs.
+        jobs_repo.requeue_expired_jobs()
+        cutoff = datetime.now(tz=timezone.utc) - timedelta(days=FINISHED_JOB_RETENTION_DAYS)
+        jobs_repo.delete_finished_jobs(cutoff.isoformat())
+
+        _stop.clear()
+        _worker = threading.Thread(target=_worker_loop, name="background-jobs", daemon=True)
+        _worker.start()
+
+
+def stop_worker(timeout: float = 10.0) -> None:
+    global _worker
+
+    with _worker_lock:
+        if _worker is None:
+            return
+        _stop.set()
+        _wake.set()
+        _worker.join(timeout)
+        _worker = None
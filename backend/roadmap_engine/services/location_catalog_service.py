@@ -3,6 +3,8 @@ from pathlib import Path
 from threading import Lock
 from urllib.request import Request, urlopen
 
+from backend import metrics
+
 
 _LOCATION_SOURCE_URL = (
     "https://raw.githubusercontent.com/dr5hn/countries-states-cities-database/"
@@ -157,12 +159,16 @@ def _build_catalog(source_rows: list[dict]) -> dict:
 def _load_catalog() -> dict:
     global _CATALOG
     if _CATALOG is not None:
+        metrics.record_cache("location", True)
         return _CATALOG
 
     with _LOAD_LOCK:
         if _CATALOG is not None:
+            metrics.record_cache("location", True)
             return _CATALOG
 
+        metrics.record_cache("location", False)
+
         try:
             source_rows = _load_catalog_payload()
             _CATALOG = _build_catalog(source_rows)
@@ -1,5 +1,7 @@
 from datetime import timedelta
 
+from backend import metrics
+from backend.roadmap_engine.services import roadmap_plan_service
 from backend.roadmap_engine.services.skill_normalizer import display_skill, normalize_skill
 from backend.roadmap_engine.storage import goals_repo, matching_repo, opportunities_repo, roadmap_repo, students_repo
 from backend.roadmap_engine.utils import parse_iso_deadline, utc_today
@@ -20,23 +22,15 @@ def _goal_skill_completion_forecast(goal_id: int, days: int) -> dict[str, str]:
             forecast[skill["normalized_skill"]] = today.isoformat()
             continue
 
-        tasks = roadmap_repo.list_tasks_for_skill(plan["id"], skill["id"])
-        if not tasks:
+        segments = roadmap_repo.list_segments(plan["id"], skill["id"])
+        if not segments:
             continue
 
-        incomplete_dates = []
-        for task in tasks:
-            if task["is_completed"] == 1:
-                continue
-            parsed = parse_iso_deadline(task.get("task_date"))
-            if parsed is not None:
-                incomplete_dates.append(parsed)
-
-        if not incomplete_dates:
+        latest_incomplete = roadmap_plan_service.latest_open_date(segments)
+        if latest_incomplete is None:
             forecast[skill["normalized_skill"]] = today.isoformat()
             continue
 
-        latest_incomplete = max(incomplete_dates)
         if latest_incomplete <= horizon:
             forecast[skill["normalized_skill"]] = latest_incomplete.isoformat()
 
@@ -120,6 +114,28 @@ def _classify_match(required_keys: list[str], current_keys: set[str], next_keys:
     return "coming_soon", missing
 
 
+def _match_notification(
+    student_id: int,
+    goal_id: int,
+    opportunity_id: int,
+    notification_type: str,
+    title: str,
+    body: str,
+    today,
+) -> dict:
+    # Keyed by (student, type, opportunity, day): a repeated refresh, or one
+    # after the match cache was cleared, alerts at most once a day.
+    return {
+        "student_id": student_id,
+        "goal_id": goal_id,
+        "notification_type": notification_type,
+        "title": title,
+        "body": body,
+        "related_opportunity_id": opportunity_id,
+        "dedup_key": f"{student_id}:{notification_type}:{opportunity_id}:{today.isoformat()}",
+    }
+
+
 def refresh_opportunity_matches(student_id: int) -> dict:
     goal = goals_repo.get_active_goal(student_id)
     if goal is None:
@@ -180,36 +196,46 @@ def refresh_opportunity_matches(student_id: int) -> dict:
     )
     computed = computed[:120]
 
+    # Written in the same transaction as the match cache below.
+    today = utc_today()
+    notifications: list[dict] = []
+
     for match in computed:
         previous_row = previous.get(match["opportunity_id"])
         became_eligible = match["eligible_now"] and (
             previous_row is None or previous_row["eligible_now"] == 0
         )
         if became_eligible:
-            matching_repo.create_notification(
-                student_id=student_id,
-                goal_id=goal["id"],
-                notification_type="newly_eligible",
-                title="Newly Eligible Opportunity",
-                body=f"You are now eligible for {match['title']} at {match['company']}.",
-                related_opportunity_id=match["opportunity_id"],
+            notifications.append(
+                _match_notification(
+                    student_id,
+                    goal["id"],
+                    match["opportunity_id"],
+                    "newly_eligible",
+                    "Newly Eligible Opportunity",
+                    f"You are now eligible for {match['title']} at {match['company']}.",
+                    today,
+                )
             )
 
         deadline = parse_iso_deadline(match.get("deadline"))
         if deadline is not None:
-            days_left = (deadline - utc_today()).days
+            days_left = (deadline - today).days
             if 0 <= days_left <= 10 and match["bucket"] in {"eligible_now", "almost_eligible"}:
                 if previous_row is None or previous_row["bucket"] != match["bucket"]:
-                    matching_repo.create_notification(
-                        student_id=student_id,
-                        goal_id=goal["id"],
-                        notification_type="deadline_alert",
-                        title="Opportunity Deadline Soon",
-                        body=(
-                            f"{match['title']} ({match['company']}) closes in {days_left} day(s). "
-                            f"Status: {match['bucket'].replace('_', ' ')}."
-                        ),
-                        related_opportunity_id=match["opportunity_id"],
+                    notifications.append(
+                        _match_notification(
+                            student_id,
+                            goal["id"],
+                            match["opportunity_id"],
+                            "deadline_alert",
+                            "Opportunity Deadline Soon",
+                            (
+                                f"{match['title']} ({match['company']}) closes in {days_left} day(s). "
+                                f"Status: {match['bucket'].replace('_', ' ')}."
+                            ),
+                            today,
+                        )
                     )
 
     stripped = [
@@ -225,7 +251,14 @@ def refresh_opportunity_matches(student_id: int) -> dict:
         }
         for item in computed
     ]
-    matching_repo.replace_goal_matches(goal["id"], stripped)
+    # A hit means the stored matches were already current and the refresh
+    # only rewrote them.
+    metrics.record_cache(
+        "match",
+        {row["opportunity_id"]: (row["bucket"], int(row["eligible_now"])) for row in stripped}
+        == {key: (row["bucket"], row["eligible_now"]) for key, row in previous.items()},
+    )
+    matching_repo.replace_goal_matches(goal["id"], stripped, notifications)
 
     return bucketed_matches_for_student(student_id)
 
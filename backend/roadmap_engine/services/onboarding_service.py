@@ -43,13 +43,15 @@ def _normalize_required_skills(required_skills: list[str]) -> list[dict]:
     return normalized
 
 
-def _build_tasks(
+def _build_segments(
     *,
     skills_to_learn: list[dict],
     start_date,
     end_date,
     weekly_study_hours: int,
 ) -> list[dict]:
+    """One run of consecutive study days per skill, in skill order."""
+
     total_days = max((end_date - start_date).days + 1, 1)
     total_minutes = int(sum(skill["estimated_hours"] for skill in skills_to_learn) * 60)
     if total_minutes <= 0:
@@ -59,50 +61,48 @@ def _build_tasks(
     capacity_per_day = max(1, int((weekly_study_hours * 60) / 7))
     target_minutes_per_day = max(average_minutes_per_day, capacity_per_day)
 
-    tasks: list[dict] = []
+    segments: list[dict] = []
     day_offset = 0
 
     for skill in skills_to_learn:
         skill_minutes = int(skill["estimated_hours"] * 60)
-        remaining = skill_minutes
-
-        while remaining > 0 and day_offset < total_days:
-            current_date = start_date + timedelta(days=day_offset)
-            todays_minutes = min(target_minutes_per_day, remaining)
-            tasks.append(
-                {
-                    "goal_skill_id": skill["id"],
-                    "task_date": current_date.isoformat(),
-                    "title": f"Learn {skill['skill_name']}",
-                    "description": (
-                        f"Roadmap practice for {skill['skill_name']}. "
-                        "Watch the suggested playlist and complete notes/problems."
-                    ),
-                    "target_minutes": todays_minutes,
-                }
-            )
-            remaining -= todays_minutes
-            day_offset += 1
-
-        if remaining > 0 and tasks:
-            tasks[-1]["target_minutes"] += remaining
-
-    return tasks
+        if skill_minutes <= 0:
+            continue
 
+        days_left = total_days - day_offset
+        if days_left <= 0:
+            # No days left before the end date: the last study day absorbs the rest.
+            if segments:
+                segments[-1]["last_day_minutes"] += skill_minutes
+            continue
 
-def create_student_goal_plan(
+        day_count = min(math.ceil(skill_minutes / target_minutes_per_day), days_left)
+        segments.append(
+            {
+                "goal_skill_id": skill["id"],
+                "start_date": (start_date + timedelta(days=day_offset)).isoformat(),
+                "day_count": day_count,
+                "minutes_per_day": target_minutes_per_day,
+                "last_day_minutes": skill_minutes - target_minutes_per_day * (day_count - 1),
+            }
+        )
+        day_offset += day_count
+
+    return segments
+
+
+def _validate_onboarding(
     *,
     name: str,
     branch: str,
     current_year: int,
     weekly_study_hours: int,
     cgpa: float,
-    active_backlog: bool,
     selected_skills: list[str],
     custom_skills_text: str,
     goal_text: str,
     target_duration_months: int,
-) -> dict:
+) -> tuple[str, str, float, list[str]]:
     cleaned_name = name.strip()
     cleaned_goal_text = goal_text.strip()
 
@@ -132,6 +132,41 @@ def create_student_goal_plan(
     if not all_known_skills:
         raise ValueError("Add at least one current skill.")
 
+    return cleaned_name, cleaned_goal_text, cgpa_value, all_known_skills
+
+
+def create_student_goal_plan(
+    *,
+    name: str,
+    branch: str,
+    current_year: int,
+    weekly_study_hours: int,
+    cgpa: float,
+    active_backlog: bool,
+    selected_skills: list[str],
+    custom_skills_text: str,
+    goal_text: str,
+    target_duration_months: int,
+    goal_parse: dict | None = None,
+    requirements: dict | None = None,
+) -> dict:
+    """
+    `goal_parse` and `requirements` may be passed precomputed (seed_data
+    does, to skip the LLM); otherwise they are generated here.
+    """
+
+    cleaned_name, cleaned_goal_text, cgpa_value, all_known_skills = _validate_onboarding(
+        name=name,
+        branch=branch,
+        current_year=current_year,
+        weekly_study_hours=weekly_study_hours,
+        cgpa=cgpa,
+        selected_skills=selected_skills,
+        custom_skills_text=custom_skills_text,
+        goal_text=goal_text,
+        target_duration_months=target_duration_months,
+    )
+
     student_id = students_repo.create_student(
         name=cleaned_name,
         branch=branch,
@@ -156,11 +191,13 @@ def create_student_goal_plan(
         )
     students_repo.replace_student_skills(student_id, skill_rows)
 
-    goal_parse = parse_goal_text(cleaned_goal_text)
-    requirements = synthesize_required_skills(
-        goal_text=cleaned_goal_text,
-        target_company=goal_parse.get("target_company"),
-    )
+    if goal_parse is None:
+        goal_parse = parse_goal_text(cleaned_goal_text)
+    if requirements is None:
+        requirements = synthesize_required_skills(
+            goal_text=cleaned_goal_text,
+            target_company=goal_parse.get("target_company"),
+        )
     required_skills = _normalize_required_skills(requirements.get("required_skills", []))
     known_skill_keys = {row["normalized_skill"] for row in skill_rows}
     missing_skill_specs = [
@@ -190,13 +227,13 @@ def create_student_goal_plan(
 
     goal_skills = goals_repo.list_goal_skills(goal_id)
     plan_id = roadmap_repo.create_or_replace_plan(goal_id, start.isoformat(), end.isoformat())
-    roadmap_tasks = _build_tasks(
+    roadmap_segments = _build_segments(
         skills_to_learn=goal_skills,
         start_date=start,
         end_date=end,
         weekly_study_hours=weekly_study_hours,
     )
-    roadmap_repo.bulk_insert_tasks(plan_id, roadmap_tasks)
+    roadmap_repo.replace_plan_segments(plan_id, roadmap_segments)
 
     student = students_repo.get_student(student_id)
     return {
@@ -206,5 +243,5 @@ def create_student_goal_plan(
         "required_skills": [row["skill_name"] for row in required_skills],
         "missing_skills": [row["skill_name"] for row in goal_skills],
         "plan_id": plan_id,
-        "task_count": len(roadmap_tasks),
+        "task_count": sum(segment["day_count"] for segment in roadmap_segments),
     }
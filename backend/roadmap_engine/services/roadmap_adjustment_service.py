@@ -1,29 +1,183 @@
 from datetime import timedelta
 
-from backend.roadmap_engine.storage import goals_repo, matching_repo, roadmap_repo
+from backend.roadmap_engine.services import roadmap_plan_service
+from backend.roadmap_engine.storage import goals_repo, roadmap_repo
 from backend.roadmap_engine.utils import parse_iso_deadline, utc_today
 
+# Plans replanned per write transaction by the daily job.
+REPLAN_BATCH_SIZE = 200
+
+
+def _fit_days(open_days: list[int], available_days: int) -> list[int]:
+    """
+    Day counts for the open segments. When they do not fit before the end
+    date they are shrunk proportionally (largest remainder, at least one day
+    each) so that they add up to exactly `available_days`; with more segments
+    than days every segment gets one day.
+    """
+
+    total_days = sum(open_days)
+    if total_days <= available_days:
+        return list(open_days)
+    if len(open_days) >= available_days:
+        return [1] * len(open_days)
+
+    # Every segment keeps one day; the spare days are shared by the days beyond it.
+    spare_days = available_days - len(open_days)
+    extra_days = total_days - len(open_days)
+    shares = [(days - 1) * spare_days for days in open_days]
+    fitted = [1 + share // extra_days for share in shares]
+    leftover = available_days - sum(fitted)
+    by_remainder = sorted(range(len(open_days)), key=lambda index: -(shares[index] % extra_days))
+    for index in by_remainder[:leftover]:
+        fitted[index] += 1
+    return fitted
+
+
+def _plan_replan(plan: dict, open_segments: list[dict], today) -> dict | None:
+    """
+    Lays the unfinished days of a behind-schedule plan back to back from
+    today, compressing them into fewer, longer days when they would run past
+    the goal end date, so the plan never ends after it. `plan` has plan_id, goal_id, student_id,
+    target_end_date and overdue_count. A partly completed segment keeps its
+    done days and the rest moves to a new segment. Returns the
+    apply_replans() item, or None when nothing moves.
+    """
+
+    if not open_segments:
+        return None
+
+    target_end = parse_iso_deadline(plan["target_end_date"]) or today
+    if target_end < today:
+        target_end = today
+    available_days = (target_end - today).days + 1
+
+    open_days = [segment["day_count"] - segment["completed_days"] for segment in open_segments]
+    fitted_days = _fit_days(open_days, available_days)
+
+    segment_updates: list[tuple] = []
+    new_segments: list[dict] = []
+    updated_count = 0
+    cursor = today
+    for segment, days_left, days in zip(open_segments, open_days, fitted_days):
+        minutes = roadmap_plan_service.remaining_minutes(segment)
+        days = max(1, min(days, minutes))
+        if days == days_left:
+            minutes_per_day = segment["minutes_per_day"]
+            last_day_minutes = segment["last_day_minutes"]
+        else:
+            minutes_per_day = minutes // days
+            last_day_minutes = minutes - minutes_per_day * (days - 1)
+
+        # Only when there are more segments than days: the rest share the end date.
+        new_start = min(cursor, target_end).isoformat()
+        cursor += timedelta(days=days)
+        open_start = roadmap_plan_service.segment_start(segment) + timedelta(days=segment["completed_days"])
+        if open_start.isoformat() == new_start and days == days_left:
+            continue
+
+        updated_count += days
+        if segment["completed_days"] == 0:
+            segment_updates.append((segment["id"], new_start, days, minutes_per_day, last_day_minutes))
+            continue
+
+        # Done days stay where they were.
+        segment_updates.append(
+            (
+                segment["id"],
+                segment["start_date"],
+                segment["completed_days"],
+                segment["minutes_per_day"],
+                segment["minutes_per_day"],
+            )
+        )
+        new_segments.append(
+            {
+                "goal_skill_id": segment["goal_skill_id"],
+                "kind": segment["kind"],
+                "start_date": new_start,
+                "day_count": days,
+                "minutes_per_day": minutes_per_day,
+                "last_day_minutes": last_day_minutes,
+                "title": segment["title"],
+                "description": segment["description"],
+            }
+        )
+
+    if not segment_updates:
+        return None
+
+    first = open_segments[0]
+    overdue_count = plan["overdue_count"]
+    return {
+        "plan_id": plan["plan_id"],
+        "segment_updates": segment_updates,
+        "new_segments": new_segments,
+        "overdue_count": overdue_count,
+        "updated_count": updated_count,
+        "old_start": (roadmap_plan_service.segment_start(first) + timedelta(days=first["completed_days"])).isoformat(),
+        "new_start": today.isoformat(),
+        "notification": {
+            "student_id": plan["student_id"],
+            "goal_id": plan["goal_id"],
+            "notification_type": "roadmap_replanned",
+            "title": "Roadmap Updated",
+            "body": (
+                f"We rescheduled {updated_count} task(s) because {overdue_count} task(s) were missed."
+            ),
+        },
+    }
 
-def _reschedule_dates(total_tasks: int, start_date, end_date) -> list[str]:
-    if total_tasks <= 0:
-        return []
 
-    available_days = max((end_date - start_date).days + 1, 1)
-    if total_tasks == 1:
-        return [start_date.isoformat()]
+def replan_behind_schedule_plans(today: str | None = None, batch_size: int = REPLAN_BATCH_SIZE) -> dict:
+    """
+    Daily job: replans every active plan with missed days. The plans come
+    from one grouped query over roadmap_plan_segments and are written in
+    batches of `batch_size` plans per transaction.
+    """
+
+    today_date = parse_iso_deadline(today) or utc_today()
+    behind = roadmap_repo.list_behind_schedule_plans(today_date.isoformat())
+
+    replanned = 0
+    updated_tasks = 0
+    for start in range(0, len(behind), batch_size):
+        batch = behind[start:start + batch_size]
+        segments_by_plan = roadmap_repo.list_open_segments_by_plan([plan["plan_id"] for plan in batch])
+
+        replans = []
+        for plan in batch:
+            replan = _plan_replan(plan, segments_by_plan.get(plan["plan_id"], []), today_date)
+            if replan is not None:
+                replans.append(replan)
+
+        roadmap_repo.apply_replans(replans)
+        replanned += len(replans)
+        updated_tasks += sum(item["updated_count"] for item in replans)
+
+    return {
+        "behind_plans": len(behind),
+        "replanned_plans": replanned,
+        "updated_task_count": updated_tasks,
+    }
 
-    new_dates: list[str] = []
-    for idx in range(total_tasks):
-        if available_days == 1:
-            day_offset = 0
-        else:
-            day_offset = int((idx * (available_days - 1)) / (total_tasks - 1))
-        new_date = start_date + timedelta(days=day_offset)
-        new_dates.append(new_date.isoformat())
-    return new_dates
+
+def replan_info(plan: dict) -> dict:
+    """What the dashboard shows about the last replan; it no longer replans itself."""
+
+    replanned_at = str(plan.get("last_replanned_at") or "")
+    if not replanned_at.startswith(utc_today().isoformat()):
+        return {"applied": False}
+    return {
+        "applied": True,
+        "updated_task_count": plan.get("last_replan_updated_count") or 0,
+        "overdue_task_count": plan.get("last_replan_overdue_count") or 0,
+    }
 
 
 def auto_replan_if_behind(student_id: int) -> dict:
+    """Replans one student's plan right away (the manual replan button)."""
+
     goal = goals_repo.get_active_goal(student_id)
     if goal is None:
         return {"applied": False, "reason": "no_active_goal"}
@@ -33,47 +187,34 @@ def auto_replan_if_behind(student_id: int) -> dict:
         return {"applied": False, "reason": "no_active_plan"}
 
     today = utc_today()
-    today_iso = today.isoformat()
-    overdue_count = roadmap_repo.count_overdue_incomplete(plan["id"], today_iso)
+    overdue_count = roadmap_repo.count_overdue_days(plan["id"], today.isoformat())
     if overdue_count == 0:
         return {"applied": False, "reason": "on_track"}
 
-    target_end = parse_iso_deadline(goal["target_end_date"]) or today
-    if target_end < today:
-        target_end = today
-
-    incomplete_tasks = roadmap_repo.list_incomplete_tasks(plan["id"])
-    if not incomplete_tasks:
+    open_segments = roadmap_repo.list_open_segments_by_plan([plan["id"]])[plan["id"]]
+    if not open_segments:
         return {"applied": False, "reason": "no_incomplete_tasks"}
 
-    old_dates = [task["task_date"] for task in incomplete_tasks]
-    new_dates = _reschedule_dates(len(incomplete_tasks), today, target_end)
-
-    updates: list[tuple[int, str]] = []
-    for task, new_date in zip(incomplete_tasks, new_dates):
-        if task["task_date"] != new_date:
-            updates.append((task["id"], new_date))
-
-    if not updates:
+    replan = _plan_replan(
+        {
+            "plan_id": plan["id"],
+            "goal_id": goal["id"],
+            "student_id": student_id,
+            "target_end_date": goal["target_end_date"],
+            "overdue_count": overdue_count,
+        },
+        open_segments,
+        today,
+    )
+    if replan is None:
         return {"applied": False, "reason": "no_change_needed"}
 
-    roadmap_repo.bulk_update_task_dates(updates)
-    roadmap_repo.mark_plan_replanned(plan["id"])
-
-    matching_repo.create_notification(
-        student_id=student_id,
-        goal_id=goal["id"],
-        notification_type="roadmap_replanned",
-        title="Roadmap Updated",
-        body=(
-            f"We rescheduled {len(updates)} task(s) because {overdue_count} task(s) were missed."
-        ),
-    )
+    roadmap_repo.apply_replans([replan])
 
     return {
         "applied": True,
-        "updated_task_count": len(updates),
+        "updated_task_count": replan["updated_count"],
         "overdue_task_count": overdue_count,
-        "old_start": old_dates[0],
-        "new_start": new_dates[0],
+        "old_start": replan["old_start"],
+        "new_start": replan["new_start"],
     }
@@ -0,0 +1,206 @@
+from datetime import date, timedelta
+
+from backend.roadmap_engine.storage import roadmap_repo
+from backend.roadmap_engine.utils import parse_iso_deadline
+
+# A plan is stored as per-skill segments of consecutive study days. Days up
+# to `completed_days` are done; daily tasks are expanded only for the dates
+# a caller asks for. Task ids are "<segment_id>-<day_index>".
+TASK_ID_SEPARATOR = "-"
+
+
+def make_task_id(segment_id: int, day_index: int) -> str:
+    return f"{segment_id}{TASK_ID_SEPARATOR}{day_index}"
+
+
+def parse_task_id(task_id: str) -> tuple[int, int]:
+    segment_part, _, day_part = str(task_id).partition(TASK_ID_SEPARATOR)
+    try:
+        segment_id, day_index = int(segment_part), int(day_part)
+    except ValueError:
+        raise ValueError("Task not found for this student.") from None
+    if day_index < 1:
+        raise ValueError("Task not found for this student.")
+    return segment_id, day_index
+
+
+def segment_start(segment: dict) -> date:
+    return date.fromisoformat(segment["start_date"])
+
+
+def segment_end(segment: dict) -> date:
+    return segment_start(segment) + timedelta(days=segment["day_count"] - 1)
+
+
+def segment_is_complete(segment: dict) -> bool:
+    return segment["completed_days"] >= segment["day_count"]
+
+
+def skill_is_complete(segments: list[dict]) -> bool:
+    return bool(segments) and all(segment_is_complete(segment) for segment in segments)
+
+
+def remaining_minutes(segment: dict) -> int:
+    open_days = segment["day_count"] - segment["completed_days"]
+    if open_days <= 0:
+        return 0
+    return segment["minutes_per_day"] * (open_days - 1) + segment["last_day_minutes"]
+
+
+def latest_open_date(segments: list[dict]) -> date | None:
+    open_ends = [segment_end(segment) for segment in segments if not segment_is_complete(segment)]
+    return max(open_ends) if open_ends else None
+
+
+def progress(segments: list[dict]) -> dict:
+    total_tasks = sum(segment["day_count"] for segment in segments)
+    completed_tasks = sum(min(segment["completed_days"], segment["day_count"]) for segment in segments)
+    return {
+        "completed_tasks": completed_tasks,
+        "total_tasks": total_tasks,
+        "completion_percent": (completed_tasks / total_tasks) * 100 if total_tasks else 0.0,
+    }
+
+
+def _learn_content(skill_name: str, day_number: int, total_days: int, playlist: dict | None) -> tuple[str, str]:
+    if playlist is None:
+        return (
+            f"Learn {skill_name}",
+            (
+                f"Roadmap practice for {skill_name}. "
+                "Watch the suggested playlist and complete notes/problems."
+            ),
+        )
+
+    summary = playlist.get("summary", {}) or {}
+    try:
+        video_count = int(summary.get("video_count", 0))
+    except (TypeError, ValueError):
+        video_count = 0
+
+    idx = day_number - 1
+    if video_count > 0 and total_days > 0:
+        start_video = int((idx * video_count) / total_days) + 1
+        end_video = int(((idx + 1) * video_count) / total_days)
+        if end_video < start_video:
+            end_video = start_video
+        schedule_line = f"Watch videos {start_video}-{end_video}"
+    else:
+        schedule_line = "Watch the next part of your selected playlist"
+
+    return (
+        f"{skill_name}: Playlist Day {day_number}",
+        (
+            f"{schedule_line} for {skill_name}.\n"
+            f"Playlist: {playlist.get('title', '')}\n"
+            f"Channel: {playlist.get('channel_title', '')}\n"
+            f"URL: {playlist.get('playlist_url', '')}"
+        ),
+    )
+
+
+def expand_segments(
+    segments: list[dict],
+    *,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    playlists: dict[int, dict] | None = None,
+) -> list[dict]:
+    """
+    Daily task dicts for the segment days between date_from and date_to.
+    Learn days are numbered across all of a skill's learn segments, so pass
+    every segment of the skills being expanded; `playlists` maps
+    goal_skill_id to the selected playlist used for the day titles.
+    """
+
+    playlists = playlists or {}
+    window_start = parse_iso_deadline(date_from)
+    window_end = parse_iso_deadline(date_to)
+
+    learn_offsets: dict[int, int] = {}
+    learn_totals: dict[int | None, int] = {}
+    for segment in segments:
+        if segment["kind"] == "learn":
+            skill_id = segment["goal_skill_id"]
+            learn_offsets[segment["id"]] = learn_totals.get(skill_id, 0)
+            learn_totals[skill_id] = learn_totals.get(skill_id, 0) + segment["day_count"]
+
+    tasks: list[dict] = []
+    for segment in segments:
+        start = segment_start(segment)
+        first_day = 1
+        last_day = segment["day_count"]
+        if window_start is not None:
+            first_day = max(first_day, (window_start - start).days + 1)
+        if window_end is not None:
+            last_day = min(last_day, (window_end - start).days + 1)
+
+        skill_name = segment.get("skill_name") or ""
+        playlist = playlists.get(segment["goal_skill_id"])
+        for day_index in range(first_day, last_day + 1):
+            if segment["kind"] == "learn":
+                title, description = _learn_content(
+                    skill_name,
+                    learn_offsets[segment["id"]] + day_index,
+                    learn_totals[segment["goal_skill_id"]],
+                    playlist,
+                )
+            else:
+                title, description = segment["title"] or "", segment["description"] or ""
+
+            is_completed = day_index <= segment["completed_days"]
+            tasks.append(
+                {
+                    "id": make_task_id(segment["id"], day_index),
+                    "segment_id": segment["id"],
+                    "day_index": day_index,
+                    "plan_id": segment["plan_id"],
+                    "goal_skill_id": segment["goal_skill_id"],
+                    "task_date": (start + timedelta(days=day_index - 1)).isoformat(),
+                    "title": title,
+                    "description": description,
+                    "target_minutes": (
+                        segment["last_day_minutes"] if day_index == segment["day_count"] else segment["minutes_per_day"]
+                    ),
+                    "is_completed": 1 if is_completed else 0,
+                    "completed_at": segment["completed_at"] if is_completed else None,
+                    "created_at": segment["created_at"],
+                    "skill_name": segment.get("skill_name"),
+                    "normalized_skill": segment.get("normalized_skill"),
+                }
+            )
+
+    tasks.sort(key=lambda task: (task["task_date"], task["segment_id"]))
+    return tasks
+
+
+def list_tasks(
+    goal_id: int,
+    plan_id: int,
+    *,
+    goal_skill_id: int | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+) -> list[dict]:
+    from backend.roadmap_engine.services import youtube_learning_service
+
+    segments = roadmap_repo.list_segments(plan_id, goal_skill_id)
+    playlists = {}
+    for skill_id in {segment["goal_skill_id"] for segment in segments if segment["kind"] == "learn"}:
+        if skill_id is None:
+            continue
+        selected = youtube_learning_service.get_selected_playlist(goal_id, skill_id)
+        if selected is not None:
+            playlists[skill_id] = selected
+
+    return expand_segments(segments, date_from=date_from, date_to=date_to, playlists=playlists)
+
+
+def completed_days_after(segment: dict, day_index: int, completed: bool) -> int:
+    """The new completed-through cursor after marking one day done or not done."""
+
+    if day_index > segment["day_count"]:
+        raise ValueError("Task not found for this student.")
+    if completed:
+        return max(segment["completed_days"], day_index)
+    return min(segment["completed_days"], day_index - 1)
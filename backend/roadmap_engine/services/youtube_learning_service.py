@@ -1,21 +1,17 @@
-from backend.roadmap_engine.storage import playlist_repo, roadmap_repo
+from datetime import datetime, timedelta, timezone
 
+from backend import metrics
+from backend.roadmap_engine.storage import jobs_repo, playlist_repo
+from backend.youtube_module import ranking, youtube_client
+from backend.youtube_module.llm_explainer import explain_playlists
+
+# A failed generation is retried by the next dashboard load after this long.
+RETRY_FAILED_RECOMMENDATIONS_AFTER = timedelta(minutes=10)
 
-def _fetch_recommendations_from_youtube(skill_name: str, limit: int = 3) -> tuple[list[dict], str | None]:
-    try:
-        from backend.youtube_module.llm_explainer.explain_playlists import get_or_generate_explanation
-        from backend.youtube_module.ranking import aggregate_playlist_stats, rank_playlists
-        from backend.youtube_module.youtube_client import (
-            get_video_statistics,
-            get_video_titles,
-            get_videos_in_playlist,
-            search_playlists,
-        )
-    except Exception as error:
-        return [], f"YouTube module import failed: {error}"
 
+def _fetch_recommendations_from_youtube(skill_name: str, limit: int = 3) -> tuple[list[dict], str | None]:
     try:
-        playlists = search_playlists(skill_name)
+        playlists = youtube_client.search_playlists(skill_name)
     except Exception as error:
         return [], f"YouTube search failed: {error}"
 
@@ -29,38 +25,44 @@ def _fetch_recommendations_from_youtube(skill_name: str, limit: int = 3) -> tupl
     for playlist in playlists:
         playlist_id = playlist["playlist_id"]
         try:
-            video_ids = get_videos_in_playlist(playlist_id, max_videos=120)
+            video_ids = youtube_client.get_videos_in_playlist(playlist_id, max_videos=120)
         except Exception as error:
             return [], f"Failed to read playlist videos: {error}"
         playlist_video_map[playlist_id] = video_ids
         all_video_ids.update(video_ids)
 
         try:
-            title_map = get_video_titles(video_ids[:8]) if video_ids else {}
+            title_map = youtube_client.get_video_titles(video_ids[:8]) if video_ids else {}
         except Exception:
             title_map = {}
         playlist["top_video_titles"] = list(title_map.values())
 
     try:
-        video_stats = get_video_statistics(list(all_video_ids)) if all_video_ids else {}
+        video_stats = youtube_client.get_video_statistics(list(all_video_ids)) if all_video_ids else {}
     except Exception as error:
         return [], f"Failed to fetch video statistics: {error}"
     for playlist in playlists:
         ids = playlist_video_map.get(playlist["playlist_id"], [])
-        playlist.update(aggregate_playlist_stats(ids, video_stats))
+        playlist.update(ranking.aggregate_playlist_stats(ids, video_stats))
 
-    ranked = rank_playlists(playlists)[:limit]
+    ranked = ranking.rank_playlists(playlists)[:limit]
     if not ranked:
         return [], "No ranked playlists available after scoring."
 
-    output = []
+    summaries = []
     for item in ranked:
-        video_ids = playlist_video_map.get(item["playlist_id"], [])
-        summary = {}
         try:
-            summary = get_or_generate_explanation(item)
+            summaries.append(explain_playlists.get_or_generate_explanation(item))
         except Exception:
-            summary = {}
+            summaries.append({})
+
+    return _recommendation_rows(ranked, playlist_video_map, summaries), None
+
+
+def _recommendation_rows(ranked: list[dict], playlist_video_map: dict, summaries: list[dict]) -> list[dict]:
+    output = []
+    for item, summary in zip(ranked, summaries):
+        video_ids = playlist_video_map.get(item["playlist_id"], [])
 
         enhanced_summary = {
             **summary,
@@ -86,72 +88,96 @@ def _fetch_recommendations_from_youtube(skill_name: str, limit: int = 3) -> tupl
             }
         )
 
-    return output, None
+    return output
+
+
+def _store_recommendations(goal_id: int, goal_skill_id: int, generated: list[dict]) -> tuple[list[dict], str | None]:
+    playlist_repo.replace_skill_recommendations(goal_id, goal_skill_id, generated)
+    # Re-load from DB so recommendations include row ids required by selection form.
+    refreshed = playlist_repo.list_skill_recommendations(goal_id, goal_skill_id)
+    if refreshed:
+        return refreshed[:3], None
+    return [], "Playlist generation succeeded, but save failed. Please refresh and retry."
 
 
 def get_or_create_recommendations(goal_id: int, goal_skill_id: int, skill_name: str) -> tuple[list[dict], str | None]:
     cached = playlist_repo.list_skill_recommendations(goal_id, goal_skill_id)
+    metrics.record_cache("playlist", bool(cached))
     if cached:
         return cached[:3], None
 
     generated, error = _fetch_recommendations_from_youtube(skill_name, limit=3)
     if generated:
-        playlist_repo.replace_skill_recommendations(goal_id, goal_skill_id, generated)
-        # Re-load from DB so recommendations include row ids required by selection form.
-        refreshed = playlist_repo.list_skill_recommendations(goal_id, goal_skill_id)
-        if refreshed:
-            return refreshed[:3], None
-        return [], "Playlist generation succeeded, but save failed. Please refresh and retry."
+        return _store_recommendations(goal_id, goal_skill_id, generated)
     return [], error or "No playlist suggestions available yet."
 
 
-def _annotate_tasks_with_playlist(
-    *,
-    goal_id: int,
-    goal_skill_id: int,
-    skill_name: str,
-    playlist: dict,
-) -> None:
-    plan = roadmap_repo.get_active_plan(goal_id)
-    if not plan:
-        return
-
-    tasks = roadmap_repo.list_tasks_for_skill(plan["id"], goal_skill_id)
-    active_tasks = [task for task in tasks if task["is_completed"] == 0]
-    if not active_tasks:
-        return
-
-    summary = playlist.get("summary", {}) or {}
-    video_count_raw = summary.get("video_count", 0)
+def generate_recommendations_job(goal_id: int, goal_skill_id: int, skill_name: str) -> None:
+    """Background job handler; raising marks the job failed with the message shown on the dashboard."""
+
+    recommendations, error = get_or_create_recommendations(goal_id, goal_skill_id, skill_name)
+    if not recommendations:
+        raise RuntimeError(error or "No playlist suggestions available yet.")
+
+
+def _recommendation_job_key(goal_skill_id: int) -> str:
+    return f"playlist_recommendations:{goal_skill_id}"
+
+
+def _retry_due(job: dict) -> bool:
     try:
-        video_count = int(video_count_raw)
+        finished_at = datetime.fromisoformat(job["finished_at"])
     except (TypeError, ValueError):
-        video_count = 0
-
-    total_days = len(active_tasks)
-    updates: list[tuple[int, str, str]] = []
-    for idx, task in enumerate(active_tasks):
-        day_index = idx + 1
-        title = f"{skill_name}: Playlist Day {day_index}"
-
-        if video_count > 0 and total_days > 0:
-            start_video = int((idx * video_count) / total_days) + 1
-            end_video = int(((idx + 1) * video_count) / total_days)
-            if end_video < start_video:
-                end_video = start_video
-            schedule_line = f"Watch videos {start_video}-{end_video}"
-        else:
-            schedule_line = "Watch the next part of your selected playlist"
-
-        description = (
-            f"{schedule_line} for {skill_name}.\n"
-            f"Playlist: {playlist.get('title', '')}\n"
-            f"Channel: {playlist.get('channel_title', '')}\n"
-            f"URL: {playlist.get('playlist_url', '')}"
-        )
-        updates.append((task["id"], title, description))
+        return True
+    return datetime.now(tz=timezone.utc) - finished_at >= RETRY_FAILED_RECOMMENDATIONS_AFTER
+
+
+def get_recommendation_status(goal_id: int, goal_skill_id: int) -> tuple[list[dict], str, str | None]:
+    """
+    Read-only: returns (recommendations, status, error). The status is
+    "ready" once cached, "preparing" while a job is queued or running,
+    "failed" while a failed job waits for its retry and "missing" when no
+    job is pending (the next dashboard load queues one).
+    """
+
+    cached = playlist_repo.list_skill_recommendations(goal_id, goal_skill_id)
+    if cached:
+        return cached[:3], "ready", None
 
-    roadmap_repo.bulk_update_task_content(updates)
+    latest = jobs_repo.get_latest_job(_recommendation_job_key(goal_skill_id))
+    if latest and latest["status"] in {"queued", "running"}:
+        return [], "preparing", None
+    if latest and latest["status"] == "failed" and not _retry_due(latest):
+        return [], "failed", latest["error_text"]
+    return [], "missing", None
+
+
+def get_or_request_recommendations(
+    goal_id: int,
+    goal_skill_id: int,
+    skill_name: str,
+) -> tuple[list[dict], str, str | None]:
+    """
+    Returns (recommendations, status, error) without calling YouTube or the
+    LLM. On a cache miss generation is queued as a background job and the
+    status is "preparing"; it is "ready" once cached and "failed" while a
+    failed job waits for its retry.
+    """
+
+    # Polls go through get_recommendation_status directly and are not counted.
+    recommendations, status, error = get_recommendation_status(goal_id, goal_skill_id)
+    metrics.record_cache("playlist", status == "ready")
+    if status != "missing":
+        return recommendations, status, error
+
+    from backend.roadmap_engine.services import job_queue_service
+
+    job_queue_service.enqueue(
+        job_queue_service.PLAYLIST_RECOMMENDATIONS_JOB,
+        _recommendation_job_key(goal_skill_id),
+        {"goal_id": goal_id, "goal_skill_id": goal_skill_id, "skill_name": skill_name},
+    )
+    return [], "preparing", None
 
 
 def select_playlist(goal_id: int, goal_skill_id: int, recommendation_id: int, skill_name: str) -> dict:
@@ -159,12 +185,12 @@ def select_playlist(goal_id: int, goal_skill_id: int, recommendation_id: int, sk
     selected = playlist_repo.get_selected_recommendation(goal_id, goal_skill_id)
     if selected is None:
         raise ValueError("Failed to save selected playlist.")
-    _annotate_tasks_with_playlist(
-        goal_id=goal_id,
-        goal_skill_id=goal_skill_id,
-        skill_name=skill_name,
-        playlist=selected,
-    )
+    # Task titles and video ranges follow the selection when plan days are expanded.
+
+    # Build the skill-test question bank while the student watches the playlist.
+    from backend.roadmap_engine.services import assessment_service
+
+    assessment_service.schedule_question_bank_fill(selected, skill_name)
     return selected
 
 
@@ -1,5 +1,7 @@
+import hashlib
 import json
 
+from backend.roadmap_engine.storage import versions_repo
 from backend.roadmap_engine.storage.database import get_connection, transaction
 from backend.roadmap_engine.utils import utc_now_iso
 
@@ -27,6 +29,7 @@ def create_assessment(
     goal_skill_id: int,
     questions: list[dict],
     answer_key: list[int],
+    bank_question_ids: list[int] | None = None,
 ) -> int:
     now = utc_now_iso()
     attempt_no = get_attempt_count(goal_skill_id) + 1
@@ -54,7 +57,17 @@ def create_assessment(
                 now,
             ),
         )
-        return int(cursor.lastrowid)
+        assessment_id = int(cursor.lastrowid)
+        if bank_question_ids:
+            cursor.executemany(
+                """
+                INSERT OR IGNORE INTO assessment_bank_draws (assessment_id, bank_question_id)
+                VALUES (?, ?)
+                """,
+                [(assessment_id, question_id) for question_id in bank_question_ids],
+            )
+        versions_repo.bump_goal_student(connection, goal_id)
+        return assessment_id
 
 
 def get_assessment(assessment_id: int) -> dict | None:
@@ -165,6 +178,7 @@ def submit_assessment(
                 assessment_id,
             ),
         )
+        versions_repo.bump_assessment_student(connection, assessment_id)
 
 
 def list_assessments_for_goal(
@@ -207,3 +221,86 @@ def list_assessments_for_goal(
         connection.close()
 
     return [dict(row) for row in rows]
+
+
+def _question_hash(question: dict) -> str:
+    text = " ".join(str(question.get("question", "")).lower().split())
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def add_bank_questions(
+    *,
+    playlist_recommendation_id: int,
+    normalized_skill: str,
+    questions: list[dict],
+    answer_key: list[int],
+) -> int:
+    now = utc_now_iso()
+    with transaction() as connection:
+        before = connection.total_changes
+        connection.executemany(
+            """
+            INSERT OR IGNORE INTO assessment_question_bank (
+                playlist_recommendation_id,
+                normalized_skill,
+                question_hash,
+                question_json,
+                answer_index,
+                difficulty,
+                created_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    playlist_recommendation_id,
+                    normalized_skill,
+                    _question_hash(question),
+                    json.dumps(question, ensure_ascii=False),
+                    int(answer),
+                    str(question.get("difficulty", "basic")),
+                    now,
+                )
+                for question, answer in zip(questions, answer_key)
+            ],
+        )
+        return connection.total_changes - before
+
+
+def list_bank_questions(
+    playlist_recommendation_id: int,
+    normalized_skill: str,
+    goal_skill_id: int | None = None,
+) -> list[dict]:
+    """Bank questions with `times_drawn` counted over attempts for `goal_skill_id`."""
+
+    connection = get_connection()
+    try:
+        rows = connection.execute(
+            """
+            SELECT
+                b.id,
+                b.question_json,
+                b.answer_index,
+                b.difficulty,
+                (
+                    SELECT COUNT(*)
+                    FROM assessment_bank_draws d
+                    JOIN skill_assessments a ON a.id = d.assessment_id
+                    WHERE d.bank_question_id = b.id AND a.goal_skill_id = ?
+                ) AS times_drawn
+            FROM assessment_question_bank b
+            WHERE b.playlist_recommendation_id = ? AND b.normalized_skill = ?
+            ORDER BY b.id ASC
+            """,
+            (goal_skill_id, playlist_recommendation_id, normalized_skill),
+        ).fetchall()
+    finally:
+        connection.close()
+
+    result: list[dict] = []
+    for row in rows:
+        item = dict(row)
+        item["question"] = json.loads(item.pop("question_json"))
+        result.append(item)
+    return result
@@ -1,3 +1,4 @@
+from backend.roadmap_engine.storage import versions_repo
 from backend.roadmap_engine.storage.database import get_connection, transaction
 from backend.roadmap_engine.utils import utc_now_iso
 
@@ -116,6 +117,7 @@ def add_message(session_id: int, role: str, message_text: str) -> int:
             """,
             (now, session_id),
         )
+        versions_repo.bump_chat_session_student(connection, session_id)
         return int(cursor.lastrowid)
 
 
@@ -1,5 +1,6 @@
 import json
 
+from backend.roadmap_engine.storage import versions_repo
 from backend.roadmap_engine.storage.database import get_connection, transaction
 from backend.roadmap_engine.utils import utc_now_iso
 
@@ -194,6 +195,7 @@ def upsert_job_application(job_id: int, student_id: int, status: str) -> None:
             """,
             (job_id, student_id, status, now, now),
         )
+        versions_repo.bump_student(connection, student_id)
 
 
 def get_job_application(job_id: int, student_id: int) -> dict | None:
@@ -232,6 +234,7 @@ def set_job_application_status(job_id: int, student_id: int, status: str) -> Non
             """,
             (status, acted_at, now, job_id, student_id),
         )
+        versions_repo.bump_student(connection, student_id)
 
 
 def list_job_applications(job_id: int) -> list[dict]:
@@ -273,6 +276,7 @@ def add_shortlist(job_id: int, student_id: int) -> None:
             """,
             (job_id, student_id, now),
         )
+        versions_repo.bump_student(connection, student_id)
 
 
 def list_shortlisted_students(job_id: int) -> list[dict]:
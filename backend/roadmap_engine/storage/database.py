@@ -1,12 +1,155 @@
+import os
+import re
 import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
 from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Iterator
 
 from backend.roadmap_engine.config import DB_PATH
 
+# Per-request query instrumentation (see track_queries). Off unless enabled,
+# so normal connections carry no trace callback or timing wrappers.
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "") == "1"
+# Statement shapes run at least this many times in one request are reported
+# as likely N+1 queries.
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))
+SLOWEST_STATEMENTS = 5
+
+# Transaction control is not a query; it is counted but never flagged.
+_CONTROL_STATEMENTS = ("BEGIN", "COMMIT", "ROLLBACK", "PRAGMA", "SAVEPOINT", "RELEASE")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(sql: str) -> str:
+    """The statement with literals and placeholder lists folded, so repeats group together."""
+
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    return _PLACEHOLDER_LIST.sub("(?...)", shape)
+
+
+class QueryStats:
+    """
+    Queries run while a track_queries() block is active, across every thread
+    the request's context reaches. query_count comes from the sqlite3 trace
+    callback, so it includes each row of an executemany and the implicit
+    BEGIN/COMMIT. Times (execute plus fetching the rows) and call counts are
+    kept per statement shape; an executemany is one call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.query_count = 0
+        self.total_seconds = 0.0
+        self.calls: Counter = Counter()
+        self.seconds: dict[str, float] = defaultdict(float)
+
+    def _on_statement(self, sql: str) -> None:
+        with self._lock:
+            self.query_count += 1
+
+    def _on_timed(self, sql: str, elapsed: float, *, call: bool) -> None:
+        shape = statement_shape(sql)
+        with self._lock:
+            self.total_seconds += elapsed
+            self.seconds[shape] += elapsed
+            if call:
+                self.calls[shape] += 1
+
+    def slowest_statements(self, limit: int = SLOWEST_STATEMENTS) -> list[tuple[str, int, float]]:
+        """(shape, calls, seconds) for the shapes that took the most time in total."""
+
+        with self._lock:
+            ranked = sorted(self.seconds.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [(shape, self.calls[shape], seconds) for shape, seconds in ranked]
+
+    def repeated_statements(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list[tuple[str, int, float]]:
+        """(shape, calls, seconds) for statements that look like N+1 queries, most frequent first."""
+
+        with self._lock:
+            return [
+                (shape, count, self.seconds[shape])
+                for shape, count in self.calls.most_common()
+                if count >= threshold and not shape.upper().startswith(_CONTROL_STATEMENTS)
+            ]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("sql_query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Records the queries of connections opened inside the block (and in
+    threads that inherit its context, e.g. run_in_threadpool).
+    """
+
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+class _TimedCursor(sqlite3.Cursor):
+    _last_sql = ""
+
+    def _timed(self, sql: str, call: bool, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self.connection.query_stats._on_timed(sql, time.perf_counter() - start, call=call)
+
+    def execute(self, sql, parameters=()):
+        self._last_sql = sql
+        return self._timed(sql, True, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._last_sql = sql
+        return self._timed(sql, True, super().executemany, sql, seq_of_parameters)
+
+    # Rows are stepped while fetching; that time belongs to the statement too.
+    def fetchone(self):
+        return self._timed(self._last_sql, False, super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._timed(self._last_sql, False, super().fetchmany, *(() if size is None else (size,)))
+
+    def fetchall(self):
+        return self._timed(self._last_sql, False, super().fetchall)
+
+
+class _TimedConnection(sqlite3.Connection):
+    query_stats: QueryStats
+
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    # sqlite3.Connection.execute does not go through cursor(); route it there.
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
 
 def get_connection() -> sqlite3.Connection:
-    connection = sqlite3.connect(DB_PATH)
+    stats = _current_stats.get()
+    if stats is None:
+        connection = sqlite3.connect(DB_PATH)
+    else:
+        connection = sqlite3.connect(DB_PATH, factory=_TimedConnection)
+        connection.query_stats = stats
+        connection.set_trace_callback(stats._on_statement)
     connection.row_factory = sqlite3.Row
     connection.execute("PRAGMA foreign_keys = ON;")
     return connection
@@ -23,4 +166,3 @@ def transaction() -> Iterator[sqlite3.Connection]:
         raise
     finally:
         connection.close()
-
@@ -1,5 +1,6 @@
 import json
 
+from backend.roadmap_engine.storage import versions_repo
 from backend.roadmap_engine.storage.database import get_connection, transaction
 from backend.roadmap_engine.utils import utc_now_iso
 
@@ -62,6 +63,7 @@ def create_active_goal(
                 now,
             ),
         )
+        versions_repo.bump_student(connection, student_id)
         return int(cursor.lastrowid)
 
 
@@ -133,6 +135,7 @@ def replace_goal_skills(goal_id: int, skills: list[dict]) -> None:
                     now,
                 ),
             )
+        versions_repo.bump_goal_student(connection, goal_id)
 
 
 def list_goal_skills(goal_id: int) -> list[dict]:
@@ -173,6 +176,7 @@ def set_goal_skill_status(goal_skill_id: int, status: str, completed_at: str | N
             """,
             (status, completed_at, goal_skill_id),
         )
+        versions_repo.bump_goal_skill_student(connection, goal_skill_id)
 
 
 def get_goal_skill(goal_skill_id: int) -> dict | None:
@@ -0,0 +1,173 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from backend.roadmap_engine.storage import versions_repo
+from backend.roadmap_engine.storage.database import get_connection, transaction
+from backend.roadmap_engine.utils import utc_now_iso
+
+
+def _lease_until(lease_seconds: float) -> str:
+    return (datetime.now(tz=timezone.utc) + timedelta(seconds=lease_seconds)).isoformat()
+
+
+def _job_dict(row) -> dict:
+    result = dict(row)
+    result["payload"] = json.loads(result["payload_json"]) if result["payload_json"] else {}
+    return result
+
+
+def enqueue_job(job_type: str, job_key: str, payload: dict) -> dict:
+    """Queues a job unless one with the same key is already queued or running; returns that job."""
+
+    now = utc_now_iso()
+    with transaction() as connection:
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            INSERT OR IGNORE INTO background_jobs (
+                job_type,
+                job_key,
+                payload_json,
+                status,
+                created_at
+            )
+            VALUES (?, ?, ?, 'queued', ?)
+            """,
+            (job_type, job_key, json.dumps(payload, ensure_ascii=False), now),
+        )
+        row = cursor.execute(
+            """
+            SELECT *
+            FROM background_jobs
+            WHERE job_key = ? AND status IN ('queued', 'running')
+            ORDER BY id DESC
+            LIMIT 1
+            """,
+            (job_key,),
+        ).fetchone()
+    return _job_dict(row)
+
+
+def claim_next_job(owner_id: str, lease_seconds: float) -> dict | None:
+    """Marks the oldest queued job running under `owner_id`, leased for `lease_seconds`."""
+
+    now = utc_now_iso()
+    with transaction() as connection:
+        cursor = connection.cursor()
+        while True:
+            row = cursor.execute(
+                """
+                SELECT id
+                FROM background_jobs
+                WHERE status = 'queued'
+                ORDER BY id ASC
+                LIMIT 1
+                """
+            ).fetchone()
+            if row is None:
+                return None
+
+            # Another worker may have taken it between the two statements.
+            cursor.execute(
+                """
+                UPDATE background_jobs
+                SET status = 'running', attempts = attempts + 1, started_at = ?,
+                    owner_id = ?, lease_expires_at = ?
+                WHERE id = ? AND status = 'queued'
+                """,
+                (now, owner_id, _lease_until(lease_seconds), row["id"]),
+            )
+            if cursor.rowcount == 1:
+                claimed = cursor.execute(
+                    "SELECT * FROM background_jobs WHERE id = ?",
+                    (row["id"],),
+                ).fetchone()
+                return _job_dict(claimed)
+
+
+def renew_lease(job_id: int, owner_id: str, lease_seconds: float) -> bool:
+    """Extends the lease of a job this owner still runs; False if it lost the job."""
+
+    with transaction() as connection:
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            UPDATE background_jobs
+            SET lease_expires_at = ?
+            WHERE id = ? AND owner_id = ? AND status = 'running'
+            """,
+            (_lease_until(lease_seconds), job_id, owner_id),
+        )
+        return cursor.rowcount == 1
+
+
+def finish_job(job_id: int, owner_id: str, error_text: str | None = None) -> None:
+    """Records the outcome, unless the lease expired and the job was requeued meanwhile."""
+
+    with transaction() as connection:
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            UPDATE background_jobs
+            SET status = ?, error_text = ?, finished_at = ?, lease_expires_at = NULL
+            WHERE id = ? AND owner_id = ? AND status = 'running'
+            """,
+            ("failed" if error_text else "done", error_text, utc_now_iso(), job_id, owner_id),
+        )
+        if cursor.rowcount != 1:
+            return
+        # The dashboard shows the state of jobs run for a goal (e.g. playlists).
+        row = connection.execute("SELECT payload_json FROM background_jobs WHERE id = ?", (job_id,)).fetchone()
+        payload = json.loads(row["payload_json"]) if row and row["payload_json"] else {}
+        if payload.get("goal_id"):
+            versions_repo.bump_goal_student(connection, int(payload["goal_id"]))
+
+
+def get_latest_job(job_key: str) -> dict | None:
+    connection = get_connection()
+    try:
+        row = connection.execute(
+            """
+            SELECT *
+            FROM background_jobs
+            WHERE job_key = ?
+            ORDER BY id DESC
+            LIMIT 1
+            """,
+            (job_key,),
+        ).fetchone()
+    finally:
+        connection.close()
+    return _job_dict(row) if row else None
+
+
+def requeue_expired_jobs() -> int:
+    """
+    Running jobs whose lease ran out (their worker stopped or crashed) go
+    back to the queue. Jobs of live workers keep being renewed and stay put.
+    """
+
+    with transaction() as connection:
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            UPDATE background_jobs
+            SET status = 'queued', started_at = NULL, owner_id = NULL, lease_expires_at = NULL
+            WHERE status = 'running' AND (lease_expires_at IS NULL OR lease_expires_at < ?)
+            """,
+            (utc_now_iso(),),
+        )
+        return cursor.rowcount
+
+
+def delete_finished_jobs(before_iso: str) -> int:
+    with transaction() as connection:
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            DELETE FROM background_jobs
+            WHERE status IN ('done', 'failed') AND finished_at < ?
+            """,
+            (before_iso,),
+        )
+        return cursor.rowcount
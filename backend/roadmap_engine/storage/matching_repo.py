@@ -1,5 +1,6 @@
 import json
 
+from backend.roadmap_engine.storage import versions_repo
 from backend.roadmap_engine.storage.database import get_connection, transaction
 from backend.roadmap_engine.utils import utc_now_iso
 
@@ -25,7 +26,13 @@ def load_existing_matches(goal_id: int) -> dict[int, dict]:
     return {row["opportunity_id"]: dict(row) for row in rows}
 
 
-def replace_goal_matches(goal_id: int, matches: list[dict]) -> None:
+def replace_goal_matches(goal_id: int, matches: list[dict], notifications: list[dict] | None = None) -> None:
+    """
+    Rewrites the goal's match cache and writes the refresh's notifications
+    in the same transaction. The cache follows from data that bumps the
+    student version itself, so only new notifications bump it here.
+    """
+
     now = utc_now_iso()
     with transaction() as connection:
         cursor = connection.cursor()
@@ -62,6 +69,8 @@ def replace_goal_matches(goal_id: int, matches: list[dict]) -> None:
                 for match in matches
             ],
         )
+        if insert_notifications(connection, notifications or []):
+            versions_repo.bump_goal_student(connection, goal_id)
 
 
 def list_matches_with_opportunities(goal_id: int) -> list[dict]:
@@ -111,6 +120,48 @@ def list_matches_with_opportunities(goal_id: int) -> list[dict]:
     return result
 
 
+def insert_notifications(connection, notifications: list[dict]) -> int:
+    """
+    Adds notifications inside the caller's transaction. Items with a
+    dedup_key that is already stored are skipped. Returns how many were added.
+    """
+
+    if not notifications:
+        return 0
+
+    now = utc_now_iso()
+    cursor = connection.executemany(
+        """
+        INSERT INTO user_notifications (
+            student_id,
+            goal_id,
+            notification_type,
+            title,
+            body,
+            related_opportunity_id,
+            dedup_key,
+            created_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(dedup_key) WHERE dedup_key IS NOT NULL DO NOTHING
+        """,
+        [
+            (
+                item["student_id"],
+                item.get("goal_id"),
+                item["notification_type"],
+                item["title"],
+                item["body"],
+                item.get("related_opportunity_id"),
+                item.get("dedup_key"),
+                now,
+            )
+            for item in notifications
+        ],
+    )
+    return cursor.rowcount
+
+
 def create_notification(
     *,
     student_id: int,
@@ -120,31 +171,21 @@ def create_notification(
     body: str,
     related_opportunity_id: int | None = None,
 ) -> None:
-    now = utc_now_iso()
     with transaction() as connection:
-        connection.execute(
-            """
-            INSERT INTO user_notifications (
-                student_id,
-                goal_id,
-                notification_type,
-                title,
-                body,
-                related_opportunity_id,
-                created_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                student_id,
-                goal_id,
-                notification_type,
-                title,
-                body,
-                related_opportunity_id,
-                now,
-            ),
+        insert_notifications(
+            connection,
+            [
+                {
+                    "student_id": student_id,
+                    "goal_id": goal_id,
+                    "notification_type": notification_type,
+                    "title": title,
+                    "body": body,
+                    "related_opportunity_id": related_opportunity_id,
+                }
+            ],
         )
+        versions_repo.bump_student(connection, student_id)
 
 
 def list_notifications(student_id: int, limit: int = 30) -> list[dict]:
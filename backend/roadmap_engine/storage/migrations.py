@@ -0,0 +1,119 @@
+"""
+Schema migrations, tracked in the schema_version table.
+
+apply_pending_migrations() runs at startup in every portal worker and
+script. When the database is current it costs one read and takes no write
+lock; otherwise the first process to get the lock file applies the pending
+migrations in one transaction, and the others find nothing left to do.
+
+To change the schema, append (version, description, function) to
+MIGRATIONS; the function gets a cursor inside the migration transaction.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+from backend.roadmap_engine.storage import database
+from backend.roadmap_engine.storage.schema import add_background_job_leases, create_baseline_schema
+from backend.roadmap_engine.utils import utc_now_iso
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+MIGRATIONS = [
+    (1, "Baseline roadmap schema: tables, indexes and legacy upgrades", create_baseline_schema),
+    (2, "Owner and lease expiry of running background jobs", add_background_job_leases),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TEXT NOT NULL
+    );
+"""
+
+# Databases this process has already seen at LATEST_VERSION.
+_current_paths: set[str] = set()
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Exclusive lock on `path` across processes; blocks until it is free."""
+
+    with open(path, "a+b") as handle:
+        if os.name == "nt":
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after about 10 seconds; keep waiting.
+                    continue
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def current_version() -> int:
+    connection = database.get_connection()
+    try:
+        tracked = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+        ).fetchone()
+        if tracked is None:
+            return 0
+        return connection.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def apply_pending_migrations() -> list[int]:
+    """Brings the database up to LATEST_VERSION; returns the versions applied by this call."""
+
+    path = str(database.DB_PATH)
+    if path in _current_paths:
+        return []
+    if current_version() >= LATEST_VERSION:
+        _current_paths.add(path)
+        return []
+
+    applied = []
+    with _file_lock(f"{path}.migrate.lock"):
+        with database.transaction() as connection:
+            # Write lock up front, so processes without the lock file (the
+            # crawler) wait instead of interleaving with the migration.
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(SCHEMA_VERSION_TABLE)
+            # Re-read under the lock: another worker may have just finished.
+            version = connection.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+            cursor = connection.cursor()
+            for number, description, migrate in MIGRATIONS:
+                if number <= version:
+                    continue
+                migrate(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                    (number, description, utc_now_iso()),
+                )
+                applied.append(number)
+
+    _current_paths.add(path)
+    if applied:
+        print(f"Applied schema migration(s) {', '.join(map(str, applied))} to {path}.")
+    return applied
@@ -1,5 +1,6 @@
 import json
 
+from backend.roadmap_engine.storage import versions_repo
 from backend.roadmap_engine.storage.database import get_connection, transaction
 from backend.roadmap_engine.utils import utc_now_iso
 
@@ -45,6 +46,7 @@ def replace_skill_recommendations(goal_id: int, goal_skill_id: int, recommendati
                 for item in recommendations
             ],
         )
+        versions_repo.bump_goal_student(connection, goal_id)
 
 
 def list_skill_recommendations(goal_id: int, goal_skill_id: int) -> list[dict]:
@@ -118,6 +120,7 @@ def select_recommendation(goal_id: int, goal_skill_id: int, recommendation_id: i
             """,
             (goal_id, goal_skill_id, recommendation_id, now),
         )
+        versions_repo.bump_goal_student(connection, goal_id)
 
 
 def get_selected_recommendation(goal_id: int, goal_skill_id: int) -> dict | None:
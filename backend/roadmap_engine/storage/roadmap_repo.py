@@ -1,3 +1,4 @@
+from backend.roadmap_engine.storage import matching_repo, versions_repo
 from backend.roadmap_engine.storage.database import get_connection, transaction
 from backend.roadmap_engine.utils import utc_now_iso
 
@@ -24,93 +25,154 @@ def create_or_replace_plan(goal_id: int, start_date: str, end_date: str) -> int:
             """,
             (goal_id, start_date, end_date, now, now),
         )
+        versions_repo.bump_goal_student(connection, goal_id)
         return int(cursor.lastrowid)
 
 
-def mark_plan_replanned(plan_id: int) -> None:
+_SEGMENT_COLUMNS = """
+    s.id,
+    s.plan_id,
+    s.goal_skill_id,
+    s.kind,
+    s.start_date,
+    s.day_count,
+    s.minutes_per_day,
+    s.last_day_minutes,
+    s.completed_days,
+    s.title,
+    s.description,
+    s.completed_at,
+    s.created_at,
+    s.updated_at
+"""
+
+# Days of a segment dated before the given day (bound twice) that are past the completed cursor.
+_OVERDUE_DAYS_SQL = """
+    MAX(
+        MIN(s.day_count, CAST(julianday(?) - julianday(s.start_date) AS INTEGER)) - s.completed_days,
+        0
+    )
+"""
+
+
+_INSERT_SEGMENT_SQL = """
+    INSERT INTO roadmap_plan_segments (
+        plan_id,
+        goal_skill_id,
+        kind,
+        start_date,
+        day_count,
+        minutes_per_day,
+        last_day_minutes,
+        completed_days,
+        title,
+        description,
+        completed_at,
+        created_at,
+        updated_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _segment_params(plan_id: int, segment: dict, now: str) -> tuple:
+    return (
+        plan_id,
+        segment["goal_skill_id"],
+        segment.get("kind", "learn"),
+        segment["start_date"],
+        segment["day_count"],
+        segment["minutes_per_day"],
+        segment.get("last_day_minutes", segment["minutes_per_day"]),
+        segment.get("completed_days", 0),
+        segment.get("title"),
+        segment.get("description"),
+        segment.get("completed_at"),
+        now,
+        now,
+    )
+
+
+def apply_replans(replans: list[dict]) -> None:
+    """
+    Applies a batch of replans in one transaction. Each item has plan_id,
+    segment_updates [(segment_id, start_date, day_count, minutes_per_day,
+    last_day_minutes)], new_segments (the unfinished part of a partly
+    completed segment), overdue_count, updated_count and notification.
+    """
+
+    if not replans:
+        return
+
     now = utc_now_iso()
     with transaction() as connection:
-        connection.execute(
+        connection.executemany(
+            """
+            UPDATE roadmap_plan_segments
+            SET start_date = ?,
+                day_count = ?,
+                minutes_per_day = ?,
+                last_day_minutes = ?,
+                updated_at = ?
+            WHERE id = ?
+            """,
+            [
+                (start_date, day_count, minutes_per_day, last_day_minutes, now, segment_id)
+                for item in replans
+                for segment_id, start_date, day_count, minutes_per_day, last_day_minutes in item["segment_updates"]
+            ],
+        )
+        connection.executemany(
+            _INSERT_SEGMENT_SQL,
+            [
+                _segment_params(item["plan_id"], segment, now)
+                for item in replans
+                for segment in item.get("new_segments", [])
+            ],
+        )
+        connection.executemany(
             """
             UPDATE roadmap_plans
-            SET last_replanned_at = ?, updated_at = ?
+            SET last_replanned_at = ?,
+                last_replan_overdue_count = ?,
+                last_replan_updated_count = ?,
+                updated_at = ?
             WHERE id = ?
             """,
-            (now, now, plan_id),
+            [
+                (now, item["overdue_count"], item["updated_count"], now, item["plan_id"])
+                for item in replans
+            ],
+        )
+        matching_repo.insert_notifications(
+            connection,
+            [item["notification"] for item in replans if item.get("notification")],
         )
+        versions_repo.bump_plan_students(connection, [item["plan_id"] for item in replans])
 
 
-def bulk_insert_tasks(plan_id: int, tasks: list[dict]) -> None:
+def replace_plan_segments(plan_id: int, segments: list[dict]) -> None:
     now = utc_now_iso()
     with transaction() as connection:
-        cursor = connection.cursor()
-        cursor.execute("DELETE FROM roadmap_plan_tasks WHERE plan_id = ?", (plan_id,))
-        cursor.executemany(
-            """
-            INSERT INTO roadmap_plan_tasks (
-                plan_id,
-                goal_skill_id,
-                task_date,
-                title,
-                description,
-                target_minutes,
-                is_completed,
-                created_at,
-                updated_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)
-            """,
-            [
-                (
-                    plan_id,
-                    task["goal_skill_id"],
-                    task["task_date"],
-                    task["title"],
-                    task.get("description", ""),
-                    task["target_minutes"],
-                    now,
-                    now,
-                )
-                for task in tasks
-            ],
+        connection.execute("DELETE FROM roadmap_plan_segments WHERE plan_id = ?", (plan_id,))
+        connection.executemany(
+            _INSERT_SEGMENT_SQL,
+            [_segment_params(plan_id, segment, now) for segment in segments],
         )
+        versions_repo.bump_plan_students(connection, [plan_id])
 
 
-def append_tasks(plan_id: int, tasks: list[dict]) -> None:
-    if not tasks:
+def append_segments(plan_id: int, segments: list[dict]) -> None:
+    if not segments:
         return
 
     now = utc_now_iso()
     with transaction() as connection:
         connection.executemany(
-            """
-            INSERT INTO roadmap_plan_tasks (
-                plan_id,
-                goal_skill_id,
-                task_date,
-                title,
-                description,
-                target_minutes,
-                is_completed,
-                created_at,
-                updated_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)
-            """,
-            [
-                (
-                    plan_id,
-                    task["goal_skill_id"],
-                    task["task_date"],
-                    task["title"],
-                    task.get("description", ""),
-                    task["target_minutes"],
-                    now,
-                    now,
-                )
-                for task in tasks
-            ],
+            _INSERT_SEGMENT_SQL,
+            [_segment_params(plan_id, segment, now) for segment in segments],
         )
+        versions_repo.bump_plan_students(connection, [plan_id])
 
 
 def get_active_plan(goal_id: int) -> dict | None:
@@ -118,7 +180,17 @@ def get_active_plan(goal_id: int) -> dict | None:
     try:
         row = connection.execute(
             """
-            SELECT id, goal_id, start_date, end_date, status, last_replanned_at, created_at, updated_at
+            SELECT
+                id,
+                goal_id,
+                start_date,
+                end_date,
+                status,
+                last_replanned_at,
+                last_replan_overdue_count,
+                last_replan_updated_count,
+                created_at,
+                updated_at
             FROM roadmap_plans
             WHERE goal_id = ? AND status = 'active'
             ORDER BY id DESC
@@ -132,69 +204,28 @@ def get_active_plan(goal_id: int) -> dict | None:
     return dict(row) if row else None
 
 
-def list_tasks(plan_id: int, date_from: str | None = None, date_to: str | None = None) -> list[dict]:
-    where = ["plan_id = ?"]
+def list_segments(plan_id: int, goal_skill_id: int | None = None) -> list[dict]:
+    where = ["s.plan_id = ?"]
     params: list = [plan_id]
-
-    if date_from:
-        where.append("task_date >= ?")
-        params.append(date_from)
-    if date_to:
-        where.append("task_date <= ?")
-        params.append(date_to)
+    if goal_skill_id is not None:
+        where.append("s.goal_skill_id = ?")
+        params.append(goal_skill_id)
 
     where_sql = " AND ".join(where)
-    query = f"""
-        SELECT
-            t.id,
-            t.plan_id,
-            t.goal_skill_id,
-            t.task_date,
-            t.title,
-            t.description,
-            t.target_minutes,
-            t.is_completed,
-            t.completed_at,
-            t.created_at,
-            s.skill_name,
-            s.normalized_skill
-        FROM roadmap_plan_tasks t
-        LEFT JOIN career_goal_skills s ON s.id = t.goal_skill_id
-        WHERE {where_sql}
-        ORDER BY t.task_date ASC, t.id ASC
-    """
-
-    connection = get_connection()
-    try:
-        rows = connection.execute(query, params).fetchall()
-    finally:
-        connection.close()
-
-    return [dict(row) for row in rows]
-
-
-def list_incomplete_tasks(plan_id: int) -> list[dict]:
     connection = get_connection()
     try:
         rows = connection.execute(
-            """
+            f"""
             SELECT
-                id,
-                plan_id,
-                goal_skill_id,
-                task_date,
-                title,
-                description,
-                target_minutes,
-                is_completed,
-                completed_at,
-                created_at,
-                updated_at
-            FROM roadmap_plan_tasks
-            WHERE plan_id = ? AND is_completed = 0
-            ORDER BY task_date ASC, id ASC
+                {_SEGMENT_COLUMNS},
+                g.skill_name,
+                g.normalized_skill
+            FROM roadmap_plan_segments s
+            LEFT JOIN career_goal_skills g ON g.id = s.goal_skill_id
+            WHERE {where_sql}
+            ORDER BY s.start_date ASC, s.id ASC
             """,
-            (plan_id,),
+            params,
         ).fetchall()
     finally:
         connection.close()
@@ -202,44 +233,16 @@ def list_incomplete_tasks(plan_id: int) -> list[dict]:
     return [dict(row) for row in rows]
 
 
-def count_overdue_incomplete(plan_id: int, today_iso: str) -> int:
+def get_segment(segment_id: int) -> dict | None:
     connection = get_connection()
     try:
         row = connection.execute(
-            """
-            SELECT COUNT(*) AS total
-            FROM roadmap_plan_tasks
-            WHERE plan_id = ? AND is_completed = 0 AND task_date < ?
+            f"""
+            SELECT {_SEGMENT_COLUMNS}
+            FROM roadmap_plan_segments s
+            WHERE s.id = ?
             """,
-            (plan_id, today_iso),
-        ).fetchone()
-    finally:
-        connection.close()
-
-    return int(row["total"]) if row else 0
-
-
-def get_task(task_id: int) -> dict | None:
-    connection = get_connection()
-    try:
-        row = connection.execute(
-            """
-            SELECT
-                id,
-                plan_id,
-                goal_skill_id,
-                task_date,
-                title,
-                description,
-                target_minutes,
-                is_completed,
-                completed_at,
-                created_at,
-                updated_at
-            FROM roadmap_plan_tasks
-            WHERE id = ?
-            """,
-            (task_id,),
+            (segment_id,),
         ).fetchone()
     finally:
         connection.close()
@@ -247,47 +250,44 @@ def get_task(task_id: int) -> dict | None:
     return dict(row) if row else None
 
 
-def bulk_update_task_dates(date_updates: list[tuple[int, str]]) -> None:
-    if not date_updates:
-        return
-
-    now = utc_now_iso()
-    with transaction() as connection:
-        connection.executemany(
-            """
-            UPDATE roadmap_plan_tasks
-            SET task_date = ?, updated_at = ?
-            WHERE id = ?
-            """,
-            [(new_date, now, task_id) for task_id, new_date in date_updates],
-        )
-
-
-def set_task_completed(task_id: int, is_completed: bool) -> None:
+def set_segment_completed_days(segment_id: int, completed_days: int) -> None:
     now = utc_now_iso()
-    completed_at = now if is_completed else None
     with transaction() as connection:
         connection.execute(
             """
-            UPDATE roadmap_plan_tasks
-            SET is_completed = ?, completed_at = ?, updated_at = ?
+            UPDATE roadmap_plan_segments
+            SET completed_days = ?,
+                completed_at = CASE WHEN ? > 0 THEN ? ELSE NULL END,
+                updated_at = ?
             WHERE id = ?
             """,
-            (1 if is_completed else 0, completed_at, now, task_id),
+            (completed_days, completed_days, now, now, segment_id),
         )
+        versions_repo.bump_segment_student(connection, segment_id)
 
 
-def list_tasks_for_skill(plan_id: int, goal_skill_id: int) -> list[dict]:
+def list_behind_schedule_plans(today_iso: str) -> list[dict]:
+    """Active plans with unfinished days dated before today, in one pass over the segments."""
+
     connection = get_connection()
     try:
         rows = connection.execute(
-            """
-            SELECT id, task_date, title, description, is_completed, target_minutes
-            FROM roadmap_plan_tasks
-            WHERE plan_id = ? AND goal_skill_id = ?
-            ORDER BY task_date ASC, id ASC
+            f"""
+            SELECT
+                p.id AS plan_id,
+                p.goal_id,
+                g.student_id,
+                g.target_end_date,
+                SUM({_OVERDUE_DAYS_SQL}) AS overdue_count
+            FROM roadmap_plan_segments s
+            JOIN roadmap_plans p ON p.id = s.plan_id AND p.status = 'active'
+            JOIN career_goals g ON g.id = p.goal_id AND g.status = 'active'
+            WHERE s.completed_days < s.day_count AND s.start_date < ?
+            GROUP BY p.id
+            HAVING overdue_count > 0
+            ORDER BY p.id ASC
             """,
-            (plan_id, goal_skill_id),
+            (today_iso, today_iso),
         ).fetchall()
     finally:
         connection.close()
@@ -295,17 +295,43 @@ def list_tasks_for_skill(plan_id: int, goal_skill_id: int) -> list[dict]:
     return [dict(row) for row in rows]
 
 
-def bulk_update_task_content(content_updates: list[tuple[int, str, str]]) -> None:
-    if not content_updates:
-        return
+def list_open_segments_by_plan(plan_ids: list[int]) -> dict[int, list[dict]]:
+    if not plan_ids:
+        return {}
 
-    now = utc_now_iso()
-    with transaction() as connection:
-        connection.executemany(
-            """
-            UPDATE roadmap_plan_tasks
-            SET title = ?, description = ?, updated_at = ?
-            WHERE id = ?
+    placeholders = ",".join("?" for _ in plan_ids)
+    connection = get_connection()
+    try:
+        rows = connection.execute(
+            f"""
+            SELECT {_SEGMENT_COLUMNS}
+            FROM roadmap_plan_segments s
+            WHERE s.plan_id IN ({placeholders}) AND s.completed_days < s.day_count
+            ORDER BY s.plan_id ASC, s.start_date ASC, s.id ASC
             """,
-            [(title, description, now, task_id) for task_id, title, description in content_updates],
-        )
+            plan_ids,
+        ).fetchall()
+    finally:
+        connection.close()
+
+    grouped: dict[int, list[dict]] = {plan_id: [] for plan_id in plan_ids}
+    for row in rows:
+        grouped[row["plan_id"]].append(dict(row))
+    return grouped
+
+
+def count_overdue_days(plan_id: int, today_iso: str) -> int:
+    connection = get_connection()
+    try:
+        row = connection.execute(
+            f"""
+            SELECT COALESCE(SUM({_OVERDUE_DAYS_SQL}), 0) AS total
+            FROM roadmap_plan_segments s
+            WHERE s.plan_id = ? AND s.completed_days < s.day_count AND s.start_date < ?
+            """,
+            (today_iso, plan_id, today_iso),
+        ).fetchone()
+    finally:
+        connection.close()
+
+    return int(row["total"]) if row else 0
@@ -1,4 +1,4 @@
-from backend.roadmap_engine.storage.database import transaction
+from datetime import date, timedelta
 
 
 BASE_TABLE_STATEMENTS = [
@@ -69,21 +69,33 @@ BASE_TABLE_STATEMENTS = [
         end_date TEXT NOT NULL,
         status TEXT NOT NULL,
         last_replanned_at TEXT,
+        last_replan_overdue_count INTEGER NOT NULL DEFAULT 0,
+        last_replan_updated_count INTEGER NOT NULL DEFAULT 0,
         created_at TEXT NOT NULL,
         updated_at TEXT NOT NULL,
         FOREIGN KEY(goal_id) REFERENCES career_goals(id) ON DELETE CASCADE
     );
     """,
     """
-    CREATE TABLE IF NOT EXISTS roadmap_plan_tasks (
+    CREATE TABLE IF NOT EXISTS student_data_versions (
+        student_id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT NOT NULL
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS roadmap_plan_segments (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         plan_id INTEGER NOT NULL,
         goal_skill_id INTEGER,
-        task_date TEXT NOT NULL,
-        title TEXT NOT NULL,
+        kind TEXT NOT NULL DEFAULT 'learn',
+        start_date TEXT NOT NULL,
+        day_count INTEGER NOT NULL,
+        minutes_per_day INTEGER NOT NULL,
+        last_day_minutes INTEGER NOT NULL,
+        completed_days INTEGER NOT NULL DEFAULT 0,
+        title TEXT,
         description TEXT,
-        target_minutes INTEGER NOT NULL,
-        is_completed INTEGER NOT NULL DEFAULT 0,
         completed_at TEXT,
         created_at TEXT NOT NULL,
         updated_at TEXT NOT NULL,
@@ -136,6 +148,7 @@ BASE_TABLE_STATEMENTS = [
         title TEXT NOT NULL,
         body TEXT NOT NULL,
         related_opportunity_id INTEGER,
+        dedup_key TEXT,
         is_read INTEGER NOT NULL DEFAULT 0,
         created_at TEXT NOT NULL,
         FOREIGN KEY(student_id) REFERENCES students(id) ON DELETE CASCADE,
@@ -224,6 +237,30 @@ BASE_TABLE_STATEMENTS = [
     );
     """,
     """
+    CREATE TABLE IF NOT EXISTS assessment_question_bank (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        playlist_recommendation_id INTEGER NOT NULL,
+        normalized_skill TEXT NOT NULL,
+        question_hash TEXT NOT NULL,
+        question_json TEXT NOT NULL,
+        answer_index INTEGER NOT NULL,
+        difficulty TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        UNIQUE(playlist_recommendation_id, normalized_skill, question_hash),
+        FOREIGN KEY(playlist_recommendation_id) REFERENCES playlist_recommendations(id) ON DELETE CASCADE
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS assessment_bank_draws (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        assessment_id INTEGER NOT NULL,
+        bank_question_id INTEGER NOT NULL,
+        UNIQUE(assessment_id, bank_question_id),
+        FOREIGN KEY(assessment_id) REFERENCES skill_assessments(id) ON DELETE CASCADE,
+        FOREIGN KEY(bank_question_id) REFERENCES assessment_question_bank(id) ON DELETE CASCADE
+    );
+    """,
+    """
     CREATE TABLE IF NOT EXISTS skill_playlist_chat_sessions (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         student_id INTEGER NOT NULL,
@@ -249,6 +286,20 @@ BASE_TABLE_STATEMENTS = [
         FOREIGN KEY(session_id) REFERENCES skill_playlist_chat_sessions(id) ON DELETE CASCADE
     );
     """,
+    """
+    CREATE TABLE IF NOT EXISTS background_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_type TEXT NOT NULL,
+        job_key TEXT NOT NULL,
+        payload_json TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        error_text TEXT,
+        created_at TEXT NOT NULL,
+        started_at TEXT,
+        finished_at TEXT
+    );
+    """,
 ]
 
 LEGACY_TABLES_TO_DROP = [
@@ -267,8 +318,13 @@ INDEX_STATEMENTS = [
     "CREATE INDEX IF NOT EXISTS idx_student_skills_student ON student_skills(student_id);",
     "CREATE INDEX IF NOT EXISTS idx_career_goals_student_status ON career_goals(student_id, status);",
     "CREATE INDEX IF NOT EXISTS idx_goal_skills_goal_status ON career_goal_skills(goal_id, status);",
-    "CREATE INDEX IF NOT EXISTS idx_plan_tasks_plan_date ON roadmap_plan_tasks(plan_id, task_date);",
+    "CREATE INDEX IF NOT EXISTS idx_plan_segments_plan_skill ON roadmap_plan_segments(plan_id, goal_skill_id);",
     "CREATE INDEX IF NOT EXISTS idx_notifications_student_read ON user_notifications(student_id, is_read);",
+    # A notification with a dedup key is written at most once per key.
+    (
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_notifications_dedup_key "
+        "ON user_notifications(dedup_key) WHERE dedup_key IS NOT NULL;"
+    ),
     "CREATE INDEX IF NOT EXISTS idx_opportunity_match_goal_bucket ON opportunity_match_cache(goal_id, bucket);",
     "CREATE INDEX IF NOT EXISTS idx_company_jobs_company_status ON company_job_posts(company_id, status);",
     "CREATE INDEX IF NOT EXISTS idx_company_applications_job_status ON company_job_applications(job_id, status);",
@@ -277,6 +333,14 @@ INDEX_STATEMENTS = [
     "CREATE INDEX IF NOT EXISTS idx_selected_playlist_skill ON goal_skill_selected_playlists(goal_skill_id);",
     "CREATE INDEX IF NOT EXISTS idx_chat_sessions_student_skill ON skill_playlist_chat_sessions(student_id, goal_skill_id);",
     "CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON skill_playlist_chat_messages(session_id, id);",
+    "CREATE INDEX IF NOT EXISTS idx_bank_draws_question ON assessment_bank_draws(bank_question_id);",
+    "CREATE INDEX IF NOT EXISTS idx_background_jobs_status ON background_jobs(status, id);",
+    "CREATE INDEX IF NOT EXISTS idx_background_jobs_key ON background_jobs(job_key, id);",
+    # At most one queued/running job per key.
+    (
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_background_jobs_active_key "
+        "ON background_jobs(job_key) WHERE status IN ('queued', 'running');"
+    ),
 ]
 
 
@@ -285,6 +349,116 @@ def _table_columns(cursor, table_name: str) -> set[str]:
     return {row[1] for row in rows}
 
 
+def _fold_task_row(segments: list[dict], row) -> None:
+    task_date = date.fromisoformat(row["task_date"])
+    is_completed = int(row["is_completed"]) == 1
+    revision = str(row["title"]).startswith("Revision:")
+    current = segments[-1] if segments else None
+    if (
+        current is not None
+        and current["kind"] == "learn"
+        and not revision
+        and current["plan_id"] == row["plan_id"]
+        and current["goal_skill_id"] == row["goal_skill_id"]
+        and current["last_date"] + timedelta(days=1) == task_date
+        and current["last_day_minutes"] == current["minutes_per_day"]
+        and (not is_completed or current["completed_days"] == current["day_count"])
+    ):
+        current["day_count"] += 1
+        current["last_day_minutes"] = int(row["target_minutes"])
+        current["completed_days"] += 1 if is_completed else 0
+        current["completed_at"] = row["completed_at"] or current["completed_at"]
+        current["last_date"] = task_date
+        return
+
+    segments.append(
+        {
+            "plan_id": row["plan_id"],
+            "goal_skill_id": row["goal_skill_id"],
+            "kind": "revision" if revision else "learn",
+            "start_date": row["task_date"],
+            "day_count": 1,
+            "minutes_per_day": int(row["target_minutes"]),
+            "last_day_minutes": int(row["target_minutes"]),
+            "completed_days": 1 if is_completed else 0,
+            # Learn titles are derived when the days are expanded.
+            "title": row["title"] if revision else None,
+            "description": row["description"] if revision else None,
+            "completed_at": row["completed_at"],
+            "created_at": row["created_at"],
+            "last_date": task_date,
+        }
+    )
+
+
+def _migrate_plan_tasks_to_segments(cursor) -> None:
+    """Folds each skill's consecutive daily task rows into segments, then drops the old table."""
+
+    if not _table_columns(cursor, "roadmap_plan_tasks"):
+        return
+
+    rows = cursor.execute(
+        """
+        SELECT
+            plan_id,
+            goal_skill_id,
+            task_date,
+            title,
+            description,
+            target_minutes,
+            is_completed,
+            completed_at,
+            created_at
+        FROM roadmap_plan_tasks
+        ORDER BY plan_id ASC, goal_skill_id ASC, task_date ASC, id ASC
+        """
+    ).fetchall()
+
+    segments: list[dict] = []
+    for row in rows:
+        _fold_task_row(segments, row)
+
+    cursor.executemany(
+        """
+        INSERT INTO roadmap_plan_segments (
+            plan_id,
+            goal_skill_id,
+            kind,
+            start_date,
+            day_count,
+            minutes_per_day,
+            last_day_minutes,
+            completed_days,
+            title,
+            description,
+            completed_at,
+            created_at,
+            updated_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                item["plan_id"],
+                item["goal_skill_id"],
+                item["kind"],
+                item["start_date"],
+                item["day_count"],
+                item["minutes_per_day"],
+                item["last_day_minutes"],
+                item["completed_days"],
+                item["title"],
+                item["description"],
+                item["completed_at"],
+                item["created_at"],
+                item["created_at"],
+            )
+            for item in segments
+        ],
+    )
+    cursor.execute("DROP TABLE roadmap_plan_tasks")
+
+
 def _ensure_legacy_compatibility(cursor) -> None:
     # Cleanup from any interrupted migration runs.
     cursor.execute("DROP TABLE IF EXISTS roadmap_plan_tasks_legacy")
@@ -304,60 +478,23 @@ def _ensure_legacy_compatibility(cursor) -> None:
             "ALTER TABLE students ADD COLUMN has_active_backlog INTEGER NOT NULL DEFAULT 0"
         )
 
-    # Old roadmap tasks table may contain minutes_spent. Rebuild without that column.
-    task_columns = _table_columns(cursor, "roadmap_plan_tasks")
-    if "minutes_spent" in task_columns:
-        cursor.execute("ALTER TABLE roadmap_plan_tasks RENAME TO roadmap_plan_tasks_legacy")
+    # Replan counts are stored on the plan since replanning moved to the daily job.
+    plan_columns = _table_columns(cursor, "roadmap_plans")
+    if "last_replan_overdue_count" not in plan_columns:
         cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS roadmap_plan_tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                plan_id INTEGER NOT NULL,
-                goal_skill_id INTEGER,
-                task_date TEXT NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
-                target_minutes INTEGER NOT NULL,
-                is_completed INTEGER NOT NULL DEFAULT 0,
-                completed_at TEXT,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL,
-                FOREIGN KEY(plan_id) REFERENCES roadmap_plans(id) ON DELETE CASCADE,
-                FOREIGN KEY(goal_skill_id) REFERENCES career_goal_skills(id) ON DELETE SET NULL
-            );
-            """
+            "ALTER TABLE roadmap_plans ADD COLUMN last_replan_overdue_count INTEGER NOT NULL DEFAULT 0"
         )
+    if "last_replan_updated_count" not in plan_columns:
         cursor.execute(
-            """
-            INSERT INTO roadmap_plan_tasks (
-                id,
-                plan_id,
-                goal_skill_id,
-                task_date,
-                title,
-                description,
-                target_minutes,
-                is_completed,
-                completed_at,
-                created_at,
-                updated_at
-            )
-            SELECT
-                id,
-                plan_id,
-                goal_skill_id,
-                task_date,
-                title,
-                description,
-                target_minutes,
-                is_completed,
-                completed_at,
-                created_at,
-                updated_at
-            FROM roadmap_plan_tasks_legacy
-            """
+            "ALTER TABLE roadmap_plans ADD COLUMN last_replan_updated_count INTEGER NOT NULL DEFAULT 0"
         )
-        cursor.execute("DROP TABLE IF EXISTS roadmap_plan_tasks_legacy")
+
+    notification_columns = _table_columns(cursor, "user_notifications")
+    if "dedup_key" not in notification_columns:
+        cursor.execute("ALTER TABLE user_notifications ADD COLUMN dedup_key TEXT")
+
+    # Plans used to store one roadmap_plan_tasks row per study day.
+    _migrate_plan_tasks_to_segments(cursor)
 
     # Recreate playlist recommendation table if it still has the old gap-based structure.
     playlist_columns = _table_columns(cursor, "playlist_recommendations")
@@ -387,13 +524,31 @@ def _ensure_legacy_compatibility(cursor) -> None:
         cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
 
 
-def init_roadmap_schema() -> None:
-    with transaction() as connection:
-        cursor = connection.cursor()
-        for statement in BASE_TABLE_STATEMENTS:
-            cursor.execute(statement)
+def create_baseline_schema(cursor) -> None:
+    """
+    Migration 1: every table and index, brought up from whatever state an
+    older database is in. Idempotent, since databases created before
+    migrations were tracked start from an unknown version.
+    """
 
-        _ensure_legacy_compatibility(cursor)
+    for statement in BASE_TABLE_STATEMENTS:
+        cursor.execute(statement)
+
+    _ensure_legacy_compatibility(cursor)
+
+    for statement in INDEX_STATEMENTS:
+        cursor.execute(statement)
+
+
+def add_background_job_leases(cursor) -> None:
+    """
+    Migration 2: running jobs record the worker that claimed them and until
+    when its lease holds, so only jobs of workers that stopped renewing are
+    requeued.
+    """
 
-        for statement in INDEX_STATEMENTS:
-            cursor.execute(statement)
+    columns = _table_columns(cursor, "background_jobs")
+    if "owner_id" not in columns:
+        cursor.execute("ALTER TABLE background_jobs ADD COLUMN owner_id TEXT")
+    if "lease_expires_at" not in columns:
+        cursor.execute("ALTER TABLE background_jobs ADD COLUMN lease_expires_at TEXT")
@@ -1,3 +1,4 @@
+from backend.roadmap_engine.storage import versions_repo
 from backend.roadmap_engine.storage.database import get_connection, transaction
 from backend.roadmap_engine.utils import utc_now_iso
 
@@ -126,6 +127,7 @@ def replace_student_skills(student_id: int, skills: list[dict]) -> None:
                     now,
                 ),
             )
+        versions_repo.bump_student(connection, student_id)
 
 
 def list_student_skills(student_id: int) -> list[dict]:
@@ -164,3 +166,4 @@ def add_student_skill(
             """,
             (student_id, skill_name, normalized_skill, skill_source, now),
         )
+        versions_repo.bump_student(connection, student_id)
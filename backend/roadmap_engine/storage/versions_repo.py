@@ -0,0 +1,107 @@
+from backend.roadmap_engine.storage.database import get_connection
+from backend.roadmap_engine.utils import utc_now_iso
+
+# Row bumped when crawled opportunities change; it counts towards every
+# student's version. The crawler writes it without importing this module.
+SHARED_VERSION_ID = 0
+
+_BUMP_SQL = """
+    INSERT INTO student_data_versions (student_id, version, updated_at)
+    SELECT student_id, 1, ? FROM ({source}) WHERE student_id IS NOT NULL
+    ON CONFLICT(student_id) DO UPDATE SET
+        version = version + 1,
+        updated_at = excluded.updated_at
+"""
+
+
+def get_student_version(student_id: int) -> int:
+    """Changes whenever anything on the student's dashboard may have changed."""
+
+    connection = get_connection()
+    try:
+        row = connection.execute(
+            """
+            SELECT COALESCE(SUM(version), 0) AS version
+            FROM student_data_versions
+            WHERE student_id IN (?, ?)
+            """,
+            (SHARED_VERSION_ID, student_id),
+        ).fetchone()
+    finally:
+        connection.close()
+
+    return int(row["version"])
+
+
+def _bump(connection, source_sql: str, params: tuple) -> None:
+    connection.execute(_BUMP_SQL.format(source=source_sql), (utc_now_iso(), *params))
+
+
+# The bump_* helpers run inside the caller's write transaction.
+def bump_student(connection, student_id: int) -> None:
+    _bump(connection, "SELECT ? AS student_id", (student_id,))
+
+
+def bump_goal_student(connection, goal_id: int) -> None:
+    _bump(connection, "SELECT student_id FROM career_goals WHERE id = ?", (goal_id,))
+
+
+def bump_goal_skill_student(connection, goal_skill_id: int) -> None:
+    _bump(
+        connection,
+        """
+        SELECT g.student_id
+        FROM career_goal_skills s
+        JOIN career_goals g ON g.id = s.goal_id
+        WHERE s.id = ?
+        """,
+        (goal_skill_id,),
+    )
+
+
+def bump_plan_students(connection, plan_ids: list[int]) -> None:
+    if not plan_ids:
+        return
+
+    placeholders = ",".join("?" for _ in plan_ids)
+    _bump(
+        connection,
+        f"""
+        SELECT DISTINCT g.student_id
+        FROM roadmap_plans p
+        JOIN career_goals g ON g.id = p.goal_id
+        WHERE p.id IN ({placeholders})
+        """,
+        tuple(plan_ids),
+    )
+
+
+def bump_segment_student(connection, segment_id: int) -> None:
+    _bump(
+        connection,
+        """
+        SELECT g.student_id
+        FROM roadmap_plan_segments s
+        JOIN roadmap_plans p ON p.id = s.plan_id
+        JOIN career_goals g ON g.id = p.goal_id
+        WHERE s.id = ?
+        """,
+        (segment_id,),
+    )
+
+
+def bump_assessment_student(connection, assessment_id: int) -> None:
+    _bump(
+        connection,
+        """
+        SELECT g.student_id
+        FROM skill_assessments a
+        JOIN career_goals g ON g.id = a.goal_id
+        WHERE a.id = ?
+        """,
+        (assessment_id,),
+    )
+
+
+def bump_chat_session_student(connection, session_id: int) -> None:
+    _bump(connection, "SELECT student_id FROM skill_playlist_chat_sessions WHERE id = ?", (session_id,))
@@ -0,0 +1,104 @@
+"""
+Benchmark: HTML extraction, legacy BeautifulSoup path vs. single lxml parse.
+
+Reads every *.html file in --pages-dir (default: samples/). Save crawled
+pages there to benchmark real data; with no files a synthetic career page
+is used instead.
+
+    python -m backend.web_data_engine.bench_extract
+    python -m backend.web_data_engine.bench_extract --pages-dir samples --rounds 20
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from backend.web_data_engine.pipeline.extractor.google_job_extractor import extract_google_job_data
+from backend.web_data_engine.utils.link_extractor import extract_internal_links
+from backend.web_data_engine.utils.page_parser import parse_page
+from backend.web_data_engine.utils.text_cleaner import extract_clean_text
+
+
+SYNTHETIC_PAGE = """
+<html><head><title>Careers</title><style>body {{ color: red; }}</style>
+<script>window.tracking = {{ enabled: true }};</script></head>
+<body>
+<header><a href="/">Home</a><a href="/about">About</a></header>
+<nav>{nav}</nav>
+<main>
+<h2>Software Engineering Intern, 2026</h2>
+<p>Apply by Jun 30, 2026. Location: Bengaluru, India.</p>
+<h3>Minimum qualifications</h3>
+<ul>{quals}</ul>
+<p>{body}</p>
+</main>
+<aside>{aside}</aside>
+<footer>{footer}</footer>
+</body></html>
+"""
+
+
+def synthetic_pages():
+    page = SYNTHETIC_PAGE.format(
+        nav="".join(f'<a href="/jobs/{i}">Job {i}</a>' for i in range(200)),
+        quals="".join(f"<li>Experience with skill {i}</li>" for i in range(20)),
+        body="We build products for billions of users. " * 80,
+        aside="".join(f'<a href="/related/{i}">Related role {i}</a>' for i in range(50)),
+        footer="Privacy Terms Help " * 40,
+    )
+    return [("synthetic.html", page)]
+
+
+def load_pages(pages_dir: Path):
+    files = sorted(pages_dir.glob("*.html")) if pages_dir.is_dir() else []
+    if not files:
+        print(f"No *.html files in {pages_dir}/ — using a synthetic page.\n")
+        return synthetic_pages()
+    return [(path.name, path.read_text(encoding="utf-8", errors="ignore")) for path in files]
+
+
+def legacy(html: str, url: str):
+    text = extract_clean_text(html)
+    links = extract_internal_links(html, url)
+    extract_google_job_data(html)
+    return text, links
+
+
+def single_pass(html: str, url: str):
+    page = parse_page(html, url)
+    return page["clean_text"], page["links"]
+
+
+def timed(fn, pages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for _, html in pages:
+            fn(html, "https://careers.example.com/jobs/1")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages-dir", default="samples")
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    pages = load_pages(Path(args.pages_dir))
+    total = len(pages) * args.rounds
+
+    legacy_seconds = timed(legacy, pages, args.rounds)
+    single_seconds = timed(single_pass, pages, args.rounds)
+
+    legacy_chars = sum(len(legacy(html, "https://careers.example.com/")[0]) for _, html in pages)
+    single_chars = sum(len(single_pass(html, "https://careers.example.com/")[0]) for _, html in pages)
+
+    print(f"pages parsed      : {total}")
+    print(f"legacy (bs4 x3)   : {legacy_seconds:.3f}s  ({total / legacy_seconds:.0f} pages/s)")
+    print(f"single lxml parse : {single_seconds:.3f}s  ({total / single_seconds:.0f} pages/s)")
+    print(f"speed-up          : {legacy_seconds / single_seconds:.1f}x")
+    print(f"LLM input chars   : {legacy_chars} -> {single_chars} "
+          f"({100 * (1 - single_chars / max(legacy_chars, 1)):.0f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: opportunity ingest rate, per-page upserts vs. batched writer.
+
+Runs against a throwaway database, never opportunities.db.
+
+    python -m backend.web_data_engine.bench_ingest              # 50k synthetic pages
+    python -m backend.web_data_engine.bench_ingest --pages 5000
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from backend.web_data_engine.pipeline.storage import sqlite_db
+from backend.web_data_engine.pipeline.storage.opportunity_writer import OpportunityWriter
+from backend.web_data_engine.utils.hash_utils import generate_content_hash
+
+
+def synthetic_pages(count: int):
+    for i in range(count):
+        data = {
+            "title": f"Software Engineer {i}",
+            "company": f"Company {i % 500}",
+            "type": "job" if i % 3 else "internship",
+            "deadline": f"2026-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}",
+            "skills": ["Python", "SQL", "DSA"][: (i % 3) + 1],
+        }
+        url = f"https://example.com/jobs/{i}"
+        yield data, generate_content_hash(f"{url} {data['title']}"), url
+
+
+def bench_per_page(count: int) -> float:
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for data, content_hash, url in synthetic_pages(count):
+            sqlite_db.upsert_opportunity(data, content_hash, "bench", url)
+
+    return time.perf_counter() - start
+
+
+def bench_batched(count: int, batch_size: int) -> float:
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with OpportunityWriter(batch_size=batch_size) as writer:
+            for data, content_hash, url in synthetic_pages(count):
+                writer.add(data, content_hash, "bench", url)
+
+    return time.perf_counter() - start
+
+
+def fresh_db(directory: str, name: str):
+    sqlite_db.DB_PATH = Path(directory) / name
+    with contextlib.redirect_stdout(io.StringIO()):
+        sqlite_db.init_db()
+
+
+def report(label: str, count: int, seconds: float):
+    print(f"{label:<28} {count:>7} pages  {seconds:8.2f}s  {count / seconds:10.0f} pages/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fresh_db(tmp, "per_page.db")
+        per_page = bench_per_page(args.pages)
+        report("per-page upsert (insert)", args.pages, per_page)
+
+        fresh_db(tmp, "batched.db")
+        batched = bench_batched(args.pages, args.batch_size)
+        report("batched writer (insert)", args.pages, batched)
+
+        # Second pass over the same pages: every row is unchanged.
+        rerun = bench_batched(args.pages, args.batch_size)
+        report("batched writer (unchanged)", args.pages, rerun)
+
+        print(f"\nSpeed-up (insert): {per_page / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,9 @@ COMPANIES = [
     {
         "name": "Devpost",
         "base_url": None,
-        "use_sitemap": False
+        "use_sitemap": False,
+        # Rows come straight from the API, see ingest_devpost().
+        "api_pages": 20
     },
 
     {
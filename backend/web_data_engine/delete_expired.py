@@ -2,7 +2,7 @@
 Script to delete opportunities with expired deadlines from the database
 """
 
-from pipeline.storage.sqlite_db import delete_expired_opportunities
+from backend.web_data_engine.pipeline.storage.sqlite_db import delete_expired_opportunities
 
 
 if __name__ == "__main__":
@@ -0,0 +1,39 @@
+import os
+
+from backend import metrics
+
+# Where a finished run leaves its metrics: a node_exporter textfile-collector
+# path (or a file in the portal's METRICS_TEXTFILE_DIR), and/or the portal's
+# push endpoint, e.g. http://127.0.0.1:8000/metrics/push/crawler.
+METRICS_FILE = os.getenv("CRAWLER_METRICS_FILE", "")
+METRICS_PUSH_URL = os.getenv("CRAWLER_METRICS_PUSH_URL", "")
+# The portal's METRICS_PUSH_TOKEN, when it requires one.
+METRICS_PUSH_TOKEN = os.getenv("METRICS_PUSH_TOKEN", "")
+
+PAGES = metrics.counter(
+    "crawler_pages_total",
+    "Crawled pages by company and result: fetched, fetch_failed, skipped (unchanged) or extracted (written).",
+    ("company", "result"),
+)
+
+
+def record_page(company: str, result: str):
+    PAGES.inc(company=company, result=result)
+
+
+def export():
+    """Writes and/or pushes this run's metrics (LLM usage included); failures are only logged."""
+
+    if METRICS_FILE:
+        try:
+            metrics.write_textfile(METRICS_FILE)
+            print(f"📈 Metrics written to {METRICS_FILE}")
+        except OSError as e:
+            print(f"Could not write metrics file {METRICS_FILE}: {e}")
+
+    if METRICS_PUSH_URL:
+        try:
+            metrics.push(METRICS_PUSH_URL, METRICS_PUSH_TOKEN)
+            print(f"📈 Metrics pushed to {METRICS_PUSH_URL}")
+        except Exception as e:
+            print(f"Could not push metrics to {METRICS_PUSH_URL}: {e}")
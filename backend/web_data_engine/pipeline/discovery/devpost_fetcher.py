@@ -1,31 +1,101 @@
+import time
+
 import requests
+from concurrent.futures import ThreadPoolExecutor
 
 
 BASE_URL = "https://devpost.com/api/hackathons"
 
+REQUEST_TIMEOUT = 10
 
-def fetch_devpost_hackathons(pages=5):
+# API pages fetched at once; pagination stops between waves.
+MAX_PAGE_WORKERS = 4
+
+# A failed page is retried this often, waiting RETRY_DELAY_SECONDS (doubled
+# each time) in between.
+PAGE_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 1.0
+
+
+def _fetch_api_page(session, page: int) -> list[dict] | None:
+    """The page's hackathons ([] past the last page), or None if every attempt failed."""
+
+    delay = RETRY_DELAY_SECONDS
+    for attempt in range(1, PAGE_ATTEMPTS + 1):
+        try:
+            response = session.get(f"{BASE_URL}?page={page}", timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return response.json().get("hackathons", [])
+
+        except (requests.RequestException, ValueError) as e:
+            print(f"Devpost API page {page} failed (attempt {attempt}/{PAGE_ATTEMPTS}): {e}")
+            if attempt < PAGE_ATTEMPTS:
+                time.sleep(delay)
+                delay *= 2
+
+    return None
+
+
+def iter_devpost_hackathon_items(pages=5, is_known=None, max_workers=MAX_PAGE_WORKERS):
+    """
+    Yields the raw hackathon objects from the Devpost API (title, url,
+    organization_name, submission_period_dates, themes, ...), newest first.
+
+    Pages are fetched concurrently in waves of `max_workers`. If `is_known`
+    is given (url -> bool), pagination stops after the first page whose
+    hackathons are all already known: everything older was seen before.
+    Pagination also stops at the first empty page. A page that still fails
+    after its retries is skipped and does not end the crawl.
+    """
 
     print("🔎 Fetching Devpost hackathons via API...")
 
-    all_links = []
+    total = 0
+    next_page = 1
 
-    for page in range(1, pages + 1):
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=max_workers) as pool:
 
-        url = f"{BASE_URL}?page={page}"
+        while next_page <= pages:
 
-        response = requests.get(url)
-        data = response.json()
+            wave = range(next_page, min(next_page + max_workers, pages + 1))
+            next_page = wave[-1] + 1
 
-        hackathons = data.get("hackathons", [])
+            results = pool.map(lambda page: _fetch_api_page(session, page), wave)
 
-        print(f"Page {page}: {len(hackathons)} hackathons")
+            for page, hackathons in zip(wave, results):
 
-        for hackathon in hackathons:
-            link = hackathon.get("url")
-            if link:
-                all_links.append(link)
+                if hackathons is None:
+                    print(f"Page {page}: skipped after {PAGE_ATTEMPTS} failed attempts")
+                    continue
 
-    print(f"\n✅ Total hackathons collected: {len(all_links)}")
+                print(f"Page {page}: {len(hackathons)} hackathons")
 
-    return all_links
+                # Past the last page.
+                if not hackathons:
+                    next_page = pages + 1
+                    break
+
+                items = [hackathon for hackathon in hackathons if hackathon.get("url")]
+                total += len(items)
+
+                # Checked before yielding: the caller stores what it receives.
+                seen_page = bool(is_known) and bool(items) and all(
+                    is_known(item["url"]) for item in items
+                )
+
+                yield from items
+
+                if seen_page:
+                    print("⏹️ Reached already-seen hackathons — stopping")
+                    next_page = pages + 1
+                    break
+
+    print(f"\n✅ Total hackathons collected: {total}")
+
+
+def fetch_devpost_hackathon_items(pages=5):
+    return list(iter_devpost_hackathon_items(pages))
+
+
+def fetch_devpost_hackathons(pages=5):
+    return [item["url"] for item in fetch_devpost_hackathon_items(pages)]
@@ -1,48 +1,181 @@
+import gzip
+import io
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urljoin
+
 import requests
 from lxml import etree
-from urllib.parse import urljoin
 
 
-def fetch_sitemap(base_url: str):
-    sitemap_url = urljoin(base_url, "/sitemap.xml")
+REQUEST_TIMEOUT = 10
+MAX_SUB_SITEMAP_WORKERS = 8
+
+# Bounded hand-off between parser threads and the crawl loop, so a slow
+# consumer applies back-pressure instead of letting URLs pile up in memory.
+ENTRY_QUEUE_SIZE = 5000
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+_DONE = object()
+
+
+def _open_sitemap_stream(session: requests.Session, url: str):
+    response = session.get(url, timeout=REQUEST_TIMEOUT, stream=True)
+
+    if response.status_code != 200:
+        response.close()
+        print(f"Failed to fetch sitemap: {url}")
+        return None, None
+
+    # Undo any Content-Encoding: gzip applied by the server.
+    response.raw.decode_content = True
+    stream = io.BufferedReader(response.raw)
+
+    # *.xml.gz sitemaps are gzip files served as-is.
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream)
+
+    return response, stream
+
+
+def _parse_sitemap(session, url, emit, submit):
+    """
+    Parses one sitemap with iterparse, clearing each element once read.
+    <url> entries are emitted as (loc, lastmod); <sitemap> entries are
+    handed to `submit` so they are fetched in parallel.
+    """
+
+    response, stream = _open_sitemap_stream(session, url)
+    if stream is None:
+        return
+
+    try:
+        for _, elem in etree.iterparse(
+            stream,
+            events=("end",),
+            tag=("{*}url", "{*}sitemap"),
+            recover=True,
+        ):
+            link = (elem.findtext("{*}loc") or "").strip()
+            lastmod = (elem.findtext("{*}lastmod") or "").strip() or None
+
+            if link:
+                if etree.QName(elem).localname == "sitemap":
+                    submit(link)
+                else:
+                    emit((link, lastmod))
 
-    all_urls = []
+            # Drop the element and any already-processed siblings.
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    finally:
+        response.close()
+
+
+def parse_lastmod(value):
+    """
+    Parses a sitemap <lastmod> (W3C datetime) into a naive UTC datetime,
+    or None when missing or malformed. A bare date stands for the end of
+    that day, so a page changed "that day" is never treated as older.
+    """
+
+    if not value:
+        return None
 
     try:
-        response = requests.get(sitemap_url, timeout=10)
+        if len(value) == 10:
+            return datetime.fromisoformat(value) + timedelta(days=1)
+
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return parsed
+
+
+def iter_sitemap_urls(base_url: str, max_workers: int = MAX_SUB_SITEMAP_WORKERS):
+    """
+    Streams (url, lastmod) pairs from a site's sitemap.xml.
+
+    Sitemap indexes are followed recursively and their sub-sitemaps are
+    fetched concurrently. URLs are yielded while parsing is still running,
+    so the crawl can start before discovery has finished.
+    """
+
+    sitemap_url = urljoin(base_url, "/sitemap.xml")
+
+    entries = queue.Queue(maxsize=ENTRY_QUEUE_SIZE)
+    stop = threading.Event()
+    seen_sitemaps = set()
+    seen_lock = threading.Lock()
+    pending = 0
+
+    session = requests.Session()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def emit(item):
+        while not stop.is_set():
+            try:
+                entries.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def worker(url):
+        try:
+            _parse_sitemap(session, url, emit, submit)
+        except Exception as e:
+            print(f"Error reading sitemap {url}: {e}")
+        finally:
+            emit(_DONE)
 
-        if response.status_code != 200:
-            print(f"No sitemap found for {base_url}")
-            return []
+    def submit(url):
+        nonlocal pending
 
-        xml_root = etree.fromstring(response.content)
+        with seen_lock:
+            if url in seen_sitemaps or stop.is_set():
+                return
+            seen_sitemaps.add(url)
+            pending += 1
 
-        loc_tags = xml_root.findall(".//{*}loc")
+        executor.submit(worker, url)
 
-        for loc in loc_tags:
-            link = loc.text
+    total = 0
 
-            # If it's another sitemap → fetch it
-            if link.endswith(".xml") or "sitemap" in link:
-                try:
-                    sub_resp = requests.get(link, timeout=10)
-                    sub_root = etree.fromstring(sub_resp.content)
+    try:
+        submit(sitemap_url)
+
+        while True:
+            item = entries.get()
+
+            if item is _DONE:
+                with seen_lock:
+                    pending -= 1
+                    if pending == 0:
+                        break
+                continue
 
-                    sub_urls = [
-                        elem.text
-                        for elem in sub_root.findall(".//{*}loc")
-                    ]
+            total += 1
+            yield item
 
-                    all_urls.extend(sub_urls)
+        print(f"Total discovered URLs: {total}")
 
-                except Exception as e:
-                    print(f"Error reading sub-sitemap {link}: {e}")
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        session.close()
 
-            else:
-                all_urls.append(link)
 
-        print(f"Total discovered URLs: {len(all_urls)}")
-        return all_urls
+def fetch_sitemap(base_url: str):
+    try:
+        return [url for url, _ in iter_sitemap_urls(base_url)]
 
     except Exception as e:
         print(f"Error fetching sitemap for {base_url}: {e}")
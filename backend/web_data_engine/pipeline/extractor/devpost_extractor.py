@@ -0,0 +1,36 @@
+import re
+
+from backend.web_data_engine.pipeline.extractor.fields import normalize_deadline, normalize_skills
+
+
+def devpost_deadline(submission_period_dates: str | None) -> str | None:
+    """
+    Devpost reports ranges like "Jan 10 - Mar 01, 2026" or "Feb 03 - 28, 2026";
+    the deadline is the end of the range.
+    """
+
+    if not submission_period_dates:
+        return None
+
+    start, _, end = str(submission_period_dates).rpartition(" - ")
+    end = end.strip()
+
+    # Same-month ranges omit the month on the end date.
+    if re.match(r"^\d{1,2}, \d{4}$", end) and start:
+        end = f"{start.split()[0]} {end}"
+
+    return normalize_deadline(end)
+
+
+def extract_devpost_api(context: dict) -> dict:
+    item = context.get("api_item")
+    if not item:
+        return {}
+
+    return {
+        "title": item.get("title"),
+        "company": item.get("organization_name") or "Devpost",
+        "type": "hackathon",
+        "deadline": devpost_deadline(item.get("submission_period_dates")),
+        "skills": normalize_skills(item.get("themes")),
+    }
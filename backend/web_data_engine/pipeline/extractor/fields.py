@@ -0,0 +1,112 @@
+import re
+from datetime import datetime
+
+
+OPPORTUNITY_FIELDS = ("title", "company", "type", "deadline", "skills")
+
+# Without these a row is not usable; skills alone never justify an LLM call.
+REQUIRED_FIELDS = ("title", "company", "type", "deadline")
+
+DEADLINE_FORMATS = [
+    "%Y-%m-%d",
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%b %d %Y",
+    "%B %d %Y",
+    "%d %b %Y",
+    "%d %B %Y",
+]
+
+
+def empty_opportunity() -> dict:
+    return {
+        "title": None,
+        "company": None,
+        "type": None,
+        "deadline": None,
+        "skills": [],
+    }
+
+
+def normalize_deadline(value) -> str | None:
+    """
+    Converts the date formats seen on job pages to ISO (YYYY-MM-DD), which
+    is what delete_expired_opportunities and the roadmap engine compare.
+    """
+
+    if not value:
+        return None
+
+    text = " ".join(str(value).replace(".", "").split())
+
+    # ISO timestamps such as 2026-06-30T23:59:00Z
+    iso_match = re.match(r"^(\d{4}-\d{2}-\d{2})", text)
+    if iso_match:
+        text = iso_match.group(1)
+
+    for fmt in DEADLINE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+
+    return None
+
+
+def infer_type(*hints) -> str | None:
+    haystack = " ".join(str(hint or "") for hint in hints).lower()
+    if not haystack.strip():
+        return None
+    if "hackathon" in haystack:
+        return "hackathon"
+    if "intern" in haystack:
+        return "internship"
+    return "job"
+
+
+def normalize_skills(value) -> list[str]:
+    if not value:
+        return []
+
+    if isinstance(value, str):
+        value = re.split(r"[,;\n]", value)
+
+    skills = []
+    seen = set()
+    for item in value:
+        if isinstance(item, dict):
+            item = item.get("name")
+        text = " ".join(str(item or "").split())
+        if text and text.lower() not in seen:
+            seen.add(text.lower())
+            skills.append(text)
+
+    return skills
+
+
+def missing_fields(data: dict) -> list[str]:
+    return [field for field in OPPORTUNITY_FIELDS if not data.get(field)]
+
+
+def needs_llm(data: dict, has_posting: bool) -> bool:
+    """
+    The LLM is skipped only for pages with JobPosting markup whose required
+    fields are all filled; on any other page it decides whether the page
+    is an opportunity at all.
+    """
+
+    return not has_posting or any(not data.get(field) for field in REQUIRED_FIELDS)
+
+
+def fill_missing(data: dict, extra: dict | None) -> dict:
+    """Copies fields from `extra` only where `data` has none."""
+
+    if not extra:
+        return data
+
+    merged = dict(data)
+    for field in OPPORTUNITY_FIELDS:
+        if not merged.get(field) and extra.get(field):
+            merged[field] = extra[field]
+
+    return merged
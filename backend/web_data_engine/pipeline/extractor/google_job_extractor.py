@@ -1,6 +1,8 @@
 from bs4 import BeautifulSoup
 import re
 
+from backend.web_data_engine.pipeline.extractor.fields import infer_type, normalize_deadline
+
 
 def extract_google_job_data(html: str):
     try:
@@ -35,3 +37,20 @@ def extract_google_job_data(html: str):
     except Exception as e:
         print(f"Extraction error: {e}")
         return None, None
+
+
+def extract_google_fields(context: dict) -> dict:
+    """
+    Registry extractor: reuses the title/deadline parse_page already found
+    with the same selectors as extract_google_job_data.
+    """
+
+    page = context.get("page") or {}
+    title = page.get("title")
+
+    return {
+        "title": title,
+        "company": context.get("company"),
+        "type": infer_type(title),
+        "deadline": normalize_deadline(page.get("deadline")),
+    }
@@ -0,0 +1,60 @@
+from backend.web_data_engine.pipeline.extractor.devpost_extractor import extract_devpost_api
+from backend.web_data_engine.pipeline.extractor.fields import OPPORTUNITY_FIELDS, empty_opportunity
+from backend.web_data_engine.pipeline.extractor.google_job_extractor import extract_google_fields
+from backend.web_data_engine.pipeline.extractor.structured_data_extractor import extract_json_ld, extract_microdata
+
+
+# Extractors that apply to every source.
+GENERIC_EXTRACTORS = [
+    extract_json_ld,
+    extract_microdata,
+]
+
+# Source (company name in config/companies.py) -> extractors, most trusted first.
+SOURCE_EXTRACTORS = {
+    "Devpost": [extract_devpost_api],
+    "Google": [extract_google_fields],
+}
+
+
+def register_extractor(source: str, extractor):
+    """
+    Adds an extractor for `source`. An extractor takes a context dict
+    (source, company, url, page, api_item) and returns a partial opportunity.
+    """
+
+    SOURCE_EXTRACTORS.setdefault(source, []).append(extractor)
+
+
+def extract_structured(source: str, url: str, page: dict, api_item: dict | None = None) -> dict:
+    """
+    Fills the opportunity schema from deterministic extractors only.
+    Source-specific extractors run first, then the generic ones; the first
+    non-empty value for each field wins. Fields nobody found stay empty.
+    """
+
+    context = {
+        "source": source,
+        "company": source,
+        "url": url,
+        "page": page or {},
+        "api_item": api_item,
+    }
+
+    data = empty_opportunity()
+
+    for extractor in SOURCE_EXTRACTORS.get(source, []) + GENERIC_EXTRACTORS:
+        try:
+            partial = extractor(context) or {}
+        except Exception as e:
+            print(f"Extractor {extractor.__name__} failed for {url}: {e}")
+            continue
+
+        for field in OPPORTUNITY_FIELDS:
+            if not data.get(field) and partial.get(field):
+                data[field] = partial[field]
+
+        if all(data.get(field) for field in OPPORTUNITY_FIELDS):
+            break
+
+    return data
@@ -0,0 +1,90 @@
+from backend.web_data_engine.pipeline.extractor.fields import infer_type, normalize_deadline, normalize_skills
+
+
+def _is_job_posting(node: dict) -> bool:
+    node_type = node.get("@type")
+    if isinstance(node_type, list):
+        return "JobPosting" in node_type
+    return node_type == "JobPosting"
+
+
+def _walk_json_ld(block):
+    """Yields every dict in a JSON-LD block (lists and @graph included)."""
+
+    if isinstance(block, list):
+        for item in block:
+            yield from _walk_json_ld(item)
+
+    elif isinstance(block, dict):
+        yield block
+        if "@graph" in block:
+            yield from _walk_json_ld(block["@graph"])
+
+
+def _organization_name(value):
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        return value.get("name")
+    return value
+
+
+def has_job_posting(page: dict) -> bool:
+    """
+    True when the page carries schema.org JobPosting markup (JSON-LD or
+    microdata), i.e. real evidence that it is a posting. Heuristics such
+    as "first <h2> plus a date" are not.
+    """
+
+    for block in page.get("json_ld", []):
+        if any(_is_job_posting(node) for node in _walk_json_ld(block)):
+            return True
+
+    return any("JobPosting" in item["itemtype"] for item in page.get("microdata", []))
+
+
+def extract_json_ld(context: dict) -> dict:
+    page = context.get("page") or {}
+
+    for block in page.get("json_ld", []):
+        for node in _walk_json_ld(block):
+            if not _is_job_posting(node):
+                continue
+
+            employment_type = node.get("employmentType")
+            if isinstance(employment_type, list):
+                employment_type = " ".join(str(item) for item in employment_type)
+
+            return {
+                "title": node.get("title"),
+                "company": _organization_name(node.get("hiringOrganization")),
+                "type": infer_type(employment_type, node.get("title")),
+                "deadline": normalize_deadline(node.get("validThrough")),
+                "skills": normalize_skills(node.get("skills")),
+            }
+
+    return {}
+
+
+def extract_microdata(context: dict) -> dict:
+    page = context.get("page") or {}
+
+    for item in page.get("microdata", []):
+        if "JobPosting" not in item["itemtype"]:
+            continue
+
+        props = item["props"]
+
+        def first(name):
+            values = props.get(name) or []
+            return values[0] if values else None
+
+        return {
+            "title": first("title"),
+            "company": first("hiringOrganization"),
+            "type": infer_type(first("employmentType"), first("title")),
+            "deadline": normalize_deadline(first("validThrough")),
+            "skills": normalize_skills(props.get("skills")),
+        }
+
+    return {}
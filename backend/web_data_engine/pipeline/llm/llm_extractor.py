@@ -1,11 +1,16 @@
 import os
 import json
-from groq import Groq
+import time
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+from backend import llm_gateway
+from backend.web_data_engine.pipeline.llm.text_reducer import estimate_tokens, relevant_chunks
 
 MODEL = "llama-3.3-70b-versatile"
 
+# Max page-text tokens sent per LLM call, and max calls per page.
+MAX_INPUT_TOKENS = int(os.getenv("LLM_MAX_INPUT_TOKENS", "1500"))
+MAX_CHUNKS_PER_PAGE = int(os.getenv("LLM_MAX_CHUNKS_PER_PAGE", "3"))
+
 
 SYSTEM_PROMPT = """
 You are an information extraction engine.
@@ -25,29 +30,20 @@ Return valid JSON only. No explanations.
 """
 
 
-def extract_opportunity_with_llm(clean_text: str) -> dict:
-
-    if not clean_text:
-        return None
-
-    user_prompt = f"""
-Extract the opportunity details from the text below.
+# Running totals for the crawl run, see usage_summary().
+USAGE = {
+    "pages": 0,
+    "calls": 0,
+    "raw_tokens": 0,
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "latency_seconds": 0.0,
+}
 
-TEXT:
-{clean_text}
-"""
 
-    response = client.chat.completions.create(
-        model=MODEL,
-        temperature=0,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt},
-        ],
-    )
+def _parse_json(content: str):
 
-    
-    content = response.choices[0].message.content.strip()
+    content = content.strip()
 
 # 🔧 Remove markdown code fences if present
     if content.startswith("```"):
@@ -63,3 +59,131 @@ TEXT:
         print(content)
         return None
 
+
+def _extract_chunk(text: str, fields=None):
+
+    focus = ""
+    if fields:
+        focus = f"\nOnly these fields are needed: {', '.join(fields)}.\n"
+
+    user_prompt = f"""
+Extract the opportunity details from the text below.
+{focus}
+TEXT:
+{text}
+"""
+
+    start = time.perf_counter()
+
+    # Background priority: the crawler uses whatever quota the portal leaves.
+    response = llm_gateway.chat_completion(
+        [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+        model=MODEL,
+        temperature=0,
+        caller="crawler.llm_extractor",
+        priority=llm_gateway.PRIORITY_BACKGROUND,
+    )
+
+    USAGE["calls"] += 1
+    USAGE["latency_seconds"] += time.perf_counter() - start
+
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        USAGE["prompt_tokens"] += usage.prompt_tokens or 0
+        USAGE["completion_tokens"] += usage.completion_tokens or 0
+
+    data = _parse_json(response.choices[0].message.content)
+
+    if isinstance(data, list):
+        data = data[0] if data and isinstance(data[0], dict) else None
+
+    return data if isinstance(data, dict) else None
+
+
+def _merge_results(results: list[dict]) -> dict:
+    """First non-empty value wins per field; skills are unioned in order."""
+
+    merged = {
+        "title": None,
+        "company": None,
+        "type": None,
+        "deadline": None,
+        "skills": [],
+    }
+    seen_skills = set()
+
+    for result in results:
+        for field in ("title", "company", "type", "deadline"):
+            if not merged[field] and result.get(field):
+                merged[field] = result[field]
+
+        skills = result.get("skills") or []
+        if isinstance(skills, str):
+            skills = [skills]
+
+        for skill in skills:
+            key = str(skill).strip().lower()
+            if key and key not in seen_skills:
+                seen_skills.add(key)
+                merged["skills"].append(str(skill).strip())
+
+    return merged
+
+
+def extract_opportunity_with_llm(clean_text: str, fields=None) -> dict:
+    """
+    `fields` narrows the request to the fields deterministic extraction
+    could not fill; by default everything is extracted.
+    """
+
+    if not clean_text:
+        return None
+
+    wanted = fields or ("title", "deadline", "skills")
+
+    raw_tokens = estimate_tokens(clean_text)
+    chunks = relevant_chunks(clean_text, MAX_INPUT_TOKENS, MAX_CHUNKS_PER_PAGE)
+
+    calls_before = USAGE["calls"]
+    prompt_before = USAGE["prompt_tokens"]
+
+    results = []
+    for chunk in chunks:
+        data = _extract_chunk(chunk, fields)
+        if data:
+            results.append(data)
+
+        # Everything needed is already there, later chunks would add nothing.
+        if data and all(data.get(field) for field in wanted):
+            break
+
+    USAGE["pages"] += 1
+    USAGE["raw_tokens"] += raw_tokens
+
+    print(
+        f"🧮 Tokens: ~{raw_tokens} page → {USAGE['prompt_tokens'] - prompt_before} prompt "
+        f"in {USAGE['calls'] - calls_before} call(s)"
+    )
+
+    if not results:
+        return None
+
+    if len(results) == 1:
+        return results[0]
+
+    return _merge_results(results)
+
+
+def usage_summary() -> str:
+    pages = max(USAGE["pages"], 1)
+    calls = max(USAGE["calls"], 1)
+    return (
+        f"LLM usage: {USAGE['pages']} pages, {USAGE['calls']} calls, "
+        f"~{USAGE['raw_tokens']} raw page tokens → {USAGE['prompt_tokens']} prompt + "
+        f"{USAGE['completion_tokens']} completion tokens "
+        f"({USAGE['prompt_tokens'] / pages:.0f} prompt tokens/page, "
+        f"{USAGE['latency_seconds'] / calls:.2f}s/call)"
+    )
@@ -0,0 +1,134 @@
+import re
+
+
+# Rough Llama-family ratio; good enough for budgeting without a tokenizer.
+CHARS_PER_TOKEN = 4
+
+# Text is scored in windows of roughly this many characters.
+WINDOW_CHARS = 400
+
+KEYWORD_WEIGHTS = {
+    # title / role
+    "intern": 3, "internship": 3, "engineer": 3, "developer": 3, "hackathon": 3,
+    "role": 2, "position": 2, "job": 1, "hiring": 2, "analyst": 2, "scientist": 2,
+    # deadline
+    "deadline": 4, "apply by": 4, "last date": 4, "closes": 3, "registration": 2,
+    "submission": 2, "ends": 1, "until": 1,
+    # requirements
+    "qualifications": 4, "requirements": 4, "required": 3, "skills": 3,
+    "experience": 2, "eligibility": 3, "responsibilities": 2, "proficiency": 2,
+    "knowledge of": 2, "familiarity": 2, "degree": 1, "themes": 2,
+}
+
+DATE_HINT = re.compile(
+    r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.? \d{1,2}\b|\b\d{4}-\d{2}-\d{2}\b"
+)
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?:;])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _windows(text: str) -> list[str]:
+    """Groups sentences into ~WINDOW_CHARS windows, preserving order."""
+
+    windows = []
+    current = []
+    size = 0
+
+    for sentence in SENTENCE_SPLIT.split(text):
+        # Very long "sentences" (no punctuation) are cut hard.
+        while len(sentence) > WINDOW_CHARS:
+            if current:
+                windows.append(" ".join(current))
+                current, size = [], 0
+            windows.append(sentence[:WINDOW_CHARS])
+            sentence = sentence[WINDOW_CHARS:]
+
+        if size + len(sentence) > WINDOW_CHARS and current:
+            windows.append(" ".join(current))
+            current, size = [], 0
+
+        current.append(sentence)
+        size += len(sentence) + 1
+
+    if current:
+        windows.append(" ".join(current))
+
+    return [window for window in windows if window.strip()]
+
+
+def _score(window: str) -> int:
+    lowered = window.lower()
+    score = sum(weight for keyword, weight in KEYWORD_WEIGHTS.items() if keyword in lowered)
+    if DATE_HINT.search(window):
+        score += 4
+    return score
+
+
+def _select_windows(windows: list[str], budget_chars: int) -> list[str]:
+    """
+    The opening window is always kept (titles usually come first), then
+    windows are added by relevance score; each relevant window also pulls
+    in its following neighbour, since requirement lists tend to continue
+    past the heading that matched. Original order is preserved.
+    """
+
+    scores = [_score(window) for window in windows]
+
+    ranked = sorted(
+        (idx for idx in range(1, len(windows)) if scores[idx] > 0),
+        key=lambda idx: (-scores[idx], idx),
+    )
+
+    order = [0]
+    for idx in ranked:
+        order.append(idx)
+        if idx + 1 < len(windows):
+            order.append(idx + 1)
+
+    kept = set()
+    used = 0
+    for idx in order:
+        if idx in kept:
+            continue
+        cost = len(windows[idx]) + 1
+        if used + cost > budget_chars:
+            continue
+        kept.add(idx)
+        used += cost
+
+    return [windows[idx] for idx in sorted(kept)]
+
+
+def relevant_chunks(text: str, token_budget: int, max_chunks: int) -> list[str]:
+    """
+    Splits a page that does not fit one call into at most `max_chunks`
+    budget-sized chunks made of its relevant windows only.
+    """
+
+    if estimate_tokens(text) <= token_budget:
+        return [text] if text else []
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    windows = _select_windows(_windows(text), budget_chars * max_chunks)
+
+    chunks = []
+    current = []
+    size = 0
+
+    for window in windows:
+        if size + len(window) > budget_chars and current:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(window)
+        size += len(window) + 1
+
+    if current:
+        chunks.append(" ".join(current))
+
+    return chunks[:max_chunks]
@@ -0,0 +1,169 @@
+import time
+from datetime import datetime
+
+from backend.web_data_engine.pipeline.storage.sqlite_db import bump_portal_data_version, get_connection
+
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+
+UPSERT_SQL = """
+INSERT INTO opportunities
+(title, company, type, deadline, skills, url, source, content_hash, last_updated)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(url) DO UPDATE SET
+    title = excluded.title,
+    company = excluded.company,
+    type = excluded.type,
+    deadline = excluded.deadline,
+    skills = excluded.skills,
+    content_hash = excluded.content_hash,
+    last_updated = excluded.last_updated
+WHERE opportunities.content_hash IS NOT excluded.content_hash
+"""
+
+
+class OpportunityWriter:
+    """
+    Buffers extracted opportunities and writes them in batches.
+
+    One connection is held for the whole crawl run. Buffered rows are
+    flushed in a single transaction when `batch_size` rows are pending or
+    `flush_interval` seconds have passed since the last flush, and once more
+    on close. The interval is checked on each add and whenever the crawl
+    loop calls flush_if_due(), so rows do not wait on a run of skipped pages
+    or a slow LLM call.
+
+    Usage:
+        with OpportunityWriter() as writer:
+            writer.add(data, content_hash, source, url)
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+
+        self.conn = get_connection()
+        self.pending = {}
+        self.last_flush = time.monotonic()
+
+        self.written = 0
+        self.skipped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def is_unchanged(self, url: str, content_hash: str) -> bool:
+        """
+        True when `url` is already stored (or buffered) with this hash,
+        so the caller can skip extraction entirely.
+        """
+
+        if not content_hash:
+            return False
+
+        buffered = self.pending.get(url)
+        if buffered is not None:
+            return buffered[7] == content_hash
+
+        row = self.conn.execute(
+            "SELECT content_hash FROM opportunities WHERE url = ?", (url,)
+        ).fetchone()
+
+        return row is not None and row[0] == content_hash
+
+    def is_fresh(self, url: str, modified_at: datetime) -> bool:
+        """
+        True when `url` is stored and was written at or after `modified_at`
+        (naive UTC, e.g. a sitemap lastmod), so it need not be fetched.
+        """
+
+        if url in self.pending:
+            return True
+
+        row = self.conn.execute(
+            "SELECT last_updated FROM opportunities WHERE url = ?", (url,)
+        ).fetchone()
+
+        if row is None or not row[0]:
+            return False
+
+        try:
+            return datetime.fromisoformat(row[0]) >= modified_at
+        except ValueError:
+            return False
+
+    def is_known(self, url: str) -> bool:
+        """True when `url` is already stored or buffered, whatever its hash."""
+
+        if url in self.pending:
+            return True
+
+        row = self.conn.execute(
+            "SELECT 1 FROM opportunities WHERE url = ?", (url,)
+        ).fetchone()
+
+        return row is not None
+
+    def add(self, data: dict, content_hash: str, source: str, url: str):
+
+        now = datetime.utcnow().isoformat()
+
+        # Keyed by url: a page seen twice in one batch keeps its latest version.
+        self.pending[url] = (
+            data.get("title"),
+            data.get("company"),
+            data.get("type"),
+            data.get("deadline"),
+            str(data.get("skills") or []),
+            url,
+            source,
+            content_hash,
+            now,
+        )
+
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        """Flushes when rows are pending and `flush_interval` has passed since the last flush."""
+
+        if self.pending and time.monotonic() - self.last_flush >= self.flush_interval:
+            return self.flush()
+        return 0
+
+    def flush(self):
+
+        self.last_flush = time.monotonic()
+
+        if not self.pending:
+            return 0
+
+        rows = list(self.pending.values())
+        self.pending.clear()
+
+        before = self.conn.total_changes
+
+        with self.conn:
+            self.conn.executemany(UPSERT_SQL, rows)
+            changed = self.conn.total_changes - before
+            if changed:
+                bump_portal_data_version(self.conn)
+        self.written += changed
+        self.skipped += len(rows) - changed
+
+        print(f"💾 Flushed {len(rows)} opportunities ({changed} written, {len(rows) - changed} unchanged)")
+
+        return changed
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
@@ -4,6 +4,11 @@ from datetime import datetime
 
 DB_PATH = Path("opportunities.db")
 
+# Shared row of the web portal's per-student version counters. Bumping it
+# when opportunities change invalidates every cached dashboard (matches,
+# forecasts). The table belongs to the portal, so skip it when absent.
+PORTAL_SHARED_VERSION_ID = 0
+
 
 def get_connection():
     return sqlite3.connect(DB_PATH)
@@ -34,15 +39,36 @@ def init_db():
     print("Database initialized")
 
 
-def get_existing_hash(url: str):
+def bump_portal_data_version(conn):
+
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'student_data_versions'"
+    ).fetchone()
+    if not exists:
+        return
+
+    conn.execute("""
+    INSERT INTO student_data_versions (student_id, version, updated_at)
+    VALUES (?, 1, ?)
+    ON CONFLICT(student_id) DO UPDATE SET
+        version = version + 1,
+        updated_at = excluded.updated_at
+    """, (PORTAL_SHARED_VERSION_ID, datetime.utcnow().isoformat()))
+
+
+def get_existing_hash(url: str, conn=None):
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
 
-    conn = get_connection()
     cursor = conn.cursor()
 
     cursor.execute("SELECT content_hash FROM opportunities WHERE url = ?", (url,))
     row = cursor.fetchone()
 
-    conn.close()
+    if own_conn:
+        conn.close()
 
     return row[0] if row else None
 
@@ -52,7 +78,7 @@ def upsert_opportunity(data: dict, content_hash: str, source: str, url: str):
     conn = get_connection()
     cursor = conn.cursor()
 
-    existing_hash = get_existing_hash(url)
+    existing_hash = get_existing_hash(url, conn)
 
     if existing_hash == content_hash:
         print("⏩ No change — skipping")
@@ -98,6 +124,7 @@ def upsert_opportunity(data: dict, content_hash: str, source: str, url: str):
 
         print("🔄 Updated:", data["title"])
 
+    bump_portal_data_version(conn)
     conn.commit()
     conn.close()
 
@@ -116,6 +143,8 @@ def delete_expired_opportunities():
     """, (now,))
     
     deleted_count = cursor.rowcount
+    if deleted_count > 0:
+        bump_portal_data_version(conn)
     conn.commit()
     conn.close()
     
@@ -1,19 +1,75 @@
-from config.companies import COMPANIES
+import json
 
-from pipeline.discovery.sitemap_fetcher import fetch_sitemap
-from pipeline.crawler.page_fetcher import fetch_page
+from backend.web_data_engine.config.companies import COMPANIES
 
-from utils.text_cleaner import extract_clean_text
-from utils.hash_utils import generate_content_hash
+from backend.web_data_engine.pipeline.discovery.sitemap_fetcher import iter_sitemap_urls, parse_lastmod
+from backend.web_data_engine.pipeline.crawler.page_fetcher import fetch_page
+from backend.web_data_engine.pipeline.crawler.crawl_metrics import export as export_metrics, record_page
 
-from pipeline.llm.llm_extractor import extract_opportunity_with_llm
-from pipeline.storage.sqlite_db import init_db, upsert_opportunity, delete_expired_opportunities
+from backend.web_data_engine.utils.page_parser import parse_page
+from backend.web_data_engine.utils.hash_utils import generate_content_hash
 
-from pipeline.discovery.devpost_fetcher import fetch_devpost_hackathons
-from utils.link_extractor import extract_internal_links
+from backend.web_data_engine.pipeline.llm.llm_extractor import extract_opportunity_with_llm, usage_summary
+from backend.web_data_engine.pipeline.storage.sqlite_db import init_db, delete_expired_opportunities
+from backend.web_data_engine.pipeline.storage.opportunity_writer import OpportunityWriter
 
+from backend.web_data_engine.pipeline.discovery.devpost_fetcher import iter_devpost_hackathon_items
+from backend.web_data_engine.pipeline.extractor.registry import extract_structured
+from backend.web_data_engine.pipeline.extractor.structured_data_extractor import has_job_posting
+from backend.web_data_engine.pipeline.extractor.fields import missing_fields, needs_llm, fill_missing
 
-def process_company(company):
+
+def ingest_devpost(company, writer):
+    """
+    The Devpost API already returns title, organization, dates and themes,
+    so rows are built from the payload directly: no page fetch, no LLM.
+    """
+
+    items = iter_devpost_hackathon_items(
+        pages=company["api_pages"], is_known=writer.is_known
+    )
+
+    for item in items:
+
+        writer.flush_if_due()
+        record_page(company["name"], "fetched")
+        data = extract_structured(company["name"], item["url"], {}, api_item=item)
+        content_hash = generate_content_hash(json.dumps(data, sort_keys=True))
+
+        if writer.is_unchanged(item["url"], content_hash):
+            record_page(company["name"], "skipped")
+            continue
+
+        if data.get("title"):
+            print(f"🏁 {data['title']} (deadline: {data['deadline']})")
+            record_page(company["name"], "extracted")
+            writer.add(
+                data=data,
+                content_hash=content_hash,
+                source="devpost_api",
+                url=item["url"]
+            )
+
+
+def changed_sitemap_urls(company, writer):
+    """
+    Streams a company's sitemap URLs, dropping pages whose <lastmod> is not
+    newer than the copy already stored: those are neither fetched nor parsed.
+    URLs without a lastmod are always crawled (the content hash still
+    catches unchanged pages).
+    """
+
+    for url, lastmod in iter_sitemap_urls(company["base_url"]):
+        modified_at = parse_lastmod(lastmod)
+
+        if modified_at is not None and writer.is_fresh(url, modified_at):
+            record_page(company["name"], "skipped")
+            continue
+
+        yield url
+
+
+def process_company(company, writer):
 
     print(f"\n==============================")
     print(f"Processing: {company['name']}")
@@ -21,27 +77,30 @@ def process_company(company):
 
     # 🔍 DISCOVERY
 
-    if company["name"] == "Devpost":
-        urls = fetch_devpost_hackathons()
+    if "api_pages" in company:
+        ingest_devpost(company, writer)
+        return
 
-    elif "seed_urls" in company:
+    if "seed_urls" in company:
         urls = company["seed_urls"]
 
     elif company["use_sitemap"]:
-        urls = fetch_sitemap(company["base_url"])
+        # Streamed: crawling starts while the sitemap is still being parsed.
+        urls = changed_sitemap_urls(company, writer)
 
     else:
         urls = []
 
 
-    print(f"Total URLs discovered: {len(urls)}")
+    if isinstance(urls, list):
+        print(f"Total URLs discovered: {len(urls)}")
 
     
 
     # 🔴 limit for testing
     #urls = urls[:3]
 
-    # ⚙️ PROCESSING (runs for BOTH Google & Devpost)
+    # ⚙️ PROCESSING (crawled sources)
     for url in urls:
 
         print(f"\n🌐 Processing URL: {url}")
@@ -50,7 +109,7 @@ def process_company(company):
 
         # 🧠 If this company uses seed URLs → expand links
         if "seed_urls" in company:
-            discovered_links = extract_internal_links(html, url)
+            discovered_links = parse_page(html, url)["links"]
 
             print(f"🔗 Found {len(discovered_links)} internal links")
 
@@ -66,19 +125,51 @@ def process_company(company):
 
             print(f"➡️ Processing target: {target}")
 
+            # Time-based flush even when nothing is added (skipped pages).
+            writer.flush_if_due()
+
             page_html = fetch_page(target)
-            clean_text = extract_clean_text(page_html)
+            record_page(company["name"], "fetched" if page_html is not None else "fetch_failed")
+
+            # Single lxml parse: text, links and structured fields together.
+            page = parse_page(page_html, target)
+            clean_text = page["clean_text"]
             content_hash = generate_content_hash(clean_text)
 
-            data = extract_opportunity_with_llm(clean_text)
+            if writer.is_unchanged(target, content_hash):
+                print("⏩ No change — skipping")
+                record_page(company["name"], "skipped")
+                continue
+
+            # Deterministic extractors first. With JobPosting markup the LLM
+            # only fills the gaps; without it, it judges the page.
+            data = extract_structured(company["name"], target, page)
+            has_posting = has_job_posting(page)
+
+            if needs_llm(data, has_posting):
+                # The call can take a while; store what is buffered first.
+                writer.flush()
+                llm_data = extract_opportunity_with_llm(
+                    clean_text, fields=missing_fields(data) if has_posting else None
+                )
+
+                if isinstance(llm_data, list):
+                    llm_data = llm_data[0] if llm_data else None
 
-            if isinstance(data, list):
-                if len(data) == 0:
+                if has_posting:
+                    data = fill_missing(data, llm_data)
+                elif llm_data and llm_data.get("title"):
+                    # Heuristic values (e.g. the first <h2>) only fill what the LLM left out.
+                    data = fill_missing(llm_data, data)
+                else:
+                    print("🚫 Not an opportunity — skipping")
                     continue
-                data = data[0]
+            else:
+                print("🧩 Structured data found — LLM skipped")
 
-            if data:
-                upsert_opportunity(
+            if data.get("title"):
+                record_page(company["name"], "extracted")
+                writer.add(
                     data=data,
                     content_hash=content_hash,
                     source="crawler",
@@ -96,8 +187,13 @@ def main():
     # 🗑️ Clean up expired opportunities first
     delete_expired_opportunities()
 
-    for company in COMPANIES:
-        process_company(company)
+    # One connection for the whole run; rows are written in batches.
+    with OpportunityWriter() as writer:
+        for company in COMPANIES:
+            process_company(company, writer)
+
+    print(f"\n{usage_summary()}")
+    export_metrics()
 
 
 
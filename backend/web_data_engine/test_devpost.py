@@ -1,4 +1,4 @@
-from pipeline.discovery.devpost_fetcher import fetch_devpost_hackathons
+from backend.web_data_engine.pipeline.discovery.devpost_fetcher import fetch_devpost_hackathons
 
 urls = fetch_devpost_hackathons()
 
@@ -1,4 +1,4 @@
-from pipeline.llm.llm_extractor import extract_opportunity_with_llm
+from backend.web_data_engine.pipeline.llm.llm_extractor import extract_opportunity_with_llm
 
 sample_text = """
 Google is hiring a Software Engineering Intern.
@@ -0,0 +1,163 @@
+import json
+import re
+from urllib.parse import urljoin, urlparse
+
+from lxml import etree, html as lxml_html
+
+
+# Never visible text.
+DROP_TAGS = ["script", "style", "noscript", "template", "svg", "iframe"]
+
+# Page chrome that only adds noise (and tokens) to LLM input.
+PRUNE_XPATH = (
+    "//nav | //footer | //header | //aside | //form"
+    " | //*[@role='navigation' or @role='banner' or @role='contentinfo'"
+    " or @role='search' or @aria-hidden='true']"
+)
+
+# lxml refuses str input that carries an encoding declaration; the page is
+# already decoded, so the declaration is dropped.
+XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+# simple date pattern like "Jun 30, 2026"
+DATE_PATTERN = re.compile(
+    r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}, \d{4}"
+)
+
+
+def _empty_page():
+    return {
+        "clean_text": "",
+        "links": [],
+        "title": None,
+        "deadline": None,
+        "json_ld": [],
+        "microdata": [],
+    }
+
+
+def _json_ld_blocks(root) -> list:
+    blocks = []
+    for raw in root.xpath("//script[@type='application/ld+json']/text()"):
+        try:
+            blocks.append(json.loads(raw))
+        except ValueError:
+            continue
+    return blocks
+
+
+def _itemprop_value(element):
+    if element.get("itemscope") is not None:
+        names = element.xpath(".//*[@itemprop='name']")
+        if names:
+            return _itemprop_value(names[0])
+
+    for attribute in ("content", "datetime", "href", "src"):
+        if element.get(attribute):
+            return element.get(attribute).strip()
+
+    return " ".join(element.text_content().split())
+
+
+def _microdata_items(root) -> list[dict]:
+    """
+    Flattens each top-level schema.org itemscope into {itemtype, props},
+    where props maps itemprop -> list of values. Nested itemscopes (e.g.
+    hiringOrganization) are reduced to their `name`.
+    """
+
+    items = []
+    for scope in root.xpath("//*[@itemscope and not(ancestor::*[@itemscope])]"):
+        props = {}
+        for element in scope.xpath(".//*[@itemprop]"):
+            owner = element.getparent()
+            while owner is not None and owner.get("itemscope") is None:
+                owner = owner.getparent()
+            if owner is not scope:
+                continue
+            value = _itemprop_value(element)
+            if value:
+                for name in element.get("itemprop").split():
+                    props.setdefault(name, []).append(value)
+
+        items.append({"itemtype": scope.get("itemtype") or "", "props": props})
+    return items
+
+
+def parse_page(html: str, base_url: str = "") -> dict:
+    """
+    Parses a page once with lxml and returns everything the crawler needs:
+
+    - clean_text: visible text with nav/footer/etc. pruned, for the LLM
+    - links: same-domain links (collected before pruning, so nav links count)
+    - title / deadline: the Google-style structured fields
+    - json_ld / microdata: schema.org data for the structured extractors
+    """
+
+    if not html or not html.strip():
+        return _empty_page()
+
+    if isinstance(html, str):
+        html = XML_DECLARATION.sub("", html, count=1)
+
+    try:
+        root = lxml_html.fromstring(html)
+    except (etree.ParserError, ValueError) as e:
+        print(f"HTML parse error: {e}")
+        return _empty_page()
+
+    # Structured data first: JSON-LD lives in <script> tags.
+    json_ld = _json_ld_blocks(root)
+    microdata = _microdata_items(root)
+
+    etree.strip_elements(root, *DROP_TAGS, with_tail=False)
+    etree.strip_elements(root, etree.Comment, with_tail=False)
+
+    # ---------------------------
+    # LINKS
+    # ---------------------------
+    links = []
+    if base_url:
+        domain = urlparse(base_url).netloc
+        seen = set()
+
+        for href in root.xpath("//a/@href"):
+            link = urljoin(base_url, href.strip())
+            if link not in seen and urlparse(link).netloc == domain:
+                seen.add(link)
+                links.append(link)
+
+    # ---------------------------
+    # TITLE
+    # ---------------------------
+    title = None
+    title_tags = root.xpath("//h2")
+    if title_tags:
+        title = " ".join(title_tags[0].text_content().split()) or None
+
+    # ---------------------------
+    # DEADLINE (whole visible page, before pruning: it may sit in a
+    # header, footer or form, as extract_google_job_data allowed)
+    # ---------------------------
+    deadline = None
+    match = DATE_PATTERN.search(" ".join(" ".join(root.itertext()).split()))
+    if match:
+        deadline = match.group(0)
+
+    # ---------------------------
+    # TEXT (after pruning page chrome)
+    # ---------------------------
+    for element in root.xpath(PRUNE_XPATH):
+        if element.getparent() is not None:
+            element.drop_tree()
+
+    clean_text = " ".join(" ".join(root.itertext()).split())
+
+    return {
+        "clean_text": clean_text,
+        "links": links,
+        "title": title,
+        "deadline": deadline,
+        "json_ld": json_ld,
+        "microdata": microdata,
+    }
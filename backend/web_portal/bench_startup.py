@@ -0,0 +1,190 @@
+"""
+Import-time benchmark for the web portal (python -X importtime).
+
+Each round imports backend.web_portal.main in a fresh interpreter, which is
+what a uvicorn worker pays before it can serve its first request. The report
+groups the self time of every imported module by package (backend.* by
+subpackage) and also checks that no API client library is imported at
+startup: those belong behind the lazy factories in llm_gateway and
+youtube_module.
+
+    python -m backend.web_portal.bench_startup                  # run and print
+    python -m backend.web_portal.bench_startup --compare        # fail on regressions vs. the baseline
+    python -m backend.web_portal.bench_startup --save-baseline  # record a new baseline
+    python -m backend.web_portal.bench_startup --budget-ms 800  # fail above an absolute budget
+
+Timings depend on the machine: record the baseline on the machine that runs
+--compare (e.g. the deploy box), and re-record it after intended changes.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BASELINE_PATH = Path(__file__).resolve().parent / "startup_baseline.json"
+TARGET_MODULE = "backend.web_portal.main"
+DEFAULT_ROUNDS = 7
+# The total, or a package, regresses when its median is this much slower than
+# the baseline and at least MIN_COMPARED_MS slower (small packages are noisy).
+DEFAULT_THRESHOLD = 0.25
+MIN_COMPARED_MS = 5.0
+# Smaller packages are left out of the saved baseline.
+MIN_SAVED_MS = 1.0
+TOP_PACKAGES = 12
+# Client libraries that must only be imported when a client is first built.
+LAZY_ONLY_MODULES = ("openai", "googleapiclient", "httpx")
+
+
+def _package(module: str) -> str:
+    parts = module.split(".")
+    if parts[0] == "backend" and len(parts) > 1:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def import_profile() -> tuple[float, dict, set]:
+    """One fresh-interpreter import: (total ms, self ms per package, imported modules)."""
+
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET_MODULE}"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        sys.exit(f"Importing {TARGET_MODULE} failed:\n{completed.stderr[-2000:]}")
+
+    packages = defaultdict(float)
+    modules = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative_us, name = line[len("import time:"):].split("|", 2)
+        module = name.strip()
+        modules.add(module)
+        packages[_package(module)] += int(self_us) / 1000
+    return sum(packages.values()), dict(packages), modules
+
+
+def run_benchmark(rounds: int) -> dict:
+    import_profile()  # warm-up: filesystem caches and .pyc files
+    totals = []
+    per_package = defaultdict(list)
+    imported = set()
+    for _ in range(rounds):
+        total, packages, modules = import_profile()
+        totals.append(total)
+        for package, milliseconds in packages.items():
+            per_package[package].append(milliseconds)
+        imported |= modules
+
+    packages = {package: statistics.median(values) for package, values in per_package.items()}
+    return {
+        "total_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "stdev_ms": statistics.stdev(totals) if len(totals) > 1 else 0.0,
+        "rounds": rounds,
+        "packages": dict(sorted(packages.items(), key=lambda item: -item[1])),
+        "module_count": len(imported),
+        "lazy_only_imported": sorted(module for module in imported if module in LAZY_ONLY_MODULES),
+    }
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> list[str]:
+    """Prints the total and the larger packages against the baseline; returns the names that regressed."""
+
+    rows = [("total", baseline["total_ms"], result["total_ms"])]
+    for package, reference in baseline.get("packages", {}).items():
+        if reference >= MIN_COMPARED_MS:
+            rows.append((package, reference, result["packages"].get(package, 0.0)))
+    for package, current in result["packages"].items():
+        if package not in baseline.get("packages", {}) and current >= MIN_COMPARED_MS:
+            rows.append((package, 0.0, current))
+
+    regressions = []
+    print(f"\n{'import':<34}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, reference, current in rows:
+        if not reference:
+            print(f"{name:<34}{'-':>12}{current:>9.1f} ms{'new':>9}")
+            regressions.append(name)
+            continue
+        ratio = current / reference
+        flag = ""
+        if ratio > 1 + threshold and current - reference >= MIN_COMPARED_MS:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<34}{reference:>9.1f} ms{current:>9.1f} ms{(ratio - 1) * 100:>+8.0f}%{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="exit 1 if the import time regressed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--budget-ms", type=float, help="exit 1 if the median import takes longer")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.rounds)
+    print(
+        f"import {TARGET_MODULE}: median {result['total_ms']:.1f} ms, min {result['min_ms']:.1f} ms, "
+        f"stdev {result['stdev_ms']:.1f} ms over {result['rounds']} rounds ({result['module_count']} modules)"
+    )
+    print(f"\n{'package (self time)':<34}{'median':>12}")
+    for package, milliseconds in list(result["packages"].items())[:TOP_PACKAGES]:
+        print(f"{package:<34}{milliseconds:>9.1f} ms")
+
+    failed = False
+    if result["lazy_only_imported"]:
+        print(f"\nImported at startup, should be lazy: {', '.join(result['lazy_only_imported'])}")
+        failed = True
+
+    if args.save_baseline:
+        payload = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "total_ms": result["total_ms"],
+            "packages": {
+                package: milliseconds
+                for package, milliseconds in result["packages"].items()
+                if milliseconds >= MIN_SAVED_MS
+            },
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            sys.exit(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} import(s) regressed by more than {args.threshold:.0%} or are new.")
+            failed = True
+        else:
+            print("\nNo regressions.")
+
+    if args.budget_ms is not None:
+        if result["total_ms"] > args.budget_ms:
+            print(f"\nStartup import of {result['total_ms']:.1f} ms is over the {args.budget_ms:.0f} ms budget.")
+            failed = True
+        else:
+            print(f"\nWithin the {args.budget_ms:.0f} ms budget.")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
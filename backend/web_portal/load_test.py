@@ -0,0 +1,443 @@
+"""
+Load test for the portal: seeds a throwaway copy of the database, starts the
+portal in a subprocess with the LLM and YouTube replaced by local stubs, and
+drives the main routes from concurrent clients. Prints p50/p95/p99 latency
+per route and the overall throughput.
+
+    python -m backend.web_portal.load_test
+    python -m backend.web_portal.load_test --students 500 --concurrency 32 --duration 60
+
+opportunities.db is only read (copied); it is never written.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+
+from backend.roadmap_engine.storage import database
+
+# Relative weights of the simulated user actions.
+SCENARIO_WEIGHTS = {
+    "dashboard": 10,
+    "location_autocomplete": 6,
+    "task_toggle": 4,
+    "company_dashboard": 2,
+    "test_submit": 1,
+}
+DASHBOARD_SECTIONS = ["roadmap", "tasks", "tests", "doubtbot", "opportunities"]
+LOCATION_QUERIES = [
+    "countries?q=in",
+    "countries?q=united",
+    "states?country=India&q=ma",
+    "cities?country=India&state=Maharashtra&q=pu",
+    "cities?country=United%20States&state=California&q=san",
+]
+COMPANY_COOKIE_KEY = "company_session_id"
+SERVER_START_TIMEOUT_SECONDS = 60
+
+
+# --- Stubs (installed in the server process) --------------------------------
+
+def _stub_llm_content(messages: list[dict]) -> str:
+    text = " ".join(str(message.get("content", "")) for message in messages)
+    if "json" not in text.lower():
+        # Free-text callers (the playlist doubt chat).
+        return "Start with the definitions from the first videos, then work through one example by hand."
+
+    # One object with every key the JSON callers read: goal parsing,
+    # required skills, test questions and playlist explanations.
+    return json.dumps(
+        {
+            "target_company": None,
+            "target_role_family": "Software Engineering",
+            "confidence": 0.8,
+            "required_skills": ["Python", "SQL", "DSA", "Git", "System Design"],
+            "rationale": "Load test stub.",
+            "questions": [
+                {
+                    "topic": f"Topic {index % 4 + 1}",
+                    "difficulty": "basic" if index % 5 else "medium",
+                    "question": f"Stub question {index + 1}?",
+                    "options": ["A", "B", "C", "D"],
+                    "correct_option_index": index % 4,
+                }
+                for index in range(15)
+            ],
+            "topic_overview": "A structured walkthrough of the skill.",
+            "learning_experience": "Short lectures followed by practice problems.",
+            "topics_covered_summary": "Fundamentals and common interview topics.",
+        }
+    )
+
+
+def _stub_llm_response(kwargs: dict):
+    content = _stub_llm_content(kwargs.get("messages", []))
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=400, completion_tokens=len(content) // 4),
+    )
+    return SimpleNamespace(headers={}, parse=lambda: response)
+
+
+class _StubCompletions:
+    def __init__(self, latency: float):
+        self.latency = latency
+        # llm_gateway calls client.chat.completions.with_raw_response.create().
+        self.with_raw_response = self
+
+    def create(self, **kwargs):
+        time.sleep(self.latency)
+        return _stub_llm_response(kwargs)
+
+
+def _stub_youtube_client(latency: float) -> types.ModuleType:
+    def playlists(query: str) -> list[dict]:
+        key = "".join(char for char in query.lower() if char.isalnum()) or "skill"
+        return [
+            {
+                "playlist_id": f"stub-{key}-{rank}",
+                "title": f"{query} Full Course {rank}",
+                "description": f"Learn {query} from scratch.",
+                "channel_title": f"Stub Channel {rank}",
+                "channel_id": f"stub-channel-{rank}",
+            }
+            for rank in range(1, 6)
+        ]
+
+    def videos(playlist_id: str, max_videos: int = 200) -> list[str]:
+        return [f"{playlist_id}-v{number}" for number in range(min(24, max_videos))]
+
+    def titles(video_ids: list) -> dict:
+        return {video_id: f"Lesson {video_id.rsplit('-v', 1)[-1]}" for video_id in video_ids}
+
+    def statistics(video_ids: list) -> dict:
+        return {
+            video_id: {"views": 1000 + len(video_id) * 37, "likes": 50 + len(video_id), "comments": 5}
+            for video_id in video_ids
+        }
+
+    functions = {
+        "search_playlists": playlists,
+        "get_videos_in_playlist": videos,
+        "get_video_titles": titles,
+        "get_video_statistics": statistics,
+    }
+
+    module = types.ModuleType("backend.youtube_module.youtube_client")
+    for name, function in functions.items():
+
+        def call(*args, _function=function, **kwargs):
+            time.sleep(latency)
+            return _function(*args, **kwargs)
+
+        setattr(module, name, call)
+    return module
+
+
+def install_stubs(*, llm_latency: float, youtube_latency: float, output_dir: Path) -> None:
+    """
+    Replaces the LLM client and the YouTube client with local stubs that
+    answer after a fixed delay. The LLM stub sits behind llm_gateway, so its
+    limiter and metrics still run. Call before the app handles requests.
+    """
+
+    from backend import llm_gateway
+
+    os.environ["GROQ_API_KEY"] = "loadtest-stub"
+    llm_gateway._client = SimpleNamespace(chat=SimpleNamespace(completions=_StubCompletions(llm_latency)))
+
+    youtube_client = _stub_youtube_client(youtube_latency)
+    sys.modules[youtube_client.__name__] = youtube_client
+
+    # Explanations are cached as files; keep the stub ones out of the repo.
+    from backend.youtube_module.llm_explainer import explain_playlists
+
+    explain_playlists.OUTPUT_DIR = str(output_dir)
+
+
+def serve(args) -> None:
+    import uvicorn
+
+    database.DB_PATH = args.db
+    install_stubs(
+        llm_latency=args.llm_latency_ms / 1000,
+        youtube_latency=args.youtube_latency_ms / 1000,
+        output_dir=args.db.parent / "explanations",
+    )
+
+    from backend.web_portal.main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+# --- Load driver ---------------------------------------------------------------
+
+def _is_error(response: httpx.Response) -> bool:
+    if response.status_code >= 400:
+        return True
+    # Handled failures redirect back with ?error=...
+    return response.is_redirect and "error=" in response.headers.get("location", "")
+
+
+async def _dashboard(client: httpx.AsyncClient, rng: random.Random, targets: dict):
+    student_id = rng.choice(targets["student_ids"])
+    section = rng.choice(DASHBOARD_SECTIONS)
+    return await client.get(f"/students/{student_id}/dashboard?section={section}")
+
+
+async def _location_autocomplete(client: httpx.AsyncClient, rng: random.Random, targets: dict):
+    student_id = rng.choice(targets["student_ids"])
+    return await client.get(f"/students/{student_id}/locations/{rng.choice(LOCATION_QUERIES)}")
+
+
+async def _task_toggle(client: httpx.AsyncClient, rng: random.Random, targets: dict):
+    if not targets["task_segments"]:
+        return None
+    student_id, segment = rng.choice(targets["task_segments"])
+    day_index = rng.randint(1, segment["day_count"])
+    return await client.post(
+        f"/students/{student_id}/tasks/{segment['segment_id']}-{day_index}/completion",
+        data={"is_completed": rng.choice(["0", "1"])},
+    )
+
+
+async def _company_dashboard(client: httpx.AsyncClient, rng: random.Random, targets: dict):
+    if not targets["company_jobs"]:
+        return None
+    company_id, job_id = rng.choice(targets["company_jobs"])
+    return await client.get(
+        f"/company/dashboard?job_id={job_id}",
+        cookies={COMPANY_COOKIE_KEY: str(company_id)},
+    )
+
+
+async def _test_submit(client: httpx.AsyncClient, rng: random.Random, targets: dict):
+    # Each open test can be submitted once; the scenario stops when they run out.
+    if not targets["pending_assessments"]:
+        return None
+    student_id, pending = targets["pending_assessments"].pop()
+    answers = {f"answer_{index}": str(rng.randint(0, 3)) for index in range(pending["question_count"])}
+    return await client.post(
+        f"/students/{student_id}/skills/tests/{pending['assessment_id']}/submit",
+        data=answers,
+    )
+
+
+SCENARIOS = {
+    "dashboard": _dashboard,
+    "location_autocomplete": _location_autocomplete,
+    "task_toggle": _task_toggle,
+    "company_dashboard": _company_dashboard,
+    "test_submit": _test_submit,
+}
+
+
+def _targets(seeded: dict) -> dict:
+    students = seeded["students"]
+    return {
+        "student_ids": [row["student_id"] for row in students],
+        "task_segments": [(row["student_id"], segment) for row in students for segment in row["task_segments"]],
+        "pending_assessments": [
+            (row["student_id"], row["pending_assessment"]) for row in students if row["pending_assessment"]
+        ],
+        "company_jobs": [(row["company_id"], job_id) for row in seeded["companies"] for job_id in row["job_ids"]],
+    }
+
+
+async def _worker(client, rng, targets, deadline, latencies, errors) -> None:
+    names = list(SCENARIO_WEIGHTS)
+    weights = [SCENARIO_WEIGHTS[name] for name in names]
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = await SCENARIOS[name](client, rng, targets)
+        except httpx.HTTPError:
+            latencies[name].append(time.perf_counter() - start)
+            errors[name] += 1
+            continue
+        if response is None:
+            continue
+        latencies[name].append(time.perf_counter() - start)
+        if _is_error(response):
+            errors[name] += 1
+
+
+async def drive(base_url: str, targets: dict, *, duration: float, concurrency: int, seed: int) -> dict:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.monotonic()
+        deadline = started + duration
+        await asyncio.gather(
+            *(
+                _worker(client, random.Random(seed + number), targets, deadline, latencies, errors)
+                for number in range(concurrency)
+            )
+        )
+        elapsed = time.monotonic() - started
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed}
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    # Nearest-rank percentile.
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(percent / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def report(result: dict) -> None:
+    print(f"{'route':<24}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+    total = 0
+    all_latencies: list[float] = []
+    for name in SCENARIO_WEIGHTS:
+        values = sorted(result["latencies"].get(name, []))
+        if not values:
+            continue
+        total += len(values)
+        all_latencies.extend(values)
+        print(
+            f"{name:<24}{len(values):>10}{result['errors'].get(name, 0):>8}"
+            f"{_percentile(values, 50) * 1000:>10.1f}{_percentile(values, 95) * 1000:>10.1f}"
+            f"{_percentile(values, 99) * 1000:>10.1f}{len(values) / result['elapsed']:>9.1f}"
+        )
+
+    all_latencies.sort()
+    print(
+        f"{'all':<24}{total:>10}{sum(result['errors'].values()):>8}"
+        f"{_percentile(all_latencies, 50) * 1000:>10.1f}{_percentile(all_latencies, 95) * 1000:>10.1f}"
+        f"{_percentile(all_latencies, 99) * 1000:>10.1f}{total / result['elapsed']:>9.1f}"
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(base_url: str, server: subprocess.Popen, log_path: Path) -> None:
+    deadline = time.monotonic() + SERVER_START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Portal exited during startup; see {log_path}")
+        try:
+            if httpx.get(f"{base_url}/onboarding", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"Portal did not start within {SERVER_START_TIMEOUT_SECONDS}s; see {log_path}")
+
+
+def run(args) -> None:
+    from backend.roadmap_engine import seed_data
+
+    work_dir = Path(tempfile.mkdtemp(prefix="portal-load-"))
+    db_path = work_dir / "load.db"
+    shutil.copy(args.source_db, db_path)
+
+    database.DB_PATH = db_path
+    started = time.perf_counter()
+    seeded = seed_data.seed(
+        students=args.students,
+        companies=args.companies,
+        opportunities=args.opportunities,
+        test_ready_ratio=args.test_ready,
+        seed=args.seed,
+    )
+    print(f"Seeded {len(seeded['students'])} student(s) in {time.perf_counter() - started:.1f}s")
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    log_path = work_dir / "server.log"
+    with log_path.open("w") as log:
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "backend.web_portal.load_test",
+                "serve",
+                "--db",
+                str(db_path),
+                "--port",
+                str(port),
+                "--llm-latency-ms",
+                str(args.llm_latency_ms),
+                "--youtube-latency-ms",
+                str(args.youtube_latency_ms),
+            ],
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    try:
+        _wait_until_ready(base_url, server, log_path)
+        print(f"Driving {base_url} with {args.concurrency} client(s) for {args.duration:.0f}s\n")
+        result = asyncio.run(
+            drive(base_url, _targets(seeded), duration=args.duration, concurrency=args.concurrency, seed=args.seed)
+        )
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    report(result)
+    if args.keep:
+        print(f"\nDatabase and server log kept in {work_dir}")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main() -> None:
+    stubs = argparse.ArgumentParser(add_help=False)
+    stubs.add_argument("--llm-latency-ms", type=float, default=400)
+    stubs.add_argument("--youtube-latency-ms", type=float, default=150)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", parents=[stubs], help="seed, start the portal and drive it (default)")
+    run_parser.add_argument("--source-db", type=Path, default=database.DB_PATH)
+    run_parser.add_argument("--students", type=int, default=200)
+    run_parser.add_argument("--companies", type=int, default=10)
+    run_parser.add_argument("--opportunities", type=int, default=500)
+    run_parser.add_argument("--test-ready", type=float, default=0.3)
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--duration", type=float, default=30)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--keep", action="store_true", help="keep the seeded database and server log")
+
+    serve_parser = commands.add_parser("serve", parents=[stubs], help="run the portal with stubs (started by `run`)")
+    serve_parser.add_argument("--db", type=Path, required=True)
+    serve_parser.add_argument("--port", type=int, required=True)
+
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in {"run", "serve", "-h", "--help"}:
+        argv = ["run", *argv]
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
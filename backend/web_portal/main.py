@@ -1,17 +1,36 @@
+import gc
+import time
+
+# Importing fastapi, pydantic and the routers allocates enough long-lived
+# objects to set off ~100 collections (~50 ms of worker boot) that find no
+# garbage. Collection resumes at the end of this module.
+_gc_was_enabled = gc.isenabled()
+gc.disable()
+
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
 
-from backend.roadmap_engine.storage.schema import init_roadmap_schema
-from backend.web_portal.routers.pages import router as pages_router
+from backend import metrics
+from backend.roadmap_engine.services import job_queue_service
+from backend.roadmap_engine.storage import database
+from backend.roadmap_engine.storage.migrations import apply_pending_migrations
+from backend.web_portal import profiler, static_assets
+from backend.web_portal.routers.metrics import router as metrics_router
+from backend.web_portal.routers.pages import render_build_id, router as pages_router
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    init_roadmap_schema()
+    apply_pending_migrations()
+    static_assets.build_manifest(STATIC_DIR)
+    render_build_id()  # hashed once here rather than on the first dashboard request
+    job_queue_service.start_worker()
     yield
+    job_queue_service.stop_worker()
 
 
 app = FastAPI(
@@ -19,9 +38,101 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Pages, fragments and JSON above this size go out gzipped; precompressed
+# static files already carry Content-Encoding and pass through untouched.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+REQUEST_LATENCY = metrics.histogram(
+    "portal_http_request_duration_seconds",
+    "Time to the response start, by route template.",
+    ("method", "route"),
+)
+REQUESTS = metrics.counter(
+    "portal_http_requests_total",
+    "Responses by route template and status code.",
+    ("method", "route", "status"),
+)
+REQUEST_STATEMENTS = metrics.histogram(
+    "portal_db_statements_per_request",
+    "SQL statements (including BEGIN/COMMIT) run while handling a request; only with SQL_INSTRUMENTATION.",
+    ("method", "route"),
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+
+def _report_sql(request: Request, response, stats: database.QueryStats) -> None:
+    """Query count and time in headers; likely N+1 queries in the log."""
+
+    sql_ms = stats.total_seconds * 1000
+    response.headers["X-SQL-Queries"] = str(stats.query_count)
+    response.headers["X-SQL-Time-Ms"] = f"{sql_ms:.1f}"
+    timing = f'sql;dur={sql_ms:.1f};desc="{stats.query_count} queries"'
+    existing = response.headers.get("Server-Timing")
+    response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+    repeated = stats.repeated_statements()
+    for shape, count, seconds in repeated:
+        print(
+            f"Possible N+1 in {request.method} {request.url.path}: "
+            f"{count}x in {seconds * 1000:.1f} ms: {shape[:300]}"
+        )
+    if repeated:
+        for shape, calls, seconds in stats.slowest_statements():
+            print(f"  slowest: {seconds * 1000:.1f} ms over {calls} call(s): {shape[:300]}")
+
+
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    # Statements are only traced with SQL_INSTRUMENTATION; otherwise
+    # connections carry no per-statement callback.
+    if database.SQL_INSTRUMENTATION:
+        with database.track_queries() as stats:
+            response = await call_next(request)
+    else:
+        stats = None
+        response = await call_next(request)
+    elapsed = time.perf_counter() - start
+
+    # The route template keeps label values bounded ("/students/{student_id}/dashboard").
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    REQUEST_LATENCY.observe(elapsed, method=request.method, route=route)
+    REQUESTS.inc(method=request.method, route=route, status=response.status_code)
+
+    if stats is not None:
+        REQUEST_STATEMENTS.observe(stats.query_count, method=request.method, route=route)
+        _report_sql(request, response, stats)
+    return response
+
+
+if profiler.ENABLED:
+
+    @app.middleware("http")
+    async def profile_slow_requests(request: Request, call_next):
+        """Saves a sampled profile of requests slower than PROFILE_THRESHOLD_MS."""
+
+        started = profiler.request_started()
+        try:
+            response = await call_next(request)
+        finally:
+            finished = profiler.request_finished()
+
+        if finished - started >= profiler.THRESHOLD_SECONDS:
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            await run_in_threadpool(profiler.save_profile, request.method, route, started, finished)
+        return response
+
+
 app.include_router(pages_router)
+app.include_router(metrics_router)
 
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "static"
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+app.mount("/static", static_assets.FingerprintedStaticFiles(directory=STATIC_DIR), name="static")
 
+# Move everything built at import into the permanent generation, so later
+# collections skip it (and forked workers don't touch its pages).
+gc.freeze()
+if _gc_was_enabled:
+    gc.enable()
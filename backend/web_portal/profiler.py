@@ -0,0 +1,150 @@
+"""
+Opt-in sampling profiler for slow requests (PROFILE_SLOW_REQUESTS=1).
+
+While requests are in flight, a daemon thread samples the stack of every
+busy thread (sys._current_frames) every PROFILE_INTERVAL_MS. When a request
+takes longer than PROFILE_THRESHOLD_MS, the samples taken during it are
+written as collapsed stacks ("frame;frame;frame count", the input of
+flamegraph.pl, speedscope and similar) to PROFILE_DIR/<route>/.
+
+Samples are not tied to a request: concurrent requests show up in each
+other's profiles, so profiles are clearest when the portal is quiet.
+Overhead is bounded by the sampling interval and by PROFILE_MAX_PER_MINUTE:
+once that many profiles were saved in the last minute, sampling pauses
+until the budget frees up.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+ENABLED = os.getenv("PROFILE_SLOW_REQUESTS", "") == "1"
+THRESHOLD_SECONDS = float(os.getenv("PROFILE_THRESHOLD_MS", "500")) / 1000
+INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_MS", "10")) / 1000
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "profiles"))
+MAX_PROFILES_PER_MINUTE = int(os.getenv("PROFILE_MAX_PER_MINUTE", "6"))
+# About a minute of samples for 30 busy threads at the default interval.
+MAX_BUFFERED_SAMPLES = 200_000
+
+# Top frames of threads that are waiting for work, not doing it.
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    # ThreadPoolExecutor workers block in SimpleQueue.get, which is C code,
+    # so the idle worker's top Python frame is _worker itself.
+    ("thread.py", "_worker"),
+}
+_ROUTE_SLUG = re.compile(r"[^A-Za-z0-9_.-]+")
+
+_lock = threading.Lock()
+_wake = threading.Condition(_lock)
+_active_requests = 0
+_sampler: threading.Thread | None = None
+# (monotonic time, stack tuple root-first)
+_samples: deque = deque(maxlen=MAX_BUFFERED_SAMPLES)
+_saved_at: deque = deque()
+_frame_labels: dict = {}
+
+
+def _frame_label(code) -> str:
+    label = _frame_labels.get(code)
+    if label is None:
+        path = Path(code.co_filename)
+        label = _frame_labels[code] = f"{code.co_name} ({path.parent.name}/{path.name}:{code.co_firstlineno})"
+    return label
+
+
+def _budget_left(now: float) -> bool:
+    while _saved_at and now - _saved_at[0] > 60:
+        _saved_at.popleft()
+    return len(_saved_at) < MAX_PROFILES_PER_MINUTE
+
+
+def _take_sample(own_ident: int) -> None:
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    now = time.monotonic()
+    taken = []
+    for ident, frame in sys._current_frames().items():
+        if ident == own_ident:
+            continue
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+            continue
+
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        stack.append(f"thread:{names.get(ident, ident)}")
+        stack.reverse()
+        taken.append((now, tuple(stack)))
+
+    with _lock:
+        _samples.extend(taken)
+
+
+def _run_sampler() -> None:
+    own_ident = threading.get_ident()
+    while True:
+        with _wake:
+            while not _active_requests or not _budget_left(time.monotonic()):
+                _wake.wait(timeout=1.0)
+        _take_sample(own_ident)
+        time.sleep(INTERVAL_SECONDS)
+
+
+def request_started() -> float:
+    """Marks a request in flight (starting the sampler if needed); returns its start time."""
+
+    global _active_requests, _sampler
+    with _wake:
+        _active_requests += 1
+        if _sampler is None:
+            _sampler = threading.Thread(target=_run_sampler, name="slow-request-profiler", daemon=True)
+            _sampler.start()
+        _wake.notify()
+    return time.monotonic()
+
+
+def request_finished() -> float:
+    global _active_requests
+    with _lock:
+        _active_requests -= 1
+    return time.monotonic()
+
+
+def save_profile(method: str, route: str, started: float, finished: float) -> Path | None:
+    """
+    Writes the request's samples as collapsed stacks. Returns the file, or
+    None when the rate limit is used up or nothing was sampled.
+    """
+
+    with _lock:
+        if not _budget_left(finished):
+            return None
+        stacks = Counter(stack for taken_at, stack in _samples if started <= taken_at <= finished)
+        if not stacks:
+            return None
+        _saved_at.append(finished)
+
+    elapsed_ms = (finished - started) * 1000
+    slug = _ROUTE_SLUG.sub("_", f"{method} {route}").strip("_") or "root"
+    stamp = datetime.now(tz=timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    path = PROFILE_DIR / slug / f"{stamp}-{elapsed_ms:.0f}ms.collapsed"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks.most_common()),
+        encoding="utf-8",
+    )
+    print(
+        f"Profiled slow {method} {route}: {elapsed_ms:.0f} ms, "
+        f"{sum(stacks.values())} sample(s) -> {path}"
+    )
+    return path
@@ -0,0 +1,45 @@
+import threading
+from collections import OrderedDict
+
+from backend import metrics
+
+# Rendered dashboard HTML, keyed by (student, kind, section, data version,
+# ...). A write bumps the student's version, so stale entries are never
+# looked up again and simply age out of the LRU. Bounded by the total size
+# of the bodies, since a full dashboard is far larger than a fragment.
+MAX_BYTES = 32 * 1024 * 1024
+
+_lock = threading.Lock()
+_entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+_total_bytes = 0
+
+
+def get(key: tuple) -> bytes | None:
+    with _lock:
+        body = _entries.get(key)
+        if body is not None:
+            _entries.move_to_end(key)
+    metrics.record_cache("dashboard_render", body is not None)
+    return body
+
+
+def put(key: tuple, body: bytes) -> None:
+    global _total_bytes
+    if len(body) > MAX_BYTES:
+        return
+    with _lock:
+        previous = _entries.pop(key, None)
+        if previous is not None:
+            _total_bytes -= len(previous)
+        _entries[key] = body
+        _total_bytes += len(body)
+        while _total_bytes > MAX_BYTES:
+            _, evicted = _entries.popitem(last=False)
+            _total_bytes -= len(evicted)
+
+
+def clear() -> None:
+    global _total_bytes
+    with _lock:
+        _entries.clear()
+        _total_bytes = 0
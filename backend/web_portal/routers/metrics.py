@@ -0,0 +1,51 @@
+import hmac
+import os
+import re
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response
+
+from backend import metrics
+
+
+router = APIRouter()
+
+# Pushed metrics are kept in memory until the job pushes again.
+MAX_PUSH_BYTES = 1024 * 1024
+_JOB_NAME = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+# With a token set, pushes must send "Authorization: Bearer <token>";
+# without one they are only accepted from the same host.
+PUSH_TOKEN = os.getenv("METRICS_PUSH_TOKEN", "")
+_LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+
+def _push_allowed(request: Request) -> bool:
+    if PUSH_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(token.strip(), PUSH_TOKEN)
+    return request.client is not None and request.client.host in _LOOPBACK_HOSTS
+
+
+@router.get("/metrics")
+def metrics_page() -> Response:
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@router.post("/metrics/push/{job}")
+async def push_metrics(job: str, request: Request) -> PlainTextResponse:
+    """Accepts the text-format metrics of another process (e.g. the crawler) and serves them with a job label."""
+
+    if not _push_allowed(request):
+        raise HTTPException(status_code=403, detail="Metrics push not allowed.")
+    if not _JOB_NAME.match(job):
+        raise HTTPException(status_code=400, detail="Invalid job name.")
+
+    body = await request.body()
+    if len(body) > MAX_PUSH_BYTES:
+        raise HTTPException(status_code=413, detail="Metrics payload too large.")
+
+    try:
+        metrics.store_pushed(job, body.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    return PlainTextResponse("ok")
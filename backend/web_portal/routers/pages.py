@@ -1,10 +1,14 @@
+from functools import cache, partial
 from pathlib import Path
+import hashlib
 import json
-import time
+import os
 from urllib.parse import quote_plus
 
+import anyio
 from fastapi import APIRouter, Form, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
 
 from backend.roadmap_engine.constants import (
@@ -25,12 +29,26 @@ from backend.roadmap_engine.services import (
 )
 from backend.roadmap_engine.services.skill_normalizer import display_skill
 from backend.roadmap_engine.storage import students_repo
+from backend.roadmap_engine.utils import utc_today
+from backend.web_portal import render_cache, static_assets
 
 
 router = APIRouter()
 
 TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "templates"
+# Templates and the code that builds their context; page ETags follow both.
+RENDER_SOURCE_PATTERNS = (
+    (TEMPLATES_DIR, "*.html"),
+    (Path(__file__).resolve().parents[1], "*.py"),
+    (Path(__file__).resolve().parents[2] / "roadmap_engine", "*.py"),
+)
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+templates.env.globals["static_url"] = static_assets.static_url
+# Handlers that wait on Groq or YouTube run in threads bounded by their own
+# limiter, so slow upstream calls cannot take every worker of the shared
+# threadpool that the SQLite-only handlers use.
+UPSTREAM_THREADS = int(os.getenv("PORTAL_UPSTREAM_THREADS", "16"))
+_upstream_limiter = anyio.CapacityLimiter(UPSTREAM_THREADS)
 COMPANY_COOKIE_KEY = "company_session_id"
 COMPANY_DRAFT_COOKIE_KEY = "company_job_draft"
 
@@ -41,6 +59,9 @@ ALLOWED_DASHBOARD_SECTIONS = {
     "doubtbot",
     "opportunities",
 }
+# Browsers keep the page but revalidate it with If-None-Match on every visit.
+DASHBOARD_CACHE_CONTROL = "private, no-cache"
+
 ALLOWED_COMPANY_DASHBOARD_SECTIONS = {
     "dashboard",
     "eligible",
@@ -48,9 +69,10 @@ ALLOWED_COMPANY_DASHBOARD_SECTIONS = {
 }
 
 
-def _asset_version() -> str:
-    # Force fresh CSS fetch on each request across devices/browsers.
-    return str(int(time.time()))
+async def _run_upstream(function, *args, **kwargs):
+    """run_in_threadpool for calls that may wait on the LLM or YouTube."""
+
+    return await anyio.to_thread.run_sync(partial(function, *args, **kwargs), limiter=_upstream_limiter)
 
 
 def _normalize_dashboard_section(section: str, default: str = "roadmap") -> str:
@@ -67,6 +89,64 @@ def _normalize_company_section(section: str, default: str = "dashboard") -> str:
     return default
 
 
+def _server_timing(dashboard: dict) -> str:
+    # Per-section load times, visible in the browser devtools network panel.
+    return ", ".join(
+        f"{name};dur={duration}"
+        for name, duration in dashboard.get("section_timings_ms", {}).items()
+    )
+
+
+@cache
+def render_build_id() -> str:
+    """Content hash of the templates and the portal and roadmap code, taken once per process."""
+
+    digest = hashlib.sha256()
+    for directory, pattern in RENDER_SOURCE_PATTERNS:
+        for path in sorted(directory.rglob(pattern)):
+            digest.update(str(path.relative_to(directory)).encode("utf-8"))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def _render_key(kind: str, student_id: int, section: str, version: int) -> tuple:
+    # Pages show "today" and hashed asset URLs, and a deploy can change how the
+    # same data renders, so all three are part of the key.
+    return (
+        student_id,
+        kind,
+        section,
+        version,
+        utc_today().isoformat(),
+        static_assets.build_id(),
+        render_build_id(),
+    )
+
+
+def _dashboard_etag(request: Request, render_key: tuple) -> str:
+    # Weak: the same data renders to equivalent, not byte-identical, HTML.
+    key = "|".join([*map(str, render_key), str(request.url.query)])
+    return f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()}"'
+
+
+# Renders showing these playlist states change without a data version bump:
+# a later load queues the job (or its retry) that a cached copy would skip.
+TRANSIENT_PLAYLIST_STATUSES = {"preparing", "failed"}
+
+
+def _is_cacheable_render(dashboard: dict) -> bool:
+    """False for degraded renders and for ones waiting on playlist suggestions."""
+
+    if dashboard.get("degraded_sections"):
+        return False
+    return dashboard.get("playlist_recommendation_status") not in TRANSIENT_PLAYLIST_STATUSES
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    candidates = [item.strip() for item in request.headers.get("if-none-match", "").split(",")]
+    return etag in candidates or "*" in candidates
+
+
 def _student_or_404(student_id: int) -> dict:
     student = students_repo.get_student(student_id)
     if student is None:
@@ -170,7 +250,6 @@ def onboarding_page(request: Request, error: str = "") -> HTMLResponse:
         "onboarding.html",
         {
             "request": request,
-            "asset_version": _asset_version(),
             "error": error,
             "branch_options": BRANCH_OPTIONS,
             "year_options": YEAR_OPTIONS,
@@ -182,7 +261,7 @@ def onboarding_page(request: Request, error: str = "") -> HTMLResponse:
 
 
 @router.post("/onboarding")
-def onboarding_submit(
+async def onboarding_submit(
     name: str = Form(...),
     branch: str = Form(...),
     current_year: int = Form(...),
@@ -195,7 +274,8 @@ def onboarding_submit(
     target_duration_months: int = Form(...),
 ) -> RedirectResponse:
     try:
-        result = onboarding_service.create_student_goal_plan(
+        result = await _run_upstream(
+            onboarding_service.create_student_goal_plan,
             name=name,
             branch=branch,
             current_year=current_year,
@@ -208,7 +288,7 @@ def onboarding_submit(
             target_duration_months=target_duration_months,
         )
         student_id = result["student"]["id"]
-        matching_service.refresh_opportunity_matches(student_id)
+        await run_in_threadpool(matching_service.refresh_opportunity_matches, student_id)
     except ValueError as error:
         escaped = quote_plus(str(error))
         return RedirectResponse(f"/onboarding?error={escaped}", status_code=303)
@@ -226,7 +306,6 @@ def company_auth_page(request: Request, error: str = "") -> HTMLResponse:
         "company_auth.html",
         {
             "request": request,
-            "asset_version": _asset_version(),
             "error": error,
         },
     )
@@ -242,7 +321,6 @@ def company_signup_page(request: Request, error: str = "") -> HTMLResponse:
         "company_signup.html",
         {
             "request": request,
-            "asset_version": _asset_version(),
             "error": error,
         },
     )
@@ -325,7 +403,6 @@ def company_job_step1_page(request: Request, error: str = "") -> HTMLResponse:
         "company_job_step1.html",
         {
             "request": request,
-            "asset_version": _asset_version(),
             "error": error,
             "company": company,
             "predefined_skills": PREDEFINED_SKILLS,
@@ -392,7 +469,6 @@ def company_job_step2_page(request: Request, error: str = "") -> HTMLResponse:
         "company_job_step2.html",
         {
             "request": request,
-            "asset_version": _asset_version(),
             "error": error,
             "company": company,
             "draft": draft,
@@ -468,7 +544,6 @@ def company_dashboard_page(
         "company_dashboard.html",
         {
             "request": request,
-            "asset_version": _asset_version(),
             "company": company,
             "company_dashboard": dashboard,
             "active_company_section": active_company_section,
@@ -535,26 +610,40 @@ def manual_replan(student_id: int) -> RedirectResponse:
 
 
 @router.get("/students/{student_id}/dashboard", response_class=HTMLResponse)
-def dashboard_page(
+async def dashboard_page(
     request: Request,
     student_id: int,
     error: str = "",
     section: str = "roadmap",
 ) -> HTMLResponse:
-    student = _student_or_404(student_id)
     active_section = _normalize_dashboard_section(section, "roadmap")
 
+    # An unchanged dashboard is answered from one version lookup, before any
+    # section loads: 304 when the browser has it, else the cached render.
+    version = await run_in_threadpool(dashboard_service.get_data_version, student_id)
+    render_key = _render_key("page", student_id, active_section, version)
+    etag = _dashboard_etag(request, render_key)
+    headers = {"ETag": etag, "Cache-Control": DASHBOARD_CACHE_CONTROL}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    # Pages carrying an error banner are one-offs and are not cached.
+    cacheable = not error
+    if cacheable:
+        body = render_cache.get(render_key)
+        if body is not None:
+            return HTMLResponse(body, headers=headers)
+
+    student = await run_in_threadpool(_student_or_404, student_id)
     try:
-        dashboard = dashboard_service.get_dashboard(student_id)
+        dashboard = await run_in_threadpool(dashboard_service.get_dashboard, student_id, [active_section])
     except ValueError as exc:
         escaped = quote_plus(str(exc))
         return RedirectResponse(url=f"/onboarding?error={escaped}", status_code=303)
 
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "dashboard.html",
         {
             "request": request,
-            "asset_version": _asset_version(),
             "student": student,
             "dashboard": dashboard,
             "chatbot_context": dashboard.get("chatbot"),
@@ -562,6 +651,59 @@ def dashboard_page(
             "active_section": active_section,
         },
     )
+    response.headers["Server-Timing"] = _server_timing(dashboard)
+    response.headers["Cache-Control"] = DASHBOARD_CACHE_CONTROL
+    if _is_cacheable_render(dashboard):
+        # The ETag is that of the version read before loading. If a write
+        # happened meanwhile (loading sections can create match alerts), the
+        # next request sees a newer version and re-renders.
+        response.headers["ETag"] = etag
+        if cacheable and await run_in_threadpool(dashboard_service.get_data_version, student_id) == version:
+            render_cache.put(render_key, response.body)
+    return response
+
+
+@router.get("/students/{student_id}/dashboard/{section}", response_class=HTMLResponse)
+def dashboard_section_fragment(request: Request, student_id: int, section: str) -> HTMLResponse:
+    if section not in ALLOWED_DASHBOARD_SECTIONS:
+        raise HTTPException(status_code=404, detail="Dashboard section not found.")
+
+    version = dashboard_service.get_data_version(student_id)
+    render_key = _render_key("fragment", student_id, section, version)
+    body = render_cache.get(render_key)
+    if body is not None:
+        return HTMLResponse(body)
+
+    student = _student_or_404(student_id)
+    try:
+        dashboard = dashboard_service.get_dashboard_section(student_id, section)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+    response = templates.TemplateResponse(
+        f"partials/dashboard_{section}.html",
+        {
+            "request": request,
+            "student": student,
+            "dashboard": dashboard,
+            "error": "",
+            "active_section": section,
+        },
+    )
+    # As for the full page: stored only if no write happened while rendering.
+    if _is_cacheable_render(dashboard) and dashboard_service.get_data_version(student_id) == version:
+        render_cache.put(render_key, response.body)
+    return response
+
+
+@router.get("/students/{student_id}/playlists/status", response_class=JSONResponse)
+def playlist_recommendation_status(student_id: int) -> JSONResponse:
+    _student_or_404(student_id)
+    try:
+        status = dashboard_service.get_playlist_status(student_id)
+    except ValueError as error:
+        return JSONResponse({"status": "failed", "error": str(error)}, status_code=400)
+    return JSONResponse(status)
 
 
 @router.get("/students/{student_id}/locations/countries", response_class=JSONResponse)
@@ -608,7 +750,7 @@ def city_location_suggestions(
 @router.post("/students/{student_id}/tasks/{task_id}/completion")
 def update_task_completion(
     student_id: int,
-    task_id: int,
+    task_id: str,
     is_completed: int = Form(...),
     section: str = "tasks",
 ) -> RedirectResponse:
@@ -714,16 +856,16 @@ def select_playlist(
 
 
 @router.post("/students/{student_id}/chat/send")
-def chatbot_send(
+async def chatbot_send(
     student_id: int,
     question: str = Form(...),
     section: str = "doubtbot",
 ) -> RedirectResponse:
-    _student_or_404(student_id)
+    await run_in_threadpool(_student_or_404, student_id)
     active_section = _normalize_dashboard_section(section, "doubtbot")
     chat_anchor = "doubtbot-widget"
     try:
-        chatbot_service.ask_question(student_id, question)
+        await _run_upstream(chatbot_service.ask_question, student_id, question)
     except ValueError as error:
         escaped = quote_plus(str(error))
         return RedirectResponse(
@@ -738,10 +880,11 @@ def chatbot_send(
 
 
 @router.get("/students/{student_id}/skills/{goal_skill_id}/test", response_class=HTMLResponse)
-def skill_test_page(request: Request, student_id: int, goal_skill_id: int) -> HTMLResponse:
-    student = _student_or_404(student_id)
+async def skill_test_page(request: Request, student_id: int, goal_skill_id: int) -> HTMLResponse:
+    student = await run_in_threadpool(_student_or_404, student_id)
     try:
-        assessment = assessment_service.generate_assessment(student_id, goal_skill_id)
+        # Usually served from the question bank, but a bank miss generates inline.
+        assessment = await _run_upstream(assessment_service.generate_assessment, student_id, goal_skill_id)
     except ValueError as error:
         escaped = quote_plus(str(error))
         return RedirectResponse(
@@ -750,7 +893,7 @@ def skill_test_page(request: Request, student_id: int, goal_skill_id: int) -> HT
         )
 
     try:
-        chatbot_context = chatbot_service.get_chat_panel(student_id)
+        chatbot_context = await run_in_threadpool(chatbot_service.get_chat_panel, student_id)
     except ValueError:
         chatbot_context = None
 
@@ -758,7 +901,6 @@ def skill_test_page(request: Request, student_id: int, goal_skill_id: int) -> HT
         "skill_test.html",
         {
             "request": request,
-            "asset_version": _asset_version(),
             "student": student,
             "assessment": assessment,
             "show_results": bool(assessment.get("submitted_at")),
@@ -795,7 +937,6 @@ def skill_test_result_page(
         "skill_test.html",
         {
             "request": request,
-            "asset_version": _asset_version(),
             "student": student,
             "assessment": assessment,
             "show_results": True,
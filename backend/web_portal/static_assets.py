@@ -0,0 +1,158 @@
+import gzip
+import hashlib
+import mimetypes
+import re
+import threading
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:
+    # Optional: without it only the gzip variants are served.
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+STATIC_PREFIX = "/static/"
+
+# Hashed names never change content, so browsers may keep them for a year
+# without revalidating.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".json", ".txt"}
+MIN_COMPRESS_BYTES = 512
+HASH_LENGTH = 12
+
+# /static/... references inside stylesheets, rewritten to the hashed names.
+_STATIC_REF_RE = re.compile(r"/static/([A-Za-z0-9_./-]+)")
+
+_lock = threading.Lock()
+_manifest: dict[str, str] | None = None
+_assets: dict[str, dict] = {}
+
+
+def _hashed_name(relative_path: str, digest: str) -> str:
+    path = Path(relative_path)
+    return str(path.with_name(f"{path.stem}.{digest}{path.suffix}")).replace("\\", "/")
+
+
+def _encodings(suffix: str, content: bytes) -> dict[str, bytes]:
+    if suffix not in COMPRESSIBLE_SUFFIXES or len(content) < MIN_COMPRESS_BYTES:
+        return {}
+
+    variants = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(content, quality=11)
+    return variants
+
+
+def build_manifest(static_dir: Path = STATIC_DIR) -> dict[str, str]:
+    """
+    Fingerprints every static file by content hash and precompresses the
+    text ones. Stylesheets are hashed after their /static/ references are
+    rewritten, so a changed image also changes the stylesheet's name.
+    Returns {logical path: hashed path}.
+    """
+
+    files = sorted(path for path in static_dir.rglob("*") if path.is_file())
+    relative = {str(path.relative_to(static_dir)).replace("\\", "/"): path for path in files}
+
+    manifest: dict[str, str] = {}
+    assets: dict[str, dict] = {}
+    # Non-stylesheets first: their hashed names go into the stylesheets.
+    ordered = sorted(relative, key=lambda name: (name.endswith(".css"), name))
+    for name in ordered:
+        content = relative[name].read_bytes()
+        if name.endswith(".css"):
+            text = content.decode("utf-8")
+            text = _STATIC_REF_RE.sub(
+                lambda match: STATIC_PREFIX + manifest.get(match.group(1), match.group(1)),
+                text,
+            )
+            content = text.encode("utf-8")
+
+        digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+        hashed = _hashed_name(name, digest)
+        manifest[name] = hashed
+        assets[hashed] = {
+            "content": content,
+            "media_type": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "etag": f'"{digest}"',
+            "encodings": _encodings(Path(name).suffix, content),
+        }
+
+    global _manifest, _assets
+    with _lock:
+        _manifest = manifest
+        _assets = assets
+    return manifest
+
+
+def _get_manifest() -> dict[str, str]:
+    if _manifest is None:
+        build_manifest()
+    return _manifest or {}
+
+
+def build_id() -> str:
+    """Changes when any static file changes; part of page ETags."""
+
+    manifest = _get_manifest()
+    return hashlib.sha256("|".join(sorted(manifest.values())).encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def static_url(relative_path: str) -> str:
+    """Template helper: the fingerprinted URL of a file under static/."""
+
+    relative_path = relative_path.lstrip("/")
+    return STATIC_PREFIX + _get_manifest().get(relative_path, relative_path)
+
+
+def _pick_encoding(accept_encoding: str, available: dict[str, bytes]) -> str | None:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if token.strip() and quality > 0:
+            accepted.add(token.strip().lower())
+    for encoding in ("br", "gzip"):
+        if encoding in available and encoding in accepted:
+            return encoding
+    return None
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """
+    Serves hashed names from the in-memory manifest with immutable caching
+    and a precompressed variant when the client accepts one. Plain names
+    fall through to StaticFiles.
+    """
+
+    async def get_response(self, path: str, scope) -> Response:
+        _get_manifest()
+        asset = _assets.get(path.replace("\\", "/"))
+        if asset is None:
+            return await super().get_response(path, scope)
+
+        request_headers = Headers(scope=scope)
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "ETag": asset["etag"],
+            "Vary": "Accept-Encoding",
+        }
+        if request_headers.get("if-none-match") == asset["etag"]:
+            return Response(status_code=304, headers=headers)
+
+        content = asset["content"]
+        encoding = _pick_encoding(request_headers.get("accept-encoding", ""), asset["encodings"])
+        if encoding is not None:
+            content = asset["encodings"][encoding]
+            headers["Content-Encoding"] = encoding
+        return Response(content=content, media_type=asset["media_type"], headers=headers)
@@ -4,18 +4,14 @@ import json
 import os
 from typing import List, Dict
 
-from openai import OpenAI
+from backend import metrics
+from backend.llm_gateway import chat_completion
 from .prompt import build_playlist_explainer_prompt
 
 
 OUTPUT_DIR = "output"
 MODEL_NAME = "llama-3.1-8b-instant"
 
-client = OpenAI(
-    api_key=os.getenv("GROQ_API_KEY"),
-    base_url="https://api.groq.com/openai/v1",
-)
-
 def extract_json_from_text(text: str) -> dict:
     """
     Extracts the first JSON object found in a text string.
@@ -29,25 +25,29 @@ def extract_json_from_text(text: str) -> dict:
 
     json_str = text[start : end + 1]
     return json.loads(json_str)
-def generate_playlist_explanation(playlist: Dict) -> Dict:
-    """
-    Generates explanation for a single playlist using LLM.
-    """
-
+def _explainer_messages(playlist: Dict) -> list[dict]:
     prompts = build_playlist_explainer_prompt(
         playlist_title=playlist["title"],
         playlist_description=playlist.get("description", ""),
         channel_name=playlist.get("channel_title", ""),
         top_video_titles=playlist.get("top_video_titles", []),
     )
+    return [
+        {"role": "system", "content": prompts["system_prompt"]},
+        {"role": "user", "content": prompts["user_prompt"]},
+    ]
+
 
-    response = client.chat.completions.create(
+def generate_playlist_explanation(playlist: Dict) -> Dict:
+    """
+    Generates explanation for a single playlist using LLM.
+    """
+
+    response = chat_completion(
+        _explainer_messages(playlist),
         model=MODEL_NAME,
-        messages=[
-            {"role": "system", "content": prompts["system_prompt"]},
-            {"role": "user", "content": prompts["user_prompt"]},
-        ],
         temperature=0.4,
+        caller="youtube.explain_playlists",
     )
 
     raw_output = response.choices[0].message.content
@@ -56,26 +56,23 @@ def generate_playlist_explanation(playlist: Dict) -> Dict:
     return parsed_output
 
 
-def get_or_generate_explanation(playlist: Dict) -> Dict:
-    """
-    Returns cached explanation if exists, otherwise generates and caches it.
-    """
-
+def _cache_path(playlist: Dict) -> str:
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    return os.path.join(OUTPUT_DIR, f"{playlist['playlist_id']}.json")
 
-    playlist_id = playlist["playlist_id"]
-    output_path = os.path.join(OUTPUT_DIR, f"{playlist_id}.json")
 
+def _read_cached(output_path: str) -> Dict | None:
     if os.path.exists(output_path):
         with open(output_path, "r", encoding="utf-8") as f:
             return json.load(f)
+    return None
 
-    explanation = generate_playlist_explanation(playlist)
 
+def _write_cached(output_path: str, playlist: Dict, explanation: Dict) -> None:
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(
             {
-                "playlist_id": playlist_id,
+                "playlist_id": playlist["playlist_id"],
                 **explanation,
             },
             f,
@@ -83,4 +80,18 @@ def get_or_generate_explanation(playlist: Dict) -> Dict:
             ensure_ascii=False,
         )
 
+
+def get_or_generate_explanation(playlist: Dict) -> Dict:
+    """
+    Returns cached explanation if exists, otherwise generates and caches it.
+    """
+
+    output_path = _cache_path(playlist)
+    cached = _read_cached(output_path)
+    metrics.record_cache("explanation", cached is not None)
+    if cached is not None:
+        return cached
+
+    explanation = generate_playlist_explanation(playlist)
+    _write_cached(output_path, playlist, explanation)
     return explanation
@@ -1,18 +1,12 @@
 # qna.py
 
-import os
-from openai import OpenAI
+from backend.llm_gateway import chat_completion
 
 from .qna_prompt import build_playlist_qna_prompt
 
 
 MODEL_NAME = "llama-3.1-8b-instant"
 
-client = OpenAI(
-    api_key=os.getenv("GROQ_API_KEY"),
-    base_url="https://api.groq.com/openai/v1",
-)
-
 
 def _base_messages(playlist: dict, playlist_summary: dict) -> list[dict]:
     prompts = build_playlist_qna_prompt(
@@ -47,12 +41,12 @@ def answer_playlist_question(
     )
 
 
-def answer_playlist_question_with_history(
+def _history_messages(
     playlist: dict,
     playlist_summary: dict,
     student_question: str,
-    conversation_history: list[dict] | None = None,
-) -> str:
+    conversation_history: list[dict] | None,
+) -> list[dict]:
     messages = _base_messages(playlist, playlist_summary)
 
     for item in conversation_history or []:
@@ -62,10 +56,21 @@ def answer_playlist_question_with_history(
             messages.append({"role": role, "content": content})
 
     messages.append({"role": "user", "content": student_question})
-    response = client.chat.completions.create(
+    return messages
+
+
+def answer_playlist_question_with_history(
+    playlist: dict,
+    playlist_summary: dict,
+    student_question: str,
+    conversation_history: list[dict] | None = None,
+) -> str:
+    messages = _history_messages(playlist, playlist_summary, student_question, conversation_history)
+    response = chat_completion(
+        messages,
         model=MODEL_NAME,
-        messages=messages,
         temperature=0.4,
+        caller="youtube.qna",
     )
     return response.choices[0].message.content.strip()
 
@@ -97,10 +102,11 @@ def start_playlist_chatbot(
             {"role": "user", "content": student_question}
         )
 
-        response = client.chat.completions.create(
+        response = chat_completion(
+            conversation_history,
             model=MODEL_NAME,
-            messages=conversation_history,
             temperature=0.4,
+            caller="youtube.qna",
         )
 
         answer = response.choices[0].message.content.strip()
@@ -1,14 +1,17 @@
 # main.py
-
-from youtube_client import get_video_titles
-from llm_explainer.explain_playlists import get_or_generate_explanation
-from llm_explainer.qna import start_playlist_chatbot
-from youtube_client import (
+#
+# Command-line playlist finder. Run from the repository root:
+#     python -m backend.youtube_module.main
+
+from backend.youtube_module.youtube_client import get_video_titles
+from backend.youtube_module.llm_explainer.explain_playlists import get_or_generate_explanation
+from backend.youtube_module.llm_explainer.qna import start_playlist_chatbot
+from backend.youtube_module.youtube_client import (
     search_playlists,
     get_videos_in_playlist,
     get_video_statistics,
 )
-from ranking import aggregate_playlist_stats, rank_playlists
+from backend.youtube_module.ranking import aggregate_playlist_stats, rank_playlists
 
 
 def main():
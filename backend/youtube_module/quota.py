@@ -0,0 +1,34 @@
+# quota.py
+#
+# Counts YouTube Data API requests and the quota units they cost, for both
+# clients.
+
+import threading
+from collections import defaultdict
+
+# Units per request, from the API's quota cost table. Failed requests are
+# charged too.
+QUOTA_UNITS = {
+    "search.list": 100,
+    "playlistItems.list": 1,
+    "videos.list": 1,
+}
+DEFAULT_QUOTA_UNITS = 1
+
+_lock = threading.Lock()
+_usage = defaultdict(lambda: {"calls": 0, "errors": 0, "quota_units": 0})
+
+
+def record_call(endpoint: str, failed: bool = False) -> None:
+    with _lock:
+        entry = _usage[endpoint]
+        entry["calls"] += 1
+        entry["errors"] += int(failed)
+        entry["quota_units"] += QUOTA_UNITS.get(endpoint, DEFAULT_QUOTA_UNITS)
+
+
+def snapshot() -> dict:
+    """Per-endpoint counters: calls, errors, quota_units."""
+
+    with _lock:
+        return {endpoint: dict(values) for endpoint, values in _usage.items()}
@@ -1,33 +1,49 @@
 # youtube_client.py
 
-from googleapiclient.discovery import build
-try:
-    # Package import path (used by web app runtime)
-    from .config import (
-        MAX_RESULTS_PER_QUERY,
-        YOUTUBE_API_KEY,
-        YOUTUBE_API_SERVICE_NAME,
-        YOUTUBE_API_VERSION,
-    )
-except ImportError:
-    # Script import path (used by `python main.py` from this directory)
-    from config import (
-        MAX_RESULTS_PER_QUERY,
-        YOUTUBE_API_KEY,
-        YOUTUBE_API_SERVICE_NAME,
-        YOUTUBE_API_VERSION,
-    )
+import threading
+
+from .config import (
+    MAX_RESULTS_PER_QUERY,
+    YOUTUBE_API_SERVICE_NAME,
+    YOUTUBE_API_VERSION,
+    get_api_key,
+)
+from .quota import record_call
+
+
+# googleapiclient's HTTP transport is not thread-safe: one client per thread.
+_local = threading.local()
 
 
 def get_youtube_client():
     """
-    Creates and returns a YouTube API client.
+    Returns this thread's YouTube API client, building it on first use.
+    googleapiclient is imported here, not at module import: it is slow to
+    load and only needed once playlists are actually fetched.
     """
-    return build(
-        YOUTUBE_API_SERVICE_NAME,
-        YOUTUBE_API_VERSION,
-        developerKey=YOUTUBE_API_KEY,
-    )
+    client = getattr(_local, "client", None)
+    if client is None:
+        from googleapiclient.discovery import build
+
+        client = _local.client = build(
+            YOUTUBE_API_SERVICE_NAME,
+            YOUTUBE_API_VERSION,
+            developerKey=get_api_key(),
+        )
+    return client
+
+
+def _execute(endpoint: str, request) -> dict:
+    """
+    Executes an API request, counting it (and its quota cost) per endpoint.
+    """
+    try:
+        response = request.execute()
+    except Exception:
+        record_call(endpoint, failed=True)
+        raise
+    record_call(endpoint)
+    return response
 
 
 def search_playlists(query: str):
@@ -49,7 +65,7 @@ def search_playlists(query: str):
         maxResults=MAX_RESULTS_PER_QUERY,
     )
 
-    response = request.execute()
+    response = _execute("search.list", request)
 
     playlists = []
 
@@ -93,7 +109,7 @@ def get_videos_in_playlist(playlist_id: str, max_videos: int = 200):
             pageToken=next_page_token,
         )
 
-        response = request.execute()
+        response = _execute("playlistItems.list", request)
 
         for item in response.get("items", []):
             video_id = item.get("contentDetails", {}).get("videoId")
@@ -132,7 +148,7 @@ def get_video_statistics(video_ids: list):
             id=",".join(batch_ids),
         )
 
-        response = request.execute()
+        response = _execute("videos.list", request)
 
         for item in response.get("items", []):
             video_id = item["id"]
@@ -162,7 +178,7 @@ def get_video_titles(video_ids: list):
             id=",".join(batch_ids),
         )
 
-        response = request.execute()
+        response = _execute("videos.list", request)
 
         for item in response.get("items", []):
             video_id = item["id"]